@@ -3,10 +3,11 @@ Reddit 데이터 분석 스크립트
 """
 
 import json
+import numpy as np
 import pandas as pd
 from collections import Counter
 from datetime import datetime
-from utils.stock_ticker_extractor import StockTickerExtractor
+from utils.stock_ticker_extractor import StockTickerExtractor, extract_tickers_batch
 
 def load_reddit_data(json_file):
     """JSON 파일에서 Reddit 데이터 로드"""
@@ -98,13 +99,113 @@ def analyze_engagement(df):
         'avg_upvote_ratio': float(avg_upvote_ratio)
     }
 
-def analyze_stock_tickers(df, mode='aggressive'):
+def _column_values(df, column, default):
+    """컬럼 값을 리스트로 반환 (컬럼이 없으면 default로 채움)"""
+    if column in df.columns:
+        return df[column].tolist()
+    return [default] * len(df)
+
+def _post_tickers(df, mode='aggressive', workers=None):
+    """
+    포스트별 티커 리스트 반환
+    
+    stock_tickers 컬럼 값이 있으면 그대로 쓰고, 없는 포스트만 모아
+    extract_tickers_batch()로 한 번에 추출합니다.
+    """
+    stored = _column_values(df, 'stock_tickers', None)
+    titles = _column_values(df, 'title', '')
+    contents = _column_values(df, 'content', '')
+    
+    post_tickers = [None] * len(df)
+    missing = []
+    for i, value in enumerate(stored):
+        if value:
+            post_tickers[i] = value if isinstance(value, list) else []
+        else:
+            missing.append(i)
+    
+    # 텍스트에서 티커 추출
+    texts = (str(titles[i]) + ' ' + str(contents[i]) for i in missing)
+    for i, tickers in zip(missing, extract_tickers_batch(texts, mode=mode, workers=workers)):
+        post_tickers[i] = tickers
+    
+    return post_tickers
+
+def build_mention_table(df, post_tickers):
+    """
+    티커 멘션 테이블 생성 (티커 멘션 하나당 한 행)
+    
+    Args:
+        df: Reddit 데이터 DataFrame
+        post_tickers: 포스트별 티커 리스트 (df와 같은 순서)
+        
+    Returns:
+        ticker(categorical, 등장 순서), score, num_comments, subreddit, sentiment 컬럼의 DataFrame
+    """
+    lengths = np.fromiter((len(tickers) for tickers in post_tickers), dtype=np.int64, count=len(post_tickers))
+    post_index = np.repeat(np.arange(len(post_tickers)), lengths)
+    tickers = pd.Series([ticker for tickers in post_tickers for ticker in tickers], dtype=object)
+    
+    post_sentiments = [
+        score.get('overall_sentiment', 'neutral') if isinstance(score, dict) else 'neutral'
+        for score in _column_values(df, 'sentiment_score', {})
+    ]
+    
+    def per_mention(values):
+        return pd.Series(values).to_numpy()[post_index]
+    
+    return pd.DataFrame({
+        'ticker': pd.Categorical(tickers, categories=pd.unique(tickers)),
+        'score': per_mention(_column_values(df, 'score', 0)),
+        'num_comments': per_mention(_column_values(df, 'num_comments', 0)),
+        'subreddit': per_mention(_column_values(df, 'subreddit', '')),
+        'sentiment': per_mention(post_sentiments),
+    })
+
+def aggregate_ticker_mentions(mentions):
+    """
+    멘션 테이블을 티커별로 한 번에 집계
+    
+    Returns:
+        티커를 인덱스로 하고 count, avg_score, avg_comments, sentiment(최다 감성),
+        subreddits 컬럼을 가진 DataFrame (count 내림차순, 같으면 먼저 등장한 티커 우선)
+    """
+    grouped = mentions.groupby('ticker', observed=True, sort=True)
+    stats = grouped.agg(
+        count=('ticker', 'size'),
+        score_sum=('score', 'sum'),
+        comments_sum=('num_comments', 'sum'),
+        subreddits=('subreddit', lambda values: list(set(values))),
+    )
+    stats.index = stats.index.astype(object)
+    stats['avg_score'] = stats['score_sum'] / stats['count']
+    stats['avg_comments'] = stats['comments_sum'] / stats['count']
+    
+    # 최다 감성 (같은 횟수면 해당 티커에서 먼저 나온 감성 우선)
+    sentiment_counts = (
+        mentions.reset_index()
+        .groupby(['ticker', 'sentiment'], observed=True, sort=False)
+        .agg(n=('index', 'size'), first=('index', 'min'))
+        .reset_index()
+        .sort_values(['n', 'first'], ascending=[False, True], kind='stable')
+        .drop_duplicates('ticker')
+    )
+    stats['sentiment'] = pd.Series(
+        sentiment_counts['sentiment'].to_numpy(),
+        index=sentiment_counts['ticker'].astype(object)
+    )
+    
+    stats = stats.sort_values('count', ascending=False, kind='stable')
+    return stats[['count', 'avg_score', 'avg_comments', 'sentiment', 'subreddits']]
+
+def analyze_stock_tickers(df, mode='aggressive', workers=None):
     """
     주식 티커 분석
     
     Args:
         df: Reddit 데이터 DataFrame
         mode: 'aggressive' (모든 티커 추출) 또는 'strict' (알려진 티커만)
+        workers: 티커 추출 워커 프로세스 수 (기본값: CPU 코어 수)
     """
     print("\n" + "="*60)
     print("📈 주식 티커 분석")
@@ -115,74 +216,37 @@ def analyze_stock_tickers(df, mode='aggressive'):
     else:
         print("🔒 STRICT 모드: 알려진 주요 주식만 추출")
     
-    # 티커 추출기 초기화
+    # 티커 추출기 초기화 (카테고리 분류용)
     extractor = StockTickerExtractor(mode=mode)
     
-    # 모든 티커 수집
-    all_tickers = []
-    ticker_posts = []  # 티커별 포스트 정보
-    
-    for idx, row in df.iterrows():
-        # stock_tickers 컬럼이 있으면 사용, 없으면 추출
-        if 'stock_tickers' in row and row['stock_tickers']:
-            if isinstance(row['stock_tickers'], list):
-                tickers = row['stock_tickers']
-            else:
-                tickers = []
-        else:
-            # 텍스트에서 티커 추출
-            text = str(row.get('title', '')) + ' ' + str(row.get('content', ''))
-            tickers = extractor.extract_tickers(text)
-        
-        all_tickers.extend(tickers)
-        
-        # 각 티커에 대한 포스트 정보 저장
-        for ticker in tickers:
-            ticker_posts.append({
-                'ticker': ticker,
-                'score': row.get('score', 0),
-                'num_comments': row.get('num_comments', 0),
-                'subreddit': row.get('subreddit', ''),
-                'title': row.get('title', ''),
-                'sentiment': row.get('sentiment_score', {}).get('overall_sentiment', 'neutral') if isinstance(row.get('sentiment_score'), dict) else 'neutral'
-            })
-    
-    if not all_tickers:
+    # 모든 티커 수집 (stock_tickers 컬럼이 있으면 사용, 없으면 추출)
+    post_tickers = _post_tickers(df, mode=mode, workers=workers)
+    
+    mentions = build_mention_table(df, post_tickers)
+    
+    if mentions.empty:
         print("\n⚠️  추출된 주식 티커가 없습니다.")
         return {}
     
-    # 티커별 카운트
-    ticker_counts = Counter(all_tickers)
-    top_tickers = ticker_counts.most_common(30)
+    # 티커별 집계 (멘션 수 내림차순, 같으면 먼저 등장한 티커 우선)
+    ticker_stats = aggregate_ticker_mentions(mentions)
     
-    print(f"\n총 티커 멘션 수: {len(all_tickers)}")
-    print(f"고유 티커 수: {len(ticker_counts)}")
+    print(f"\n총 티커 멘션 수: {len(mentions)}")
+    print(f"고유 티커 수: {len(ticker_stats)}")
     print("\n🔝 상위 30개 언급된 주식:")
     
-    # 티커별 상세 정보 계산
+    # 티커별 상세 정보
     ticker_details = {}
-    for ticker, count in top_tickers:
-        ticker_data = [p for p in ticker_posts if p['ticker'] == ticker]
-        
-        avg_score = sum(p['score'] for p in ticker_data) / len(ticker_data)
-        avg_comments = sum(p['num_comments'] for p in ticker_data) / len(ticker_data)
-        
-        # 감성 분석
-        sentiments = [p['sentiment'] for p in ticker_data]
-        sentiment_counts = Counter(sentiments)
-        dominant_sentiment = sentiment_counts.most_common(1)[0][0]
-        
-        # 카테고리
-        category = extractor.get_ticker_category(ticker)
-        
+    for ticker, stats in ticker_stats.head(30).to_dict('index').items():
         ticker_details[ticker] = {
-            'count': count,
-            'avg_score': avg_score,
-            'avg_comments': avg_comments,
-            'sentiment': dominant_sentiment,
-            'category': category,
-            'subreddits': list(set(p['subreddit'] for p in ticker_data))
+            'count': stats['count'],
+            'avg_score': stats['avg_score'],
+            'avg_comments': stats['avg_comments'],
+            'sentiment': stats['sentiment'],
+            'category': extractor.get_ticker_category(ticker),
+            'subreddits': stats['subreddits']
         }
+    top_tickers = [(ticker, details['count']) for ticker, details in ticker_details.items()]
     
     # 출력
     for i, (ticker, count) in enumerate(top_tickers, 1):
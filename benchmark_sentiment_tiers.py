@@ -0,0 +1,128 @@
+"""
+단계별(tiered) 감성 분석 정확도/처리량 리포트
+
+data/reddit_data.json의 포스트(제목 + 본문)를 SentimentAnalysisPipeline과 같은 방식으로
+점수화해, 항상 VADER+TextBlob을 쓰는 full 모드와 tiered 모드를 비교합니다.
+AdvancedSentimentAnalyzer도 같은 데이터로 비교합니다 (--skip-advanced로 생략).
+
+- 처리량: 초당 텍스트 수
+- 정확도: full 모드 결과를 정답으로 본 감성 분류 일치율과 compound 평균 절대 오차
+- tier별 처리 수와 full tier로 넘긴 이유
+
+캐시는 쓰지 않습니다.
+
+사용법:
+    python benchmark_sentiment_tiers.py
+    python benchmark_sentiment_tiers.py --margin 0.1 --budget 0.3
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import argparse
+from collections import Counter
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# Scrapy 프로젝트 모듈 import
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stock_tech_trends'))
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from stock_tech_trends.sentiment_scoring import score_tiered
+from utils.sentiment_cache import SentimentCache
+from utils.sentiment_tiers import TierPolicy
+from utils.text_normalizer import normalize_text
+from sentiment_analysis.sentiment_analyzer import AdvancedSentimentAnalyzer
+
+
+def load_texts(path, limit=None):
+    """포스트마다 파이프라인과 같은 분석 텍스트(정규화한 제목 + 본문) 생성"""
+    with open(path, 'r', encoding='utf-8') as f:
+        posts = json.load(f)
+
+    texts = []
+    for post in posts:
+        text = ' '.join(post[field] for field in ('title', 'content', 'description', 'body') if post.get(field))
+        text = normalize_text(text)['text']
+        if text:
+            texts.append(text)
+    return texts[:limit] if limit else texts
+
+
+def run_pipeline_scoring(texts, policy):
+    """(결과 리스트, 소요 시간) 반환"""
+    analyzer = SentimentIntensityAnalyzer()
+    started = time.perf_counter()
+    results = [score_tiered(analyzer, text, policy) for text in texts]
+    return results, time.perf_counter() - started
+
+
+def run_advanced(texts, policy):
+    """(결과 리스트, 소요 시간) 반환 (매 실행마다 빈 캐시)"""
+    analyzer = AdvancedSentimentAnalyzer(cache=SentimentCache(memory_size=0), policy=policy)
+    started = time.perf_counter()
+    results = analyzer.analyze_batch(texts, ['stock'] * len(texts))
+    return results, time.perf_counter() - started
+
+
+def compare(full, tiered, label_key, compound):
+    """(분류 일치율, compound 평균 절대 오차, 불일치 (full, tiered) 쌍 Counter)"""
+    agree = sum(a[label_key] == b[label_key] for a, b in zip(full, tiered))
+    error = sum(abs(compound(a) - compound(b)) for a, b in zip(full, tiered))
+    confusion = Counter((a[label_key], b[label_key]) for a, b in zip(full, tiered) if a[label_key] != b[label_key])
+    return agree / len(full), error / len(full), confusion
+
+
+def report(name, texts, full_time, tiered_time, accuracy, mae, confusion, policy):
+    print(f"\n[{name}]")
+    print(f"  full 모드:   {len(texts) / full_time:10,.0f} texts/s ({full_time:.2f} s)")
+    print(f"  tiered 모드: {len(texts) / tiered_time:10,.0f} texts/s ({tiered_time:.2f} s)")
+    print(f"  속도 향상:   {full_time / tiered_time:.1f}x")
+    print(f"  분류 일치율: {accuracy:.1%}, compound 평균 절대 오차: {mae:.4f}")
+
+    counters = policy.counters
+    total = counters['fast'] + counters['full']
+    print(f"  tier별 처리: fast {counters['fast']:,} ({counters['fast'] / total:.1%}), "
+          f"full {counters['full']:,} ({counters['full'] / total:.1%})")
+    reasons = {key[len('escalated_'):]: value for key, value in counters.items() if key.startswith('escalated_')}
+    print(f"  full tier 이유: {reasons}, budget 초과로 fast 처리: {counters['budget_exhausted']:,}")
+    if confusion:
+        top = ', '.join(f"{full}->{tiered}: {count}" for (full, tiered), count in confusion.most_common(4))
+        print(f"  주요 불일치 (full->tiered): {top}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='단계별 감성 분석 정확도/처리량 리포트')
+    parser.add_argument('--data', default=os.path.join('data', 'reddit_data.json'), help='Reddit 포스트 JSON')
+    parser.add_argument('--limit', type=int, default=None, help='사용할 포스트 수 (기본 전체)')
+    parser.add_argument('--margin', type=float, default=0.15, help='중립 경계 margin (SENTIMENT_TIER_NEUTRAL_MARGIN)')
+    parser.add_argument('--budget', type=float, default=1.0, help='full tier 비율 상한 (SENTIMENT_TIER_BUDGET)')
+    parser.add_argument('--skip-advanced', action='store_true', help='AdvancedSentimentAnalyzer 비교 생략')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⏱️  단계별 감성 분석 리포트")
+    print("=" * 70)
+
+    texts = load_texts(args.data, args.limit)
+    print(f"데이터: {len(texts):,}개 텍스트 ({args.data}), margin={args.margin}, budget={args.budget}")
+
+    full, full_time = run_pipeline_scoring(texts, TierPolicy('full'))
+    policy = TierPolicy('tiered', args.margin, args.budget)
+    tiered, tiered_time = run_pipeline_scoring(texts, policy)
+    accuracy, mae, confusion = compare(full, tiered, 'overall_sentiment', lambda r: r['vader_compound'])
+    report('SentimentAnalysisPipeline', texts, full_time, tiered_time, accuracy, mae, confusion, policy)
+
+    if not args.skip_advanced:
+        full, full_time = run_advanced(texts, TierPolicy('full'))
+        policy = TierPolicy('tiered', args.margin, args.budget)
+        tiered, tiered_time = run_advanced(texts, policy)
+        accuracy, mae, confusion = compare(full, tiered, 'sentiment', lambda r: r['final_score']['compound'])
+        report('AdvancedSentimentAnalyzer', texts, full_time, tiered_time, accuracy, mae, confusion, policy)
+
+
+if __name__ == '__main__':
+    main()
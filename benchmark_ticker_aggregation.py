@@ -0,0 +1,132 @@
+"""
+주식 티커 멘션 집계 성능 벤치마크
+
+기존 방식(상위 티커마다 전체 멘션 리스트를 다시 훑는 방식)과
+현재 analyze_reddit_data의 멘션 테이블 + groupby 집계를
+합성 데이터(기본 100만 멘션)로 비교하고 결과가 같은지 확인합니다.
+
+사용법:
+    python benchmark_ticker_aggregation.py
+    python benchmark_ticker_aggregation.py --mentions 200000
+"""
+
+import sys
+import io
+import time
+import argparse
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from analyze_reddit_data import build_mention_table, aggregate_ticker_mentions
+
+
+def make_synthetic_posts(n_mentions, n_tickers=2000, seed=42):
+    """멘션 수가 n_mentions 근처가 되도록 stock_tickers가 채워진 합성 포스트 생성"""
+    rng = np.random.default_rng(seed)
+    universe = [f"T{i:04d}" for i in range(n_tickers)]
+    # 소수의 티커가 대부분 언급되도록 지프 분포 가중치
+    weights = 1.0 / np.arange(1, n_tickers + 1)
+    weights /= weights.sum()
+
+    n_posts = n_mentions // 3
+    counts = rng.integers(1, 6, size=n_posts)
+    post_tickers = []
+    for count in counts:
+        picked = rng.choice(n_tickers, size=count, replace=False, p=weights)
+        post_tickers.append(sorted(universe[i] for i in picked))
+
+    sentiments = np.array(['positive', 'neutral', 'negative'])[rng.integers(0, 3, size=n_posts)]
+    return pd.DataFrame({
+        'stock_tickers': post_tickers,
+        'score': rng.integers(0, 5000, size=n_posts),
+        'num_comments': rng.integers(0, 500, size=n_posts),
+        'subreddit': rng.choice(['stocks', 'investing', 'technology', 'wallstreetbets'], size=n_posts),
+        'sentiment_score': [{'overall_sentiment': s} for s in sentiments],
+    })
+
+
+def legacy_aggregate(df, post_tickers, top_n=30):
+    """비교용 기존 집계 로직 (변경 전 구현 그대로)"""
+    all_tickers = []
+    ticker_posts = []
+    for (_, row), tickers in zip(df.iterrows(), post_tickers):
+        all_tickers.extend(tickers)
+        for ticker in tickers:
+            ticker_posts.append({
+                'ticker': ticker,
+                'score': row.get('score', 0),
+                'num_comments': row.get('num_comments', 0),
+                'subreddit': row.get('subreddit', ''),
+                'sentiment': row.get('sentiment_score', {}).get('overall_sentiment', 'neutral') if isinstance(row.get('sentiment_score'), dict) else 'neutral'
+            })
+
+    ticker_details = {}
+    for ticker, count in Counter(all_tickers).most_common(top_n):
+        ticker_data = [p for p in ticker_posts if p['ticker'] == ticker]
+        ticker_details[ticker] = {
+            'count': count,
+            'avg_score': sum(p['score'] for p in ticker_data) / len(ticker_data),
+            'avg_comments': sum(p['num_comments'] for p in ticker_data) / len(ticker_data),
+            'sentiment': Counter(p['sentiment'] for p in ticker_data).most_common(1)[0][0],
+            'subreddits': set(p['subreddit'] for p in ticker_data),
+        }
+    return ticker_details
+
+
+def vectorized_aggregate(df, post_tickers, top_n=30):
+    """현재 집계 로직"""
+    ticker_stats = aggregate_ticker_mentions(build_mention_table(df, post_tickers))
+    return {
+        ticker: {
+            'count': stats['count'],
+            'avg_score': stats['avg_score'],
+            'avg_comments': stats['avg_comments'],
+            'sentiment': stats['sentiment'],
+            'subreddits': set(stats['subreddits']),
+        }
+        for ticker, stats in ticker_stats.head(top_n).to_dict('index').items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주식 티커 멘션 집계 벤치마크')
+    parser.add_argument('--mentions', type=int, default=1_000_000, help='합성 멘션 수 (근사치)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⏱️  주식 티커 멘션 집계 벤치마크")
+    print("=" * 70)
+
+    df = make_synthetic_posts(args.mentions)
+    post_tickers = df['stock_tickers'].tolist()
+    total = sum(len(tickers) for tickers in post_tickers)
+    print(f"합성 데이터: {len(df):,}개 포스트, {total:,}개 멘션")
+
+    started = time.perf_counter()
+    legacy = legacy_aggregate(df, post_tickers)
+    legacy_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectorized = vectorized_aggregate(df, post_tickers)
+    vectorized_time = time.perf_counter() - started
+
+    print(f"\n  기존 방식: {legacy_time:8.2f} s")
+    print(f"  현재 방식: {vectorized_time:8.2f} s")
+    print(f"  속도 향상: {legacy_time / vectorized_time:.1f}x")
+
+    print("\n" + "=" * 70)
+    if list(legacy.items()) == list(vectorized.items()):
+        print("✅ 상위 티커 순서와 집계 값이 기존 방식과 동일합니다.")
+    else:
+        print("❌ 기존 방식과 결과가 다릅니다.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+주식 티커 추출 성능 벤치마크
+
+기존 방식(단어마다 200자 구간을 잘라 키워드 31개를 하나씩 검사)과
+현재 StockTickerExtractor(컴파일한 후보 정규식으로 티커 후보를 찾고, 텍스트를 한 번만
+소문자로 바꾼 뒤 후보 주변 구간(pos/endpos)에서만 하나로 컴파일한 키워드 패턴을 검색)의
+결과 일치 여부와 처리 속도를 data/reddit_data.json 으로 비교합니다.
+
+사용법:
+    python benchmark_ticker_extraction.py
+    python benchmark_ticker_extraction.py --repeat 5
+"""
+
+import sys
+import io
+import json
+import time
+import argparse
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from utils.stock_ticker_extractor import StockTickerExtractor
+
+
+class LegacyStockTickerExtractor(StockTickerExtractor):
+    """비교용 기존 추출 로직 (변경 전 구현 그대로)"""
+
+    def extract_tickers(self, text):
+        if not text:
+            return []
+
+        tickers = set()
+
+        if self.mode == self.MODE_AGGRESSIVE:
+            for ticker in self.ticker_pattern.findall(text):
+                if ticker not in self.EXCLUDED_WORDS:
+                    tickers.add(ticker)
+
+            for word in self.word_pattern.findall(text):
+                if word not in self.EXCLUDED_WORDS:
+                    if self._is_stock_context(text, word):
+                        tickers.add(word)
+        else:
+            for ticker in self.ticker_pattern.findall(text):
+                if ticker in self.KNOWN_TICKERS and ticker not in self.EXCLUDED_WORDS:
+                    tickers.add(ticker)
+
+            for word in self.word_pattern.findall(text):
+                if word in self.KNOWN_TICKERS and word not in self.EXCLUDED_WORDS:
+                    if self._is_stock_context(text, word):
+                        tickers.add(word)
+
+        return sorted(list(tickers))
+
+    def _is_stock_context(self, text, ticker):
+        ticker_pos = text.find(ticker)
+        if ticker_pos == -1:
+            return False
+
+        start = max(0, ticker_pos - 100)
+        end = min(len(text), ticker_pos + len(ticker) + 100)
+        context = text[start:end].lower()
+
+        for keyword in self.STOCK_CONTEXT_KEYWORDS:
+            if keyword in context:
+                return True
+
+        if ticker_pos > 0 and text[ticker_pos - 1] == '$':
+            return True
+
+        return False
+
+
+def load_texts(json_file):
+    """포스트 제목 + 본문 텍스트 로드"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [post.get('title', '') + ' ' + post.get('content', '') for post in data]
+
+
+def run(extractor, texts, repeat):
+    """가장 빠른 반복의 소요 시간과 결과 반환"""
+    best = None
+    results = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [extractor.extract_tickers(text) for text in texts]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주식 티커 추출 벤치마크')
+    parser.add_argument('--data', default='data/reddit_data.json', help='Reddit 데이터 JSON 파일')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 측정 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+
+    texts = load_texts(args.data)
+    total_chars = sum(len(text) for text in texts)
+
+    print("=" * 70)
+    print("⏱️  주식 티커 추출 벤치마크")
+    print("=" * 70)
+    print(f"데이터: {args.data} ({len(texts)}개 포스트, {total_chars:,}자)")
+
+    all_identical = True
+    for mode in (StockTickerExtractor.MODE_AGGRESSIVE, StockTickerExtractor.MODE_STRICT):
+        legacy_time, legacy_results = run(LegacyStockTickerExtractor(mode=mode), texts, args.repeat)
+        new_time, new_results = run(StockTickerExtractor(mode=mode), texts, args.repeat)
+
+        mismatches = sum(1 for a, b in zip(legacy_results, new_results) if a != b)
+        all_identical = all_identical and mismatches == 0
+
+        print(f"\n[{mode}]")
+        print(f"  기존 방식: {legacy_time * 1000:8.1f} ms ({len(texts) / legacy_time:,.0f} posts/s)")
+        print(f"  현재 방식: {new_time * 1000:8.1f} ms ({len(texts) / new_time:,.0f} posts/s)")
+        print(f"  속도 향상: {legacy_time / new_time:.1f}x")
+        print(f"  결과 불일치: {mismatches}건")
+
+    print("\n" + "=" * 70)
+    if all_identical:
+        print("✅ 모든 모드에서 기존 방식과 결과가 동일합니다.")
+    else:
+        print("❌ 기존 방식과 결과가 다릅니다.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,9 +7,9 @@ Reddit 데이터에서 주식 티커 추출 전용 스크립트
 import json
 import sys
 from collections import Counter
-from utils.stock_ticker_extractor import StockTickerExtractor
+from utils.stock_ticker_extractor import StockTickerExtractor, extract_tickers_batch
 
-def main(mode='aggressive'):
+def main(mode='aggressive', workers=None):
     print("="*70)
     print("💰 Reddit 주식 티커 추출 및 분석")
     print("="*70)
@@ -45,10 +45,10 @@ def main(mode='aggressive'):
     ticker_contexts = {}  # 티커별 멘션 정보
     
     print("\n🔍 주식 티커 추출 중...")
-    for idx, post in enumerate(data):
-        text = post.get('title', '') + ' ' + post.get('content', '')
-        tickers = extractor.extract_tickers(text)
-        
+    texts = (post.get('title', '') + ' ' + post.get('content', '') for post in data)
+    batch_results = extract_tickers_batch(texts, mode=mode, workers=workers)
+    
+    for idx, (post, tickers) in enumerate(zip(data, batch_results)):
         for ticker in tickers:
             all_tickers.append(ticker)
             
@@ -177,8 +177,10 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Reddit에서 주식 티커 추출')
     parser.add_argument('--strict', action='store_true', 
                        help='알려진 주요 주식만 추출 (기본값: 모든 티커 추출)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='티커 추출 워커 프로세스 수 (기본값: CPU 코어 수)')
     args = parser.parse_args()
     
     mode = 'strict' if args.strict else 'aggressive'
-    main(mode=mode)
+    main(mode=mode, workers=args.workers)
 
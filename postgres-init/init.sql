@@ -19,7 +19,30 @@ CREATE TABLE IF NOT EXISTS reddit_posts (
     domain VARCHAR(255),
     crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     sentiment_score JSONB,
-    tech_keywords TEXT[]
+    tech_keywords TEXT[],
+    content_hash VARCHAR(32),
+    extra JSONB
+);
+
+-- Reddit 댓글 테이블
+CREATE TABLE IF NOT EXISTS reddit_comments (
+    id SERIAL PRIMARY KEY,
+    unique_key VARCHAR(255) UNIQUE NOT NULL,
+    comment_id VARCHAR(50),
+    post_id VARCHAR(50),
+    parent_id VARCHAR(50),
+    body TEXT NOT NULL,
+    author VARCHAR(100),
+    subreddit VARCHAR(100),
+    score INTEGER DEFAULT 0,
+    depth INTEGER,
+    created_utc TIMESTAMP,
+    permalink TEXT,
+    crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sentiment_score JSONB,
+    tech_keywords TEXT[],
+    content_hash VARCHAR(32),
+    extra JSONB
 );
 
 -- Hacker News 아이템 테이블
@@ -37,7 +60,9 @@ CREATE TABLE IF NOT EXISTS hackernews_items (
     text TEXT,
     crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     sentiment_score JSONB,
-    tech_keywords TEXT[]
+    tech_keywords TEXT[],
+    content_hash VARCHAR(32),
+    extra JSONB
 );
 
 -- 채용 공고 테이블
@@ -58,7 +83,9 @@ CREATE TABLE IF NOT EXISTS job_postings (
     url TEXT,
     crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     tech_skills TEXT[],
-    seniority_level VARCHAR(50)
+    seniority_level VARCHAR(50),
+    content_hash VARCHAR(32),
+    extra JSONB
 );
 
 -- GitHub 저장소 테이블
@@ -82,7 +109,9 @@ CREATE TABLE IF NOT EXISTS github_repos (
     topics TEXT[],
     license VARCHAR(255),
     size INTEGER,
-    crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    content_hash VARCHAR(32),
+    extra JSONB
 );
 
 -- Stack Overflow 질문 테이블
@@ -102,7 +131,9 @@ CREATE TABLE IF NOT EXISTS stackoverflow_items (
     last_activity_date TIMESTAMP,
     is_answered BOOLEAN,
     crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    tech_category VARCHAR(100)
+    tech_category VARCHAR(100),
+    content_hash VARCHAR(32),
+    extra JSONB
 );
 
 -- 기업 뉴스 테이블
@@ -119,7 +150,9 @@ CREATE TABLE IF NOT EXISTS company_news (
     news_type VARCHAR(100),
     crawled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     sentiment_score JSONB,
-    impact_score FLOAT
+    impact_score FLOAT,
+    content_hash VARCHAR(32),
+    extra JSONB
 );
 
 -- 인덱스 생성
@@ -128,6 +161,10 @@ CREATE INDEX idx_reddit_posts_crawled_at ON reddit_posts(crawled_at DESC);
 CREATE INDEX idx_reddit_posts_score ON reddit_posts(score DESC);
 CREATE INDEX idx_reddit_posts_tech_keywords ON reddit_posts USING GIN(tech_keywords);
 
+CREATE INDEX idx_reddit_comments_post_id ON reddit_comments(post_id);
+CREATE INDEX idx_reddit_comments_subreddit ON reddit_comments(subreddit, created_utc DESC);
+CREATE INDEX idx_reddit_comments_crawled_at ON reddit_comments(crawled_at DESC);
+
 CREATE INDEX idx_hackernews_items_time ON hackernews_items(time DESC);
 CREATE INDEX idx_hackernews_items_score ON hackernews_items(score DESC);
 CREATE INDEX idx_hackernews_items_crawled_at ON hackernews_items(crawled_at DESC);
@@ -163,6 +200,11 @@ CREATE TRIGGER update_reddit_posts_crawled_at
     FOR EACH ROW
     EXECUTE FUNCTION update_crawled_at();
 
+CREATE TRIGGER update_reddit_comments_crawled_at
+    BEFORE UPDATE ON reddit_comments
+    FOR EACH ROW
+    EXECUTE FUNCTION update_crawled_at();
+
 CREATE TRIGGER update_hackernews_items_crawled_at
     BEFORE UPDATE ON hackernews_items
     FOR EACH ROW
@@ -215,5 +257,5 @@ COMMENT ON VIEW v_daily_stats IS '일별 크롤링 통계';
 DO $$
 BEGIN
     RAISE NOTICE 'PostgreSQL 초기화 완료';
-    RAISE NOTICE '생성된 테이블: reddit_posts, hackernews_items, job_postings, github_repos, stackoverflow_items, company_news';
+    RAISE NOTICE '생성된 테이블: reddit_posts, reddit_comments, hackernews_items, job_postings, github_repos, stackoverflow_items, company_news';
 END $$;
@@ -2,10 +2,14 @@
 고급 감성 분석 모듈
 """
 
+import os
 import re
+import sys
+import copy
 import json
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Union
 from collections import Counter
+from itertools import islice, repeat
 import numpy as np
 import pandas as pd
 from datetime import datetime
@@ -14,6 +18,12 @@ from datetime import datetime
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from textblob import TextBlob
 
+# utils 모듈 경로 추가
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.sentiment_cache import cache_key, get_default_cache
+from utils.sentiment_tiers import TierPolicy, fast_lexicon_score
+from utils.text_normalizer import normalize_text, token_text
+
 # 한국어 감성 분석을 위한 추가 라이브러리 (선택사항)
 try:
     from konlpy.tag import Okt
@@ -54,12 +64,228 @@ STOCK_SENTIMENT_DICT = {
     ]
 }
 
+# context별 (긍정 카테고리, 부정 카테고리)
+CONTEXT_CATEGORIES = {
+    'stock': (('positive', 'tech_positive'), ('negative', 'tech_negative')),
+    'tech': (('tech_positive',), ('tech_negative',)),
+    'general': (('positive',), ('negative',))
+}
+
+# 트라이 노드에서 용어가 끝나는 위치 표시
+_TERM_END = None
+
+
+class CompiledLexicon:
+    """
+    감성 사전을 한 번 컴파일한 조회 구조
+    
+    한 단어 용어는 단어 -> 카테고리 dict로, 'machine learning', 'cutting-edge' 처럼 여러
+    단어인 용어는 토큰 트라이로 저장합니다. 용어는 _preprocess_text와 같은 규칙(특수 문자를
+    공백으로, 소문자)으로 토큰화하므로 'cutting-edge'는 'cutting edge'로 매칭됩니다.
+    match()는 토큰 리스트를 한 번 훑으며 가장 긴 용어부터 매칭합니다.
+    """
+    
+    def __init__(self, sentiment_dict: Dict[str, List[str]]):
+        self.categories = tuple(sentiment_dict)
+        self.words = {}
+        self.phrases = {}
+        self.max_phrase_length = 1
+        
+        for category, terms in sentiment_dict.items():
+            for term in terms:
+                tokens = tuple(re.sub(r'[^\w\s]', ' ', term.lower()).split())
+                if not tokens:
+                    continue
+                if len(tokens) == 1:
+                    entry = self.words.setdefault(tokens[0], [])
+                else:
+                    node = self.phrases
+                    for token in tokens:
+                        node = node.setdefault(token, {})
+                    entry = node.setdefault(_TERM_END, [])
+                    self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+                if category not in entry:
+                    entry.append(category)
+        
+        # 카테고리 집합을 frozenset으로 고정
+        self.words = {word: frozenset(categories) for word, categories in self.words.items()}
+        self._freeze(self.phrases)
+        self.category_sets = {category: frozenset(word for word, categories in self.words.items()
+                                                  if category in categories)
+                              for category in self.categories}
+    
+    def _freeze(self, node):
+        for key, child in node.items():
+            if key is _TERM_END:
+                node[key] = frozenset(child)
+            else:
+                self._freeze(child)
+    
+    def match(self, tokens: List[str]) -> List[Tuple[str, frozenset]]:
+        """(용어, 카테고리 집합) 매칭 리스트 (여러 단어 용어는 공백으로 이은 형태)"""
+        matches = []
+        words = self.words
+        phrases = self.phrases
+        i = 0
+        count = len(tokens)
+        while i < count:
+            token = tokens[i]
+            
+            # 여러 단어 용어 중 가장 긴 것 찾기
+            node = phrases.get(token)
+            longest = None
+            j = i + 1
+            while node is not None:
+                if _TERM_END in node:
+                    longest = (j, node[_TERM_END])
+                if j >= count:
+                    break
+                node = node.get(tokens[j])
+                j += 1
+            
+            if longest is not None:
+                end, categories = longest
+                matches.append((' '.join(tokens[i:end]), categories))
+                i = end
+                continue
+            
+            categories = words.get(token)
+            if categories is not None:
+                matches.append((token, categories))
+            i += 1
+        return matches
+
+
+COMPILED_LEXICON = CompiledLexicon(STOCK_SENTIMENT_DICT)
+
+# 전체 감성 분류 경계 (AdvancedSentimentAnalyzer._classify_sentiment와 같은 값)
+SENTIMENT_THRESHOLD = 0.05
+
+
+class SentimentSummary:
+    """
+    감성 분석 결과의 누적 요약
+    
+    결과를 하나씩(add) 또는 묶음으로(update) 넣으면 감성별 개수, compound/신뢰도 합계,
+    tier별 개수, 신뢰도 히스토그램만 유지하므로 결과 수와 관계없이 메모리가 일정합니다.
+    워커마다 따로 누적한 요약은 merge로 합칠 수 있고 (pickle 가능),
+    to_dict()는 get_sentiment_summary와 같은 키에 신뢰도 히스토그램을 더해 반환합니다.
+    """
+    
+    def __init__(self, confidence_bins: int = 10):
+        self.confidence_bins = confidence_bins
+        self.total = 0
+        self.sentiment_counts = Counter()
+        self.tier_counts = Counter()
+        self.compound_sum = 0.0
+        self.confidence_sum = 0.0
+        # 신뢰도 [0, 1]을 confidence_bins개 구간으로 나눈 개수 (1.0은 마지막 구간)
+        self.confidence_histogram = [0] * confidence_bins
+    
+    def add(self, result: Dict) -> 'SentimentSummary':
+        """분석 결과 하나 추가"""
+        self.total += 1
+        self.sentiment_counts[result['sentiment']] += 1
+        if 'tier' in result:
+            self.tier_counts[result['tier']] += 1
+        self.compound_sum += result['final_score']['compound']
+        
+        confidence = result['confidence']
+        self.confidence_sum += confidence
+        index = min(int(confidence * self.confidence_bins), self.confidence_bins - 1)
+        self.confidence_histogram[max(index, 0)] += 1
+        return self
+    
+    def update(self, results: Iterable[Dict]) -> 'SentimentSummary':
+        """분석 결과 여러 개 추가 (제너레이터도 가능)"""
+        for result in results:
+            self.add(result)
+        return self
+    
+    def merge(self, other: 'SentimentSummary') -> 'SentimentSummary':
+        """다른 요약을 합침 (구간 수가 같아야 함)"""
+        if other.confidence_bins != self.confidence_bins:
+            raise ValueError(f"Cannot merge summaries with {other.confidence_bins} and "
+                             f"{self.confidence_bins} confidence bins")
+        self.total += other.total
+        self.sentiment_counts.update(other.sentiment_counts)
+        self.tier_counts.update(other.tier_counts)
+        self.compound_sum += other.compound_sum
+        self.confidence_sum += other.confidence_sum
+        self.confidence_histogram = [a + b for a, b in zip(self.confidence_histogram, other.confidence_histogram)]
+        return self
+    
+    def __iadd__(self, other: 'SentimentSummary') -> 'SentimentSummary':
+        return self.merge(other)
+    
+    @property
+    def average_compound(self) -> float:
+        return self.compound_sum / self.total if self.total else 0.0
+    
+    @property
+    def average_confidence(self) -> float:
+        return self.confidence_sum / self.total if self.total else 0.0
+    
+    def to_dict(self) -> Dict:
+        """요약 dict (결과가 없으면 error만 포함)"""
+        if not self.total:
+            return {'error': 'No results to summarize'}
+        
+        average_compound = self.average_compound
+        if average_compound >= SENTIMENT_THRESHOLD:
+            overall = 'positive'
+        elif average_compound <= -SENTIMENT_THRESHOLD:
+            overall = 'negative'
+        else:
+            overall = 'neutral'
+        
+        summary = {
+            'total_texts': self.total,
+            'sentiment_distribution': dict(self.sentiment_counts),
+            'positive_ratio': self.sentiment_counts.get('positive', 0) / self.total,
+            'negative_ratio': self.sentiment_counts.get('negative', 0) / self.total,
+            'neutral_ratio': self.sentiment_counts.get('neutral', 0) / self.total,
+            'average_compound_score': average_compound,
+            'average_confidence': self.average_confidence,
+            'overall_sentiment': overall,
+            'confidence_histogram': {
+                f"{i / self.confidence_bins:.1f}-{(i + 1) / self.confidence_bins:.1f}": count
+                for i, count in enumerate(self.confidence_histogram)
+            }
+        }
+        if self.tier_counts:
+            summary['tier_distribution'] = dict(self.tier_counts)
+        return summary
+
+
 class AdvancedSentimentAnalyzer:
-    """고급 감성 분석기"""
+    """
+    고급 감성 분석기
+    
+    분석 결과는 (VERSION, 모드, context, 전처리한 텍스트) 키로 SentimentCache에 저장됩니다.
+    cache를 주지 않으면 크롤러 파이프라인과 같은 SENTIMENT_CACHE_* 설정의 공유 캐시(SQLite 포함)를
+    씁니다. 결과의 점수 dict는 매번 새로 만들어지므로 고쳐도 캐시나 다른 결과에 영향이 없습니다.
+    
+    compact=True로 분석하면 결과에서 원문(text)과 전처리한 텍스트(cleaned_text)를 빼고,
+    analyze_stream/summarize_texts는 텍스트를 chunk_size개씩 나눠 처리하므로 텍스트가 아무리
+    많아도 메모리가 일정합니다.
+    
+    전처리는 utils.text_normalizer를 씁니다. 크롤러 아이템의 normalized_text처럼 이미
+    정규화한 결과를 normalized로 넘기면 다시 정리하지 않고 토큰을 그대로 재사용합니다.
+    
+    policy에 tiered 모드 TierPolicy를 주면 키워드 점수와 VADER 사전만 쓰는 빠른 점수를 먼저
+    계산하고, 둘의 방향이 엇갈리거나 중립 경계에 가까운 텍스트만 VADER+TextBlob 전체 분석을
+    합니다. 빠른 tier 결과는 textblob_score가 None이고 VADER와 키워드 점수만으로 가중 평균합니다.
+    """
     
-    def __init__(self, language='en'):
+    # 분석 로직, 감성 사전, 가중치를 바꾸면 올려서 이전 캐시 결과를 무효화
+    VERSION = 'advanced-v3'
+    
+    def __init__(self, language='en', cache=None, policy=None):
         self.language = language
         self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.cache = cache if cache is not None else get_default_cache()
+        self.policy = policy if policy is not None else TierPolicy()
         
         # 한국어 지원
         if language == 'ko' and KOREAN_SUPPORT:
@@ -67,8 +293,9 @@ class AdvancedSentimentAnalyzer:
         else:
             self.okt = None
         
-        # 감성 사전 로드
+        # 감성 사전 로드 (조회는 미리 컴파일한 COMPILED_LEXICON 사용)
         self.sentiment_dict = STOCK_SENTIMENT_DICT
+        self.lexicon = COMPILED_LEXICON
         
         # 감성 점수 가중치
         self.weights = {
@@ -77,55 +304,87 @@ class AdvancedSentimentAnalyzer:
             'keyword': 0.3
         }
     
-    def analyze_text(self, text: str, context: str = 'general') -> Dict:
-        """텍스트 감성 분석"""
+    def analyze_text(self, text: str, context: str = 'general', normalized: Optional[Dict] = None,
+                     compact: bool = False) -> Dict:
+        """
+        텍스트 감성 분석
+        
+        normalized: text를 normalize_text로 정규화한 결과
+        compact: True면 결과에서 text/cleaned_text를 뺌
+        """
         if not text or not text.strip():
-            return self._get_neutral_sentiment()
+            return self._get_neutral_sentiment(compact)
         
         # 전처리
-        cleaned_text = self._preprocess_text(text)
+        cleaned_text = self._preprocess_text(text, normalized)
         
-        # 다양한 방법으로 감성 분석
-        vader_score = self._analyze_vader(cleaned_text)
-        textblob_score = self._analyze_textblob(cleaned_text)
-        keyword_score = self._analyze_keywords(cleaned_text, context)
+        # 같은 텍스트를 이미 분석했으면 캐시 결과 사용
+        key = cache_key(f"{self.VERSION}:{self.policy.mode}:{context}", cleaned_text)
+        scores = self.cache.get(key)
+        if scores is None:
+            scores = self._analyze_scores(cleaned_text, context)
+            self.cache.set(key, scores)
+        
+        return self._build_result(text, cleaned_text, scores, datetime.now().isoformat(), compact)
+    
+    def _build_result(self, text: str, cleaned_text: str, scores: Dict, timestamp: str, compact: bool) -> Dict:
+        """점수에 원문/전처리한 텍스트와 분석 시각을 붙인 결과"""
+        # 배치 안에서 같은 텍스트의 결과들이 점수를 공유하지 않도록 중첩 dict까지 복사
+        scores = copy.deepcopy(scores)
+        if compact:
+            return {**scores, 'analysis_timestamp': timestamp}
+        return {
+            'text': text,
+            'cleaned_text': cleaned_text,
+            **scores,
+            'analysis_timestamp': timestamp
+        }
+    
+    def _analyze_scores(self, cleaned_text: str, context: str) -> Dict:
+        """전처리한 텍스트의 점수 계산 (캐시에 저장되는 부분)"""
+        keyword_score, keywords_found = self._scan_keywords(cleaned_text, context)
+        
+        tier = None
+        if self.policy.tiered:
+            # 빠른 tier: 사전 점수와 키워드 점수가 같은 방향이고 분명하면 여기서 끝냄
+            fast = fast_lexicon_score(self.vader_analyzer.lexicon, cleaned_text)
+            if self.policy.decide(fast, keyword_score['compound']):
+                tier = 'full'
+            else:
+                tier = 'fast'
+                vader_score = {key: fast[key] for key in ('compound', 'positive', 'neutral', 'negative')}
+                textblob_score = None
+        else:
+            self.policy.decide(None)
+        
+        if tier != 'fast':
+            # 다양한 방법으로 감성 분석
+            vader_score = self._analyze_vader(cleaned_text)
+            textblob_score = self._analyze_textblob(cleaned_text)
         
         # 가중 평균 계산
         final_score = self._calculate_weighted_score(
             vader_score, textblob_score, keyword_score
         )
         
-        return {
-            'text': text,
-            'cleaned_text': cleaned_text,
+        scores = {
             'vader_score': vader_score,
             'textblob_score': textblob_score,
             'keyword_score': keyword_score,
             'final_score': final_score,
             'sentiment': self._classify_sentiment(final_score['compound']),
             'confidence': self._calculate_confidence(vader_score, textblob_score, keyword_score),
-            'keywords_found': self._extract_sentiment_keywords(cleaned_text),
-            'analysis_timestamp': datetime.now().isoformat()
+            'keywords_found': keywords_found
         }
+        if tier is not None:
+            scores['tier'] = tier
+        return scores
     
-    def _preprocess_text(self, text: str) -> str:
-        """텍스트 전처리"""
-        # HTML 태그 제거
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # URL 제거
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        
-        # 특수 문자 정리
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # 연속된 공백 제거
-        text = re.sub(r'\s+', ' ', text)
-        
-        # 소문자 변환
-        text = text.lower().strip()
-        
-        return text
+    def _preprocess_text(self, text: str, normalized: Optional[Dict] = None) -> str:
+        """텍스트 전처리 (HTML/URL 제거, 특수 문자 제거, 소문자)"""
+        if normalized is None:
+            normalized = normalize_text(text)
+        return token_text(normalized)
     
     def _analyze_vader(self, text: str) -> Dict:
         """VADER 감성 분석"""
@@ -165,63 +424,59 @@ class AdvancedSentimentAnalyzer:
     
     def _analyze_keywords(self, text: str, context: str) -> Dict:
         """키워드 기반 감성 분석"""
+        return self._scan_keywords(text, context)[0]
+    
+    def _scan_keywords(self, text: str, context: str) -> Tuple[Dict, Dict]:
+        """
+        컴파일된 사전으로 토큰을 한 번 훑어 (키워드 점수, 카테고리별 발견 키워드) 반환
+        
+        여러 단어 용어('machine learning')는 한 번의 매칭으로 셉니다. 한 용어가 긍정과 부정
+        카테고리에 모두 있으면 긍정으로 셉니다.
+        """
         words = text.split()
         positive_count = 0
         negative_count = 0
         total_words = len(words)
+        found_keywords = {category: [] for category in self.lexicon.categories}
         
         if total_words == 0:
-            return {'compound': 0.0, 'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
-        
-        # 컨텍스트별 키워드 선택
-        if context == 'stock':
-            pos_keywords = self.sentiment_dict['positive'] + self.sentiment_dict['tech_positive']
-            neg_keywords = self.sentiment_dict['negative'] + self.sentiment_dict['tech_negative']
-        elif context == 'tech':
-            pos_keywords = self.sentiment_dict['tech_positive']
-            neg_keywords = self.sentiment_dict['tech_negative']
-        else:
-            pos_keywords = self.sentiment_dict['positive']
-            neg_keywords = self.sentiment_dict['negative']
+            return {'compound': 0.0, 'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}, found_keywords
+        
+        # 컨텍스트별 키워드 카테고리 선택
+        pos_categories, neg_categories = CONTEXT_CATEGORIES.get(context, CONTEXT_CATEGORIES['general'])
         
         # 키워드 매칭
-        for word in words:
-            if word in pos_keywords:
+        for term, categories in self.lexicon.match(words):
+            if not categories.isdisjoint(pos_categories):
                 positive_count += 1
-            elif word in neg_keywords:
+            elif not categories.isdisjoint(neg_categories):
                 negative_count += 1
+            for category in self.lexicon.categories:
+                if category in categories:
+                    found_keywords[category].append(term)
         
         # 점수 계산
         pos_ratio = positive_count / total_words
         neg_ratio = negative_count / total_words
         compound = pos_ratio - neg_ratio
         
-        return {
+        keyword_score = {
             'compound': compound,
             'positive': pos_ratio,
             'negative': neg_ratio,
             'neutral': 1 - pos_ratio - neg_ratio
         }
+        return keyword_score, found_keywords
     
-    def _calculate_weighted_score(self, vader: Dict, textblob: Dict, keyword: Dict) -> Dict:
-        """가중 평균 점수 계산"""
-        compound = (
-            vader['compound'] * self.weights['vader'] +
-            textblob['compound'] * self.weights['textblob'] +
-            keyword['compound'] * self.weights['keyword']
-        )
+    def _calculate_weighted_score(self, vader: Dict, textblob: Optional[Dict], keyword: Dict) -> Dict:
+        """가중 평균 점수 계산 (textblob이 None이면 나머지 가중치로 다시 정규화)"""
+        parts = [(score, self.weights[name]) for name, score in
+                 (('vader', vader), ('textblob', textblob), ('keyword', keyword)) if score is not None]
+        total_weight = sum(weight for _, weight in parts)
         
-        positive = (
-            vader['positive'] * self.weights['vader'] +
-            textblob['positive'] * self.weights['textblob'] +
-            keyword['positive'] * self.weights['keyword']
-        )
-        
-        negative = (
-            vader['negative'] * self.weights['vader'] +
-            textblob['negative'] * self.weights['textblob'] +
-            keyword['negative'] * self.weights['keyword']
-        )
+        compound = sum(score['compound'] * weight for score, weight in parts) / total_weight
+        positive = sum(score['positive'] * weight for score, weight in parts) / total_weight
+        negative = sum(score['negative'] * weight for score, weight in parts) / total_weight
         
         neutral = 1 - positive - negative
         
@@ -234,21 +489,18 @@ class AdvancedSentimentAnalyzer:
     
     def _classify_sentiment(self, compound_score: float) -> str:
         """감성 분류"""
-        if compound_score >= 0.05:
+        if compound_score >= SENTIMENT_THRESHOLD:
             return 'positive'
-        elif compound_score <= -0.05:
+        elif compound_score <= -SENTIMENT_THRESHOLD:
             return 'negative'
         else:
             return 'neutral'
     
-    def _calculate_confidence(self, vader: Dict, textblob: Dict, keyword: Dict) -> float:
+    def _calculate_confidence(self, vader: Dict, textblob: Optional[Dict], keyword: Dict) -> float:
         """신뢰도 계산"""
-        # 각 방법의 일치도 계산
-        vader_sentiment = self._classify_sentiment(vader['compound'])
-        textblob_sentiment = self._classify_sentiment(textblob['compound'])
-        keyword_sentiment = self._classify_sentiment(keyword['compound'])
-        
-        sentiments = [vader_sentiment, textblob_sentiment, keyword_sentiment]
+        # 각 방법의 일치도 계산 (빠른 tier는 textblob 없이 두 방법만 비교)
+        sentiments = [self._classify_sentiment(score['compound'])
+                      for score in (vader, textblob, keyword) if score is not None]
         most_common = Counter(sentiments).most_common(1)[0][1]
         
         # 일치하는 방법의 비율
@@ -258,24 +510,11 @@ class AdvancedSentimentAnalyzer:
     
     def _extract_sentiment_keywords(self, text: str) -> Dict:
         """감성 키워드 추출"""
-        words = text.split()
-        found_keywords = {
-            'positive': [],
-            'negative': [],
-            'tech_positive': [],
-            'tech_negative': []
-        }
-        
-        for word in words:
-            for category, keywords in self.sentiment_dict.items():
-                if word in keywords:
-                    found_keywords[category].append(word)
-        
-        return found_keywords
+        return self._scan_keywords(text, 'general')[1]
     
-    def _get_neutral_sentiment(self) -> Dict:
+    def _get_neutral_sentiment(self, compact: bool = False) -> Dict:
         """중립 감성 반환"""
-        return {
+        result = {
             'text': '',
             'cleaned_text': '',
             'vader_score': {'compound': 0.0, 'positive': 0.0, 'neutral': 1.0, 'negative': 0.0},
@@ -287,46 +526,75 @@ class AdvancedSentimentAnalyzer:
             'keywords_found': {'positive': [], 'negative': [], 'tech_positive': [], 'tech_negative': []},
             'analysis_timestamp': datetime.now().isoformat()
         }
+        if compact:
+            del result['text'], result['cleaned_text']
+        return result
     
-    def analyze_batch(self, texts: List[str], contexts: List[str] = None) -> List[Dict]:
-        """배치 감성 분석"""
+    def analyze_batch(self, texts: List[str], contexts: List[str] = None,
+                      normalized: List[Optional[Dict]] = None, compact: bool = False) -> List[Dict]:
+        """
+        배치 감성 분석
+        
+        전처리 후 (전처리한 텍스트, context)가 같은 텍스트는 한 번만 점수를 계산하고,
+        나머지는 캐시 조회와 컴파일된 사전 한 번 훑기로 처리합니다.
+        """
         if contexts is None:
             contexts = ['general'] * len(texts)
+        if normalized is None:
+            normalized = [None] * len(texts)
+        
+        # (전처리한 텍스트, context) -> 점수
+        batch_scores = {}
+        timestamp = datetime.now().isoformat()
         
         results = []
-        for text, context in zip(texts, contexts):
-            result = self.analyze_text(text, context)
-            results.append(result)
+        for text, context, text_normalized in zip(texts, contexts, normalized):
+            if not text or not text.strip():
+                results.append(self._get_neutral_sentiment(compact))
+                continue
+            
+            cleaned_text = self._preprocess_text(text, text_normalized)
+            scores = batch_scores.get((cleaned_text, context))
+            if scores is None:
+                key = cache_key(f"{self.VERSION}:{self.policy.mode}:{context}", cleaned_text)
+                scores = self.cache.get(key)
+                if scores is None:
+                    scores = self._analyze_scores(cleaned_text, context)
+                    self.cache.set(key, scores)
+                batch_scores[(cleaned_text, context)] = scores
+            
+            results.append(self._build_result(text, cleaned_text, scores, timestamp, compact))
         
         return results
     
-    def get_sentiment_summary(self, results: List[Dict]) -> Dict:
-        """감성 분석 결과 요약"""
-        if not results:
-            return {'error': 'No results to summarize'}
-        
-        sentiments = [r['sentiment'] for r in results]
-        sentiment_counts = Counter(sentiments)
-        
-        total = len(results)
-        positive_ratio = sentiment_counts.get('positive', 0) / total
-        negative_ratio = sentiment_counts.get('negative', 0) / total
-        neutral_ratio = sentiment_counts.get('neutral', 0) / total
-        
-        # 평균 점수
-        avg_compound = np.mean([r['final_score']['compound'] for r in results])
-        avg_confidence = np.mean([r['confidence'] for r in results])
-        
-        return {
-            'total_texts': total,
-            'sentiment_distribution': dict(sentiment_counts),
-            'positive_ratio': positive_ratio,
-            'negative_ratio': negative_ratio,
-            'neutral_ratio': neutral_ratio,
-            'average_compound_score': avg_compound,
-            'average_confidence': avg_confidence,
-            'overall_sentiment': self._classify_sentiment(avg_compound)
-        }
+    def analyze_stream(self, texts: Iterable[str], contexts: Union[str, Iterable[str]] = 'general',
+                       chunk_size: int = 1000, compact: bool = True) -> Iterator[Dict]:
+        """
+        텍스트를 chunk_size개씩 analyze_batch로 분석하며 결과를 하나씩 반환
+        
+        texts와 contexts는 제너레이터여도 되고, contexts가 문자열이면 모든 텍스트에 같은
+        context를 씁니다. 한 번에 chunk_size개 결과만 메모리에 둡니다.
+        """
+        if isinstance(contexts, str):
+            contexts = repeat(contexts)
+        pairs = zip(texts, contexts)
+        while True:
+            chunk = list(islice(pairs, max(1, chunk_size)))
+            if not chunk:
+                return
+            chunk_texts, chunk_contexts = zip(*chunk)
+            yield from self.analyze_batch(list(chunk_texts), list(chunk_contexts), compact=compact)
+    
+    def summarize_texts(self, texts: Iterable[str], contexts: Union[str, Iterable[str]] = 'general',
+                        chunk_size: int = 1000, summary: Optional[SentimentSummary] = None) -> SentimentSummary:
+        """텍스트를 분석해 결과를 저장하지 않고 바로 요약에 누적 (summary를 주면 이어서 누적)"""
+        if summary is None:
+            summary = SentimentSummary()
+        return summary.update(self.analyze_stream(texts, contexts, chunk_size, compact=True))
+    
+    def get_sentiment_summary(self, results: Iterable[Dict]) -> Dict:
+        """감성 분석 결과 요약 (큰 결과 집합은 SentimentSummary로 누적하는 편이 메모리가 적음)"""
+        return SentimentSummary().update(results).to_dict()
 
 
 def main():
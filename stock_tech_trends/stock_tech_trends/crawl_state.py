@@ -0,0 +1,137 @@
+"""
+크롤링 실행 간에 유지되는 스파이더 상태 저장소
+
+증분(incremental) 크롤링에 필요한 값을 SQLite 파일 하나에 저장합니다.
+
+- items: (namespace, 아이템 ID) -> 마지막으로 본 지표 dict (예: HN 스토리의 score/descendants)
+- cursors: (namespace, 이름) -> 워터마크 값 (예: HN maxitem)
+
+아이템 행에는 마지막으로 갱신한 시각과 아이템 자체의 시각(item_time)이 함께 저장되어,
+오래된 아이템은 prune으로 지울 수 있습니다. 쓰기는 commit_every번마다 한 번 commit 하고
+close에서 남은 변경을 commit 합니다. 리액터 스레드에서만 쓰는 것을 전제로 합니다.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlStateStore:
+    """(namespace, 키) 단위의 아이템 지표와 워터마크 저장소"""
+
+    def __init__(self, path: str, commit_every: int = 100):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.commit_every = max(1, commit_every)
+        self.pending_writes = 0
+
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " namespace TEXT NOT NULL, item_id TEXT NOT NULL, value TEXT NOT NULL,"
+            " item_time REAL, updated REAL NOT NULL, PRIMARY KEY (namespace, item_id))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS items_item_time ON items (namespace, item_time)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cursors ("
+            " namespace TEXT NOT NULL, name TEXT NOT NULL, value TEXT NOT NULL,"
+            " updated REAL NOT NULL, PRIMARY KEY (namespace, name))"
+        )
+        self.db.commit()
+
+    def get_item(self, namespace: str, item_id) -> Optional[Dict]:
+        """저장된 아이템 지표 (없으면 None)"""
+        row = self.db.execute("SELECT value FROM items WHERE namespace = ? AND item_id = ?",
+                              (namespace, str(item_id))).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def known_items(self, namespace: str, item_ids: Iterable) -> set:
+        """item_ids 중 저장된 아이템 ID 집합 (문자열)"""
+        item_ids = [str(item_id) for item_id in item_ids]
+        known = set()
+        # SQLite 변수 개수 제한(기본 999)을 넘지 않도록 나눠서 조회
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.db.execute(f"SELECT item_id FROM items WHERE namespace = ? AND item_id IN ({placeholders})",
+                                   [namespace] + chunk)
+            known.update(row[0] for row in rows)
+        return known
+
+    def get_items(self, namespace: str) -> Dict[str, Dict]:
+        """namespace의 모든 아이템 ID -> 지표 (item_time 순)"""
+        rows = self.db.execute("SELECT item_id, value FROM items WHERE namespace = ? ORDER BY item_time",
+                               (namespace,))
+        return {item_id: json.loads(value) for item_id, value in rows}
+
+    def count_items(self, namespace: str) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM items WHERE namespace = ?", (namespace,)).fetchone()[0]
+
+    def put_item(self, namespace: str, item_id, value: Dict, item_time: Optional[float] = None):
+        """아이템 지표 저장 (덮어쓰기)"""
+        self.db.execute(
+            "INSERT OR REPLACE INTO items (namespace, item_id, value, item_time, updated) VALUES (?, ?, ?, ?, ?)",
+            (namespace, str(item_id), json.dumps(value, separators=(',', ':')), item_time, time.time())
+        )
+        self._written()
+
+    def delete_items(self, namespace: str, item_ids: Iterable):
+        """아이템 삭제"""
+        for item_id in item_ids:
+            self.db.execute("DELETE FROM items WHERE namespace = ? AND item_id = ?", (namespace, str(item_id)))
+            self._written()
+
+    def prune_items(self, namespace: str, older_than: float, keep: Optional[int] = None) -> int:
+        """
+        item_time이 older_than보다 오래된 아이템 삭제
+
+        keep을 주면 최신 keep개만 남깁니다. 삭제한 행 수를 반환합니다.
+        """
+        deleted = self.db.execute("DELETE FROM items WHERE namespace = ? AND item_time < ?",
+                                  (namespace, older_than)).rowcount
+        if keep is not None:
+            deleted += self.db.execute(
+                "DELETE FROM items WHERE namespace = ? AND item_id NOT IN ("
+                " SELECT item_id FROM items WHERE namespace = ? ORDER BY item_time DESC LIMIT ?)",
+                (namespace, namespace, keep)
+            ).rowcount
+        self.db.commit()
+        self.pending_writes = 0
+        return deleted
+
+    def get_cursor(self, namespace: str, name: str, default: Any = None) -> Any:
+        """워터마크 값 (없으면 default)"""
+        row = self.db.execute("SELECT value FROM cursors WHERE namespace = ? AND name = ?",
+                              (namespace, name)).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def set_cursor(self, namespace: str, name: str, value: Any):
+        """워터마크 저장 (바로 commit)"""
+        self.db.execute("INSERT OR REPLACE INTO cursors (namespace, name, value, updated) VALUES (?, ?, ?, ?)",
+                        (namespace, name, json.dumps(value), time.time()))
+        self.commit()
+
+    def commit(self):
+        self.db.commit()
+        self.pending_writes = 0
+
+    def close(self):
+        if self.db is not None:
+            self.commit()
+            self.db.close()
+            self.db = None
+
+    def _written(self):
+        self.pending_writes += 1
+        if self.pending_writes >= self.commit_every:
+            self.commit()
@@ -26,6 +26,32 @@ class RedditPostItem(scrapy.Item):
     sentiment_score = scrapy.Field()
     tech_keywords = scrapy.Field()
     stock_tickers = scrapy.Field()
+    content_hash = scrapy.Field()  # 제목/본문 해시 (ChangeDetectionPipeline)
+    content_unchanged = scrapy.Field()  # 지난 크롤링 이후 내용 변경 없음 (저장되지 않음)
+    normalized_text = scrapy.Field()  # 정규화한 제목/본문과 토큰 위치 (저장되지 않음)
+
+
+
+class RedditCommentItem(scrapy.Item):
+    """Reddit 댓글 데이터 모델"""
+    comment_id = scrapy.Field()
+    post_id = scrapy.Field()  # 댓글이 달린 포스트 ID
+    parent_id = scrapy.Field()  # 부모 fullname (t3_: 포스트, t1_: 댓글)
+    body = scrapy.Field()
+    author = scrapy.Field()
+    subreddit = scrapy.Field()
+    score = scrapy.Field()
+    depth = scrapy.Field()  # 댓글 트리 깊이 (최상위 댓글은 0)
+    created_utc = scrapy.Field()
+    permalink = scrapy.Field()
+    crawled_at = scrapy.Field()
+    sentiment_score = scrapy.Field()
+    tech_keywords = scrapy.Field()
+    stock_tickers = scrapy.Field()
+    content_hash = scrapy.Field()  # 본문 해시 (ChangeDetectionPipeline)
+    content_unchanged = scrapy.Field()  # 지난 크롤링 이후 내용 변경 없음 (저장되지 않음)
+    normalized_text = scrapy.Field()  # 정규화한 본문과 토큰 위치 (저장되지 않음)
+
 
 
 class HackerNewsItem(scrapy.Item):
@@ -42,6 +68,10 @@ class HackerNewsItem(scrapy.Item):
     crawled_at = scrapy.Field()
     sentiment_score = scrapy.Field()
     tech_keywords = scrapy.Field()
+    content_hash = scrapy.Field()  # 제목/본문 해시 (ChangeDetectionPipeline)
+    content_unchanged = scrapy.Field()  # 지난 크롤링 이후 내용 변경 없음 (저장되지 않음)
+    normalized_text = scrapy.Field()  # 정규화한 제목/본문과 토큰 위치 (저장되지 않음)
+
 
 
 class JobPostingItem(scrapy.Item):
@@ -61,6 +91,10 @@ class JobPostingItem(scrapy.Item):
     crawled_at = scrapy.Field()
     tech_skills = scrapy.Field()
     seniority_level = scrapy.Field()
+    content_hash = scrapy.Field()  # 제목/본문 해시 (ChangeDetectionPipeline)
+    content_unchanged = scrapy.Field()  # 지난 크롤링 이후 내용 변경 없음 (저장되지 않음)
+    normalized_text = scrapy.Field()  # 정규화한 제목/본문과 토큰 위치 (저장되지 않음)
+
 
 
 class GitHubRepoItem(scrapy.Item):
@@ -83,6 +117,10 @@ class GitHubRepoItem(scrapy.Item):
     license = scrapy.Field()
     size = scrapy.Field()
     crawled_at = scrapy.Field()
+    content_hash = scrapy.Field()  # 제목/본문 해시 (ChangeDetectionPipeline)
+    content_unchanged = scrapy.Field()  # 지난 크롤링 이후 내용 변경 없음 (저장되지 않음)
+    normalized_text = scrapy.Field()  # 정규화한 제목/본문과 토큰 위치 (저장되지 않음)
+
 
 
 class StackOverflowItem(scrapy.Item):
@@ -101,6 +139,10 @@ class StackOverflowItem(scrapy.Item):
     is_answered = scrapy.Field()
     crawled_at = scrapy.Field()
     tech_category = scrapy.Field()
+    content_hash = scrapy.Field()  # 제목/본문 해시 (ChangeDetectionPipeline)
+    content_unchanged = scrapy.Field()  # 지난 크롤링 이후 내용 변경 없음 (저장되지 않음)
+    normalized_text = scrapy.Field()  # 정규화한 제목/본문과 토큰 위치 (저장되지 않음)
+
 
 
 class CompanyNewsItem(scrapy.Item):
@@ -116,3 +158,6 @@ class CompanyNewsItem(scrapy.Item):
     crawled_at = scrapy.Field()
     sentiment_score = scrapy.Field()
     impact_score = scrapy.Field()  # 주가 영향도 예측 점수
+    content_hash = scrapy.Field()  # 제목/본문 해시 (ChangeDetectionPipeline)
+    content_unchanged = scrapy.Field()  # 지난 크롤링 이후 내용 변경 없음 (저장되지 않음)
+    normalized_text = scrapy.Field()  # 정규화한 제목/본문과 토큰 위치 (저장되지 않음)
@@ -3,11 +3,31 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import os
+import json
+import time
+import fcntl
+import sqlite3
+import logging
+
+import redis
+import requests
 from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.http.headers import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.defer import maybe_deferred_to_future
+from scrapy.utils.httpobj import urlparse_cached
+from scrapy.utils.project import data_path
+from twisted.internet import defer, task, threads
+from twisted.python.failure import Failure
+from w3lib.url import canonicalize_url
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+logger = logging.getLogger(__name__)
+
 
 class StockTechTrendsSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -98,3 +118,698 @@ class StockTechTrendsDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class FileTokenStore:
+    """액세스 토큰을 JSON 파일 하나에 저장 (스파이더 프로세스 하나가 쓰는 경우)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, token):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 쓰는 도중 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓰고 교체
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(token, f)
+        os.replace(temp_path, self.path)
+
+
+class RedisTokenStore:
+    """액세스 토큰을 Redis 키 하나에 저장 (여러 프로세스가 공유, 만료 시각에 자동 삭제)"""
+
+    def __init__(self, client, key):
+        self.client = client
+        self.key = key
+
+    def load(self):
+        try:
+            data = self.client.get(self.key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to load OAuth token from Redis: {e}")
+            return None
+        return json.loads(data) if data else None
+
+    def save(self, token):
+        ttl = int(token['expires_at'] - time.time())
+        if ttl > 0:
+            self.client.set(self.key, json.dumps(token), ex=ttl)
+
+
+class RedditTokenMiddleware:
+    """
+    Reddit OAuth 토큰 관리 다운로더 미들웨어
+
+    reddit_oauth = True인 스파이더의 oauth.reddit.com 요청에 Bearer 토큰과 REDDIT_USER_AGENT를 붙입니다. 토큰은 만료 시각과 함께
+    REDDIT_TOKEN_STORE(file: REDDIT_TOKEN_PATH 파일, redis: REDIS_URL)에 저장되어, 유효한
+    토큰이 있으면 실행을 시작할 때 인증 요청을 하지 않습니다.
+
+    - 토큰 발급은 스레드에서 실행해 리액터를 막지 않고, 동시에 여러 요청이 기다려도 한 번만 발급
+    - 만료 REDDIT_TOKEN_REFRESH_MARGIN초 전에 백그라운드에서 미리 갱신
+    - 401 응답을 받으면 토큰을 버리고 요청을 한 번만 다시 보냄
+    """
+
+    AUTH_URL = "https://www.reddit.com/api/v1/access_token"
+    OAUTH_HOST = "oauth.reddit.com"
+
+    def __init__(self, client_id, client_secret, user_agent, store, refresh_margin=300, stats=None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.user_agent = user_agent
+        self.store = store
+        self.refresh_margin = refresh_margin
+        self.stats = stats
+
+        self.token = None
+        # 진행 중인 토큰 발급과 결과를 기다리는 Deferred (있으면 새로 발급하지 않고 기다림)
+        self.refreshing = None
+        self.waiters = []
+        self.refresh_loop = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        client_id = settings.get('REDDIT_CLIENT_ID')
+        client_secret = settings.get('REDDIT_CLIENT_SECRET')
+        if not client_id or not client_secret:
+            raise NotConfigured("Reddit API credentials not found in settings")
+
+        if settings.get('REDDIT_TOKEN_STORE', 'file') == 'redis':
+            store = RedisTokenStore(redis.Redis.from_url(settings.get('REDIS_URL')),
+                                    f"stock_tech_trends:reddit_token:{client_id}")
+        else:
+            path = settings.get('REDDIT_TOKEN_PATH', 'reddit_token.json')
+            if not os.path.isabs(path):
+                path = os.path.join(data_path('', createdir=True), path)
+            store = FileTokenStore(path)
+
+        middleware = cls(
+            client_id, client_secret,
+            user_agent=settings.get('REDDIT_USER_AGENT', 'StockTechTrends/1.0'),
+            store=store,
+            refresh_margin=settings.getint('REDDIT_TOKEN_REFRESH_MARGIN', 300),
+            stats=crawler.stats
+        )
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider):
+        # Reddit API를 쓰는 스파이더(reddit_oauth = True)에서만 토큰을 준비
+        if not getattr(spider, 'reddit_oauth', False):
+            return
+
+        token = self.store.load()
+        if self._is_valid(token):
+            self.token = token
+            spider.logger.info("Reusing stored Reddit OAuth token")
+
+        # 만료가 가까워지면 요청이 기다리지 않도록 미리 갱신
+        self.refresh_loop = task.LoopingCall(self._refresh_if_expiring)
+        self.refresh_loop.start(60, now=False).addErrback(
+            lambda failure: logger.error(f"Reddit token refresh loop stopped: {failure.value}")
+        )
+
+    def spider_closed(self, spider):
+        if self.refresh_loop is not None and self.refresh_loop.running:
+            self.refresh_loop.stop()
+
+    async def process_request(self, request, spider):
+        if urlparse_cached(request).hostname != self.OAUTH_HOST:
+            return None
+
+        token = self.token
+        if not self._is_valid(token):
+            token = await maybe_deferred_to_future(self._get_token())
+
+        request.headers['Authorization'] = f"Bearer {token['access_token']}"
+        request.headers.setdefault('User-Agent', self.user_agent)
+        return None
+
+    def process_response(self, request, response, spider):
+        if response.status != 401 or urlparse_cached(request).hostname != self.OAUTH_HOST:
+            return response
+        if request.meta.get('reddit_token_retried'):
+            spider.logger.error(f"Reddit request still unauthorized after token refresh: {request.url}")
+            return response
+
+        # 토큰이 만료/취소됨: 이 요청이 쓴 토큰이면 버리고 새 토큰으로 한 번만 재시도
+        used = request.headers.get('Authorization', b'').decode('latin-1')
+        if self.token is not None and used == f"Bearer {self.token['access_token']}":
+            self.token = None
+        self._inc_stat('reddit_token/unauthorized_retries')
+
+        retry = request.replace(dont_filter=True)
+        retry.meta['reddit_token_retried'] = True
+        del retry.headers['Authorization']
+        return retry
+
+    def _is_valid(self, token, margin=0):
+        return bool(token) and token.get('expires_at', 0) - margin > time.time()
+
+    def _refresh_if_expiring(self):
+        if self.refreshing is None and not self._is_valid(self.token, self.refresh_margin):
+            self._get_token()
+
+    def _get_token(self) -> defer.Deferred:
+        """새 토큰 발급 (이미 진행 중이면 그 결과를 기다리는 Deferred 반환)"""
+        d = defer.Deferred()
+        self.waiters.append(d)
+        if self.refreshing is None:
+            self.refreshing = threads.deferToThread(self._fetch_token)
+            self.refreshing.addBoth(self._token_fetched)
+        return d
+
+    def _fetch_token(self):
+        """토큰 발급 요청과 저장 (스레드에서 실행)"""
+        response = requests.post(
+            self.AUTH_URL,
+            data={'grant_type': 'client_credentials'},
+            auth=(self.client_id, self.client_secret),
+            headers={'User-Agent': self.user_agent},
+            timeout=30
+        )
+        response.raise_for_status()
+        data = response.json()
+        token = {
+            'access_token': data['access_token'],
+            'expires_at': time.time() + data.get('expires_in', 3600)
+        }
+        try:
+            self.store.save(token)
+        except Exception as e:
+            logger.warning(f"Failed to store Reddit OAuth token: {e}")
+        return token
+
+    def _token_fetched(self, result):
+        """발급 결과를 기다리던 요청들에 전달 (리액터 스레드)"""
+        self.refreshing = None
+        waiters, self.waiters = self.waiters, []
+
+        if isinstance(result, Failure):
+            logger.error(f"Reddit API authentication failed: {result.value}")
+            self._inc_stat('reddit_token/failures')
+            for d in waiters:
+                d.errback(result)
+            return None
+
+        self.token = result
+        self._inc_stat('reddit_token/refreshes')
+        logger.info("Reddit API authentication successful")
+        for d in waiters:
+            d.callback(result)
+        return None
+
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가 (stats가 없으면 무시)"""
+        if self.stats is not None:
+            self.stats.inc_value(key, count)
+
+
+def _new_bucket(now, rate, burst):
+    return {'tokens': float(burst), 'rate': rate, 'updated': now, 'remaining': None, 'reset_at': None}
+
+
+def _refill(bucket, now, rate, burst):
+    """경과 시간만큼 토큰을 채움 (API가 알려준 리셋 시각이 지났으면 기본 속도로 되돌림)"""
+    if bucket['reset_at'] is not None and now >= bucket['reset_at']:
+        bucket.update(remaining=None, reset_at=None, rate=rate)
+    elapsed = max(0.0, now - bucket['updated'])
+    bucket['tokens'] = min(float(burst), bucket['tokens'] + elapsed * bucket['rate'])
+    bucket['updated'] = now
+
+
+def take_token(bucket, now, rate, burst):
+    """
+    토큰 하나를 꺼냄
+
+    (bucket, 기다릴 초)를 반환합니다. 0이면 바로 보내도 되고, 아니면 그만큼 기다린 뒤 다시
+    꺼내야 합니다. API가 알려준 남은 쿼터가 0이면 리셋 시각까지 기다립니다.
+    """
+    if bucket is None:
+        bucket = _new_bucket(now, rate, burst)
+    _refill(bucket, now, rate, burst)
+
+    if bucket['remaining'] is not None and bucket['remaining'] < 1:
+        return bucket, bucket['reset_at'] - now
+    if bucket['tokens'] >= 1:
+        bucket['tokens'] -= 1
+        if bucket['remaining'] is not None:
+            bucket['remaining'] -= 1
+        return bucket, 0.0
+    return bucket, (1 - bucket['tokens']) / bucket['rate']
+
+
+def observe_quota(bucket, now, remaining, reset_at, rate, burst):
+    """
+    응답 헤더의 남은 쿼터와 리셋 시각을 반영
+
+    남은 쿼터를 리셋까지 고르게 쓰도록 채우는 속도를 remaining / (리셋까지 남은 초)로 바꿉니다.
+    같은 윈도우의 늦게 도착한 응답이 더 큰 remaining을 알려 와도 작은 값을 유지합니다.
+    """
+    if bucket is None:
+        bucket = _new_bucket(now, rate, burst)
+    _refill(bucket, now, rate, burst)
+
+    if (bucket['remaining'] is not None and bucket['reset_at'] is not None
+            and abs(bucket['reset_at'] - reset_at) < 5):
+        remaining = min(remaining, bucket['remaining'])
+    bucket['remaining'] = remaining
+    bucket['reset_at'] = reset_at
+    if remaining >= 1:
+        bucket['rate'] = remaining / max(reset_at - now, 1.0)
+    return bucket
+
+
+class FileBucketStore:
+    """
+    토큰 버킷을 JSON 파일 하나에 저장 (같은 호스트의 프로세스끼리 공유)
+
+    읽고 고쳐 쓰는 동안 옆의 .lock 파일에 flock을 걸어 다른 프로세스와 겹치지 않게 합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def take(self, name, now, rate, burst):
+        return self._update(name, lambda bucket: take_token(bucket, now, rate, burst))
+
+    def observe(self, name, now, remaining, reset_at, rate, burst):
+        self._update(name, lambda bucket: (observe_quota(bucket, now, remaining, reset_at, rate, burst), None))
+
+    def _update(self, name, func):
+        with open(f"{self.path}.lock", 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        buckets = json.load(f)
+                except (OSError, ValueError):
+                    buckets = {}
+
+                buckets[name], result = func(buckets.get(name))
+
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(buckets, f)
+                os.replace(temp_path, self.path)
+                return result
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class RedisBucketStore:
+    """
+    토큰 버킷을 Redis 키에 저장 (여러 호스트의 프로세스가 공유)
+
+    WATCH/MULTI 트랜잭션으로 읽고 고쳐 쓰므로 동시에 꺼내도 토큰이 두 번 쓰이지 않습니다.
+    """
+
+    def __init__(self, client, prefix='stock_tech_trends:rate_limit', ttl=86400):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def take(self, name, now, rate, burst):
+        return self._update(name, lambda bucket: take_token(bucket, now, rate, burst))
+
+    def observe(self, name, now, remaining, reset_at, rate, burst):
+        self._update(name, lambda bucket: (observe_quota(bucket, now, remaining, reset_at, rate, burst), None))
+
+    def _update(self, name, func):
+        key = f"{self.prefix}:{name}"
+
+        def transaction(pipe):
+            data = pipe.get(key)
+            bucket, result = func(json.loads(data) if data else None)
+            pipe.multi()
+            pipe.set(key, json.dumps(bucket), ex=self.ttl)
+            return result
+
+        return self.client.transaction(transaction, key, value_from_callable=True)
+
+
+class RateLimitMiddleware:
+    """
+    API 쿼터 헤더로 속도를 맞추는 토큰 버킷 다운로더 미들웨어
+
+    RATE_LIMIT_BUCKETS에 등록한 호스트(와 경로)로 가는 요청은 버킷에서 토큰을 꺼낸 뒤에 보냅니다.
+    버킷은 RATE_LIMIT_BACKEND(redis: REDIS_URL, 연결할 수 없으면 file: RATE_LIMIT_PATH)에
+    저장되어 같은 API를 쓰는 모든 크롤러 프로세스가 나눠 씁니다.
+
+    - 처음에는 limit / period 속도로 채우고, 응답의 X-Ratelimit-Remaining / X-Ratelimit-Reset
+      (Reddit: 리셋까지 초, GitHub: epoch 초)을 받으면 남은 쿼터를 리셋까지 고르게 쓰는 속도로 바꿈
+    - 토큰이 없으면 요청을 실패시키지 않고 그 자리에서 기다림
+    - 그래도 429(또는 쿼터가 0인 403)를 받으면 리셋(Retry-After)까지 버킷을 비우고 다시 보냄
+    - 등록한 호스트는 AutoThrottle이 지연을 늘리지 않음 (DOWNLOAD_SLOTS에서 지연 0)
+    """
+
+    # 한 번에 기다리는 최대 시간 (다른 프로세스가 본 쿼터 변화를 반영하도록 나눠서 기다림)
+    MAX_SLEEP = 5.0
+
+    def __init__(self, buckets, store, max_retries=5, stats=None):
+        self.buckets = buckets
+        self.store = store
+        self.max_retries = max_retries
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('RATE_LIMIT_ENABLED', True):
+            raise NotConfigured("Rate limiting disabled")
+        buckets = settings.getdict('RATE_LIMIT_BUCKETS')
+        if not buckets:
+            raise NotConfigured("RATE_LIMIT_BUCKETS is empty")
+
+        store = None
+        if settings.get('RATE_LIMIT_BACKEND', 'redis') == 'redis':
+            client = redis.Redis.from_url(settings.get('REDIS_URL'))
+            try:
+                client.ping()
+                store = RedisBucketStore(client)
+            except redis.RedisError as e:
+                logger.warning(f"Redis unavailable for rate limiting, using file buckets: {e}")
+        if store is None:
+            path = settings.get('RATE_LIMIT_PATH', 'rate_limit.json')
+            if not os.path.isabs(path):
+                path = os.path.join(data_path('', createdir=True), path)
+            store = FileBucketStore(path)
+
+        return cls(buckets, store, max_retries=settings.getint('RATE_LIMIT_MAX_RETRIES', 5), stats=crawler.stats)
+
+    async def process_request(self, request, spider):
+        match = self._match(request)
+        if match is None:
+            return None
+        name, config = match
+        # 지연은 버킷이 정하므로 AutoThrottle이 슬롯 지연을 늘리지 않게 함
+        request.meta.setdefault('autothrottle_dont_adjust_delay', True)
+
+        held = 0.0
+        while True:
+            try:
+                wait = await maybe_deferred_to_future(threads.deferToThread(
+                    self.store.take, name, time.time(), *self._rate(config)
+                ))
+            except Exception as e:
+                # 저장소 장애로 크롤링을 멈추지는 않음
+                logger.warning(f"Rate limit store failed for {name}: {e}")
+                self._inc_stat('rate_limit/store_errors')
+                break
+            if wait <= 0:
+                break
+            from twisted.internet import reactor
+            sleep = min(wait, self.MAX_SLEEP)
+            held += sleep
+            await maybe_deferred_to_future(task.deferLater(reactor, sleep, lambda: None))
+
+        if held:
+            self._inc_stat(f'rate_limit/{name}/held')
+            self._inc_stat(f'rate_limit/{name}/held_ms', int(held * 1000))
+        return None
+
+    async def process_response(self, request, response, spider):
+        match = self._match(request)
+        if match is None or 'cached' in response.flags:
+            return response
+        name, config = match
+
+        now = time.time()
+        quota = self._quota_from_headers(response.headers, now)
+        limited = response.status == 429 or (response.status == 403 and quota is not None and quota[0] < 1)
+        if limited:
+            # 리셋(또는 Retry-After)까지 버킷을 비워 다른 요청도 함께 기다리게 함
+            retry_after = response.headers.get('Retry-After')
+            if retry_after is not None:
+                reset_at = now + self._to_float(retry_after, self.MAX_SLEEP)
+            elif quota is not None:
+                reset_at = quota[1]
+            else:
+                reset_at = now + self.MAX_SLEEP
+            quota = (0, reset_at)
+
+        if quota is not None:
+            try:
+                await maybe_deferred_to_future(threads.deferToThread(
+                    self.store.observe, name, now, quota[0], quota[1], *self._rate(config)
+                ))
+            except Exception as e:
+                logger.warning(f"Rate limit store failed for {name}: {e}")
+                self._inc_stat('rate_limit/store_errors')
+
+        if not limited:
+            return response
+
+        retries = request.meta.get('rate_limit_retries', 0)
+        if retries >= self.max_retries:
+            spider.logger.error(f"Still rate limited after {retries} retries: {request.url}")
+            return response
+        self._inc_stat(f'rate_limit/{name}/limited_retries')
+        retry = request.replace(dont_filter=True)
+        retry.meta['rate_limit_retries'] = retries + 1
+        return retry
+
+    def _match(self, request):
+        """요청이 쓰는 버킷 (이름, 설정), 등록된 호스트가 아니면 None (먼저 적힌 버킷 우선)"""
+        parsed = urlparse_cached(request)
+        for name, config in self.buckets.items():
+            if parsed.hostname == config['host'] and parsed.path.startswith(config.get('path', '')):
+                return name, config
+        return None
+
+    def _rate(self, config):
+        """(기본 채우기 속도(초당 토큰), 버킷 크기)"""
+        rate = config['limit'] / config['period']
+        return rate, config.get('burst', max(1.0, rate))
+
+    def _quota_from_headers(self, headers, now):
+        """(남은 요청 수, 리셋 시각 epoch 초), 헤더가 없으면 None"""
+        remaining = headers.get('X-Ratelimit-Remaining')
+        reset = headers.get('X-Ratelimit-Reset')
+        if remaining is None or reset is None:
+            return None
+        remaining = self._to_float(remaining, None)
+        reset = self._to_float(reset, None)
+        if remaining is None or reset is None:
+            return None
+        # GitHub은 epoch 초, Reddit은 리셋까지 남은 초
+        reset_at = reset if reset > 1e9 else now + reset
+        return remaining, reset_at
+
+    def _to_float(self, value, default):
+        try:
+            return float(value.decode('latin-1') if isinstance(value, bytes) else value)
+        except (TypeError, ValueError):
+            return default
+
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가 (stats가 없으면 무시)"""
+        if self.stats is not None:
+            self.stats.inc_value(key, count)
+
+
+class ConditionalCacheStore:
+    """
+    URL별 검증자(ETag, Last-Modified)와 마지막 200 응답 본문 저장소 (SQLite)
+
+    쓰기는 commit_every번마다 한 번 commit 하고 close에서 남은 변경을 commit 합니다.
+    ttl초 동안 다시 확인되지 않은 항목은 열 때 지웁니다.
+    """
+
+    def __init__(self, path, ttl=7 * 86400, commit_every=100):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.commit_every = max(1, commit_every)
+        self.pending_writes = 0
+
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, status INTEGER NOT NULL,"
+            " headers TEXT, body BLOB, size INTEGER NOT NULL, updated REAL NOT NULL)"
+        )
+        self.db.execute("DELETE FROM responses WHERE updated < ?", (time.time() - ttl,))
+        self.db.commit()
+
+    def get(self, url):
+        row = self.db.execute(
+            "SELECT etag, last_modified, status, headers, body, size FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'etag': row[0], 'last_modified': row[1], 'status': row[2],
+            'headers': json.loads(row[3]) if row[3] else None, 'body': row[4], 'size': row[5]
+        }
+
+    def put(self, url, etag, last_modified, status, headers, body, size):
+        """검증자와 응답 저장 (body가 None이면 검증자만)"""
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses (url, etag, last_modified, status, headers, body, size, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, status, json.dumps(headers) if headers is not None else None,
+             body, size, time.time())
+        )
+        self._written()
+
+    def touch(self, url, etag=None, last_modified=None):
+        """304를 받은 항목의 확인 시각 (와 새 검증자) 갱신"""
+        self.db.execute(
+            "UPDATE responses SET updated = ?, etag = COALESCE(?, etag),"
+            " last_modified = COALESCE(?, last_modified) WHERE url = ?",
+            (time.time(), etag, last_modified, url)
+        )
+        self._written()
+
+    def close(self):
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+
+    def _written(self):
+        self.pending_writes += 1
+        if self.pending_writes >= self.commit_every:
+            self.db.commit()
+            self.pending_writes = 0
+
+
+class ConditionalRequestMiddleware:
+    """
+    ETag / Last-Modified 조건부 요청 다운로더 미들웨어
+
+    GET 요청의 200 응답에 검증자가 있으면 정규화한 URL별로 검증자와 본문을 CONDITIONAL_CACHE_PATH에
+    저장하고, 다음 요청에 If-None-Match / If-Modified-Since를 붙입니다. 304를 받으면
+
+    - 저장한 본문을 200 응답으로 되돌려 줌 (flags에 'unchanged')
+    - 요청 meta에 conditional_skip_unchanged가 있으면 본문은 저장하지 않고 빈 200 응답을
+      돌려줌 (flags에 'unchanged', 스파이더는 다시 파싱하지 않고 건너뜀)
+
+    본문 없이 저장된 항목은 conditional_skip_unchanged가 있는 요청에만 검증자를 붙이므로, 같은
+    URL을 플래그 없이 요청하면 전체 응답을 다시 받아 본문과 함께 저장합니다.
+
+    304로 아낀 바이트(저장한 응답 크기)와 요청 수는 conditional/* 통계에 남습니다. GitHub은
+    304 응답을 rate limit에 세지 않으므로 호스트별 not_modified 수가 곧 아낀 쿼터입니다.
+    HttpCacheMiddleware가 돌려준 캐시 응답은 건드리지 않습니다. 검증자를 붙인 요청은 meta에
+    dont_cache를 넣어, 304에서 만든 응답(특히 flags가 저장되지 않는 빈 200)이 HTTP 캐시에
+    저장되지 않게 합니다. meta에 dont_conditional이 있는 요청은 건너뜁니다.
+    """
+
+    def __init__(self, store, stats=None):
+        self.store = store
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool('CONDITIONAL_CACHE_ENABLED', True):
+            raise NotConfigured("Conditional requests disabled")
+
+        path = settings.get('CONDITIONAL_CACHE_PATH', 'conditional_cache.sqlite')
+        if not os.path.isabs(path):
+            path = os.path.join(data_path('', createdir=True), path)
+        store = ConditionalCacheStore(path, ttl=settings.getint('CONDITIONAL_CACHE_TTL', 7 * 86400))
+
+        middleware = cls(store, stats=crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_closed(self, spider):
+        self.store.close()
+        if self.stats is not None:
+            saved = self.stats.get_value('conditional/not_modified', 0)
+            if saved:
+                spider.logger.info(
+                    f"Conditional requests: {saved} not modified, "
+                    f"{self.stats.get_value('conditional/bytes_saved', 0)} bytes not downloaded"
+                )
+
+    def process_request(self, request, spider):
+        if request.method != 'GET' or request.meta.get('dont_conditional'):
+            return None
+
+        entry = self.store.get(canonicalize_url(request.url))
+        if not self._can_replay(entry, request):
+            return None
+
+        if entry['etag']:
+            request.headers.setdefault('If-None-Match', entry['etag'])
+        if entry['last_modified']:
+            request.headers.setdefault('If-Modified-Since', entry['last_modified'])
+        # 이 미들웨어가 만든 응답을 HttpCacheMiddleware가 저장하지 않도록 (응답 쪽에서는 HTTP 캐시보다 먼저 실행)
+        request.meta['dont_cache'] = True
+        return None
+
+    def process_response(self, request, response, spider):
+        if request.method != 'GET' or request.meta.get('dont_conditional') or 'cached' in response.flags:
+            return response
+
+        url = canonicalize_url(request.url)
+        etag = self._header(response, 'ETag')
+        last_modified = self._header(response, 'Last-Modified')
+
+        if response.status == 304:
+            entry = self.store.get(url)
+            if not self._can_replay(entry, request):
+                return response
+            self.store.touch(url, etag, last_modified)
+            request.meta['dont_cache'] = True
+
+            host = urlparse_cached(request).hostname
+            self._inc_stat('conditional/not_modified')
+            self._inc_stat(f'conditional/{host}/not_modified')
+            self._inc_stat('conditional/bytes_saved', entry['size'])
+
+            if entry['body'] is None:
+                return response.replace(status=200, body=b'', flags=response.flags + ['unchanged'])
+            headers = Headers(entry['headers'] or {})
+            response_cls = responsetypes.from_args(headers=headers, url=response.url, body=entry['body'])
+            return response_cls(
+                url=response.url, status=entry['status'], headers=headers, body=entry['body'],
+                flags=response.flags + ['unchanged'], request=request
+            )
+
+        if response.status == 200 and (etag or last_modified):
+            if request.meta.get('conditional_skip_unchanged'):
+                self.store.put(url, etag, last_modified, response.status, None, None, len(response.body))
+            else:
+                headers = {
+                    key.decode('latin-1'): [value.decode('latin-1') for value in values]
+                    for key, values in response.headers.items()
+                }
+                self.store.put(url, etag, last_modified, response.status, headers, response.body,
+                               len(response.body))
+            self._inc_stat('conditional/stored')
+        return response
+
+    def _can_replay(self, entry, request):
+        """저장된 항목으로 304에 답할 수 있는지 (본문이 없으면 빈 응답을 받겠다는 요청만)"""
+        if entry is None:
+            return False
+        return entry['body'] is not None or bool(request.meta.get('conditional_skip_unchanged'))
+
+    def _header(self, response, name):
+        value = response.headers.get(name)
+        return value.decode('latin-1') if value else None
+
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가 (stats가 없으면 무시)"""
+        if self.stats is not None:
+            self.stats.inc_value(key, count)
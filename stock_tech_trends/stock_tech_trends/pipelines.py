@@ -3,37 +3,295 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
+import io
+import os
+import multiprocessing
+import json
 import logging
 import hashlib
 import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, List
 
 from itemadapter import ItemAdapter
+from scrapy import signals
 from scrapy.exceptions import DropItem
+from scrapy.utils.conf import build_component_list
+from scrapy.utils.misc import load_object
+from twisted.internet import defer, task, threads
+from twisted.python.failure import Failure
+from twisted.python.threadpool import ThreadPool
 import pymongo
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import Json, execute_batch
+from psycopg2.pool import ThreadedConnectionPool
+import redis
+from scrapy.utils.project import data_path
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
+
+from .items import (RedditPostItem, RedditCommentItem, HackerNewsItem, JobPostingItem, GitHubRepoItem,
+                    StackOverflowItem, CompanyNewsItem)
+from .seen_filter import SeenFilter
+from . import sentiment_scoring
+
+# utils 모듈 경로 추가
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+from utils.sentiment_cache import cache_key, get_sentiment_cache
+from utils.sentiment_tiers import TierPolicy
+from utils.text_normalizer import normalize_text
 
 logger = logging.getLogger(__name__)
 
 
+def get_storage_name(item) -> str:
+    """아이템 타입에 따른 저장소(MongoDB 컬렉션 / PostgreSQL 테이블) 이름 반환"""
+    item_type = type(item).__name__
+    storage_mapping = {
+        'RedditPostItem': 'reddit_posts',
+        'RedditCommentItem': 'reddit_comments',
+        'HackerNewsItem': 'hackernews_items',
+        'JobPostingItem': 'job_postings',
+        'GitHubRepoItem': 'github_repos',
+        'StackOverflowItem': 'stackoverflow_items',
+        'CompanyNewsItem': 'company_news'
+    }
+    return storage_mapping.get(item_type, 'general_items')
+
+
+def generate_unique_key(item) -> str:
+    """아이템의 고유 키 생성"""
+    adapter = ItemAdapter(item)
+    
+    # 아이템 타입별 고유 키 생성 (댓글은 post_id도 있으므로 먼저 확인)
+    if 'comment_id' in adapter:
+        return f"reddit_comment_{adapter['comment_id']}"
+    elif 'post_id' in adapter:
+        return f"reddit_{adapter['post_id']}"
+    elif 'item_id' in adapter:
+        return f"hn_{adapter['item_id']}"
+    elif 'job_id' in adapter:
+        return f"job_{adapter['job_id']}"
+    elif 'repo_id' in adapter:
+        return f"repo_{adapter['repo_id']}"
+    elif 'question_id' in adapter:
+        return f"so_{adapter['question_id']}"
+    elif 'news_id' in adapter:
+        return f"news_{adapter['news_id']}"
+    else:
+        # URL 기반 해시 생성
+        url = adapter.get('url', '')
+        return hashlib.md5(url.encode()).hexdigest()
+
+
+# generate_unique_key가 URL 대신 사용하는 ID 필드
+UNIQUE_ID_FIELDS = ('comment_id', 'post_id', 'item_id', 'job_id', 'repo_id', 'question_id', 'news_id')
+
+# 감성 분석과 내용 해시에 쓰는 텍스트 필드
+TEXT_FIELDS = ('title', 'content', 'description', 'body')
+
+# 파이프라인끼리 주고받는 내부 필드 (저장/내보내기 전에 제거)
+TRANSIENT_FIELDS = ('content_unchanged', 'normalized_text')
+
+# 검증할 필수 텍스트 필드와 길이 범위 (저장소 이름 -> (필드, 최소, 최대), 나머지는 title)
+REQUIRED_TEXT = {
+    'reddit_comments': ('body', 10, 10000),
+}
+DEFAULT_REQUIRED_TEXT = ('title', 10, 500)
+
+# 내용이 바뀌지 않은 아이템에서 갱신할 필드 (저장소 이름 -> 필드, crawled_at은 항상 갱신)
+METRIC_FIELDS = {
+    'reddit_posts': ('score', 'upvote_ratio', 'num_comments'),
+    'reddit_comments': ('score',),
+    'hackernews_items': ('score', 'descendants'),
+    'github_repos': ('stars', 'forks', 'watchers', 'open_issues'),
+    'stackoverflow_items': ('score', 'view_count', 'answer_count', 'is_answered', 'accepted_answer_id'),
+}
+
+
+def has_unique_id(adapter) -> bool:
+    """generate_unique_key가 ID나 URL로 키를 만들 수 있는지 여부"""
+    return bool(adapter.get('url')) or any(field in adapter for field in UNIQUE_ID_FIELDS)
+
+
+def collect_text(adapter) -> str:
+    """감성 분석 대상 텍스트 (제목 + 본문 필드)"""
+    return ' '.join(adapter[field] for field in TEXT_FIELDS if adapter.get(field))
+
+
+def get_normalized_text(adapter) -> Dict[str, Any]:
+    """
+    아이템의 정규화한 텍스트 (utils.text_normalizer)
+    
+    스파이더가 normalized_text를 채우지 않았으면 제목 + 본문 필드로 만들어 아이템에 붙입니다.
+    """
+    normalized = adapter.get('normalized_text')
+    if normalized is None:
+        normalized = normalize_text(collect_text(adapter))
+        adapter['normalized_text'] = normalized
+    return normalized
+
+
+def generate_content_hash(adapter) -> str:
+    """제목과 본문 필드의 해시 (내용 변경 감지용)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for field in TEXT_FIELDS:
+        digest.update((adapter.get(field) or '').encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def metric_update(adapter, storage_name) -> Dict[str, Any]:
+    """내용이 바뀌지 않은 아이템의 부분 업데이트 필드"""
+    fields = {field: adapter[field] for field in METRIC_FIELDS.get(storage_name, ()) if field in adapter}
+    if adapter.get('crawled_at'):
+        fields['crawled_at'] = adapter['crawled_at']
+    return fields
+
+
+def content_key(item):
+    """ChangeDetectionPipeline 필터 키 (고유 키 + 내용 해시, 해시가 없으면 None)"""
+    content_hash = ItemAdapter(item).get('content_hash')
+    if not content_hash:
+        return None
+    return f"{generate_unique_key(item)}:{content_hash}"
+
+
+# 저장 파이프라인이 저장을 마친 아이템의 content_key 리스트를 알리는 신호 (keys 인자)
+items_stored = object()
+
+
+def notify_stored(signal_manager, keys):
+    """items_stored 신호 전송 (signal_manager가 없거나 알릴 키가 없으면 무시)"""
+    if signal_manager is not None and keys:
+        signal_manager.send_catch_log(items_stored, keys=keys)
+
+
+def storage_row(adapter) -> Dict[str, Any]:
+    """저장할 필드 (content_unchanged, normalized_text 같은 파이프라인 내부 필드 제외)"""
+    row = dict(adapter)
+    for field in TRANSIENT_FIELDS:
+        row.pop(field, None)
+    return row
+
+
+# COPY 텍스트 포맷에서 이스케이프가 필요한 문자
+_COPY_SPECIAL_CHARS = re.compile(r'[\\\t\n\r\x00]')
+
+# json.dumps에 옵션을 주면 호출마다 인코더를 새로 만들므로 하나를 재사용
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
+def _copy_escape(text: str) -> str:
+    """COPY 텍스트 포맷 이스케이프 (NUL은 PostgreSQL 문자열에 저장할 수 없어 제거)"""
+    if _COPY_SPECIAL_CHARS.search(text) is None:
+        return text
+    return (text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+            .replace('\r', '\\r').replace('\x00', ''))
+
+
+def _copy_scalar(value) -> str:
+    """일반 컬럼 값 인코딩"""
+    if value.__class__ is str:
+        return _copy_escape(value)
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, (dict, list)):
+        return _copy_escape(_JSON_ENCODER.encode(value))
+    return _copy_escape(str(value))
+
+
+def _copy_json(value) -> str:
+    """JSON/JSONB 컬럼 값 인코딩"""
+    if value is None:
+        return '\\N'
+    return _copy_escape(_JSON_ENCODER.encode(value))
+
+
+def _copy_array(value) -> str:
+    """배열 컬럼 값을 PostgreSQL 배열 리터럴로 인코딩 (예: ['a', 'b"c'] -> {"a","b\\"c"})"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (str, bytes)) or not isinstance(value, (list, tuple, set)):
+        value = [value]
+    elements = []
+    for element in value:
+        if element is None:
+            elements.append('NULL')
+        else:
+            elements.append('"' + str(element).replace('\\', '\\\\').replace('"', '\\"') + '"')
+    return _copy_escape('{' + ','.join(elements) + '}')
+
+
+def copy_encoder(udt_name: str):
+    """
+    컬럼 타입에 맞는 COPY ... FROM STDIN (텍스트 포맷) 필드 인코더 반환
+    
+    udt_name은 information_schema.columns.udt_name 값입니다
+    (jsonb, _text 처럼 배열 타입은 '_'로 시작).
+    """
+    if udt_name in ('json', 'jsonb'):
+        return _copy_json
+    if udt_name.startswith('_'):
+        return _copy_array
+    return _copy_scalar
+
+
+def _param_scalar(value):
+    """일반 컬럼 값을 psycopg2 파라미터로 변환"""
+    if isinstance(value, (dict, list)):
+        return Json(value, dumps=_JSON_ENCODER.encode)
+    return value
+
+
+def _param_json(value):
+    """JSON/JSONB 컬럼 값을 psycopg2 파라미터로 변환"""
+    if value is None:
+        return None
+    return Json(value, dumps=_JSON_ENCODER.encode)
+
+
+def _param_array(value):
+    """배열 컬럼 값을 psycopg2 파라미터(list -> ARRAY)로 변환"""
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes)) or not isinstance(value, (list, tuple, set)):
+        return [value]
+    return list(value)
+
+
+def param_adapter(udt_name: str):
+    """컬럼 타입에 맞는 psycopg2 파라미터 변환 함수 반환"""
+    if udt_name in ('json', 'jsonb'):
+        return _param_json
+    if udt_name.startswith('_'):
+        return _param_array
+    return _param_scalar
+
+
 class ValidationPipeline:
     """데이터 검증 파이프라인"""
     
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
         
-        # 필수 필드 검증
-        if not adapter.get('title') or not adapter.get('title').strip():
-            raise DropItem(f"Missing title in {item}")
+        # 필수 필드 검증 (댓글은 제목 대신 본문)
+        field, min_length, max_length = REQUIRED_TEXT.get(get_storage_name(item), DEFAULT_REQUIRED_TEXT)
+        if not adapter.get(field) or not adapter.get(field).strip():
+            raise DropItem(f"Missing {field} in {item}")
         
         # 텍스트 길이 검증
-        title = adapter.get('title', '')
-        if len(title) < 10 or len(title) > 500:
-            raise DropItem(f"Invalid title length: {len(title)}")
+        text = adapter.get(field, '')
+        if len(text) < min_length or len(text) > max_length:
+            raise DropItem(f"Invalid {field} length: {len(text)}")
         
         # URL 검증
         url = adapter.get('url', '')
@@ -57,88 +315,301 @@ class ValidationPipeline:
         return url_pattern.match(url) is not None
 
 
+class NormalizationPipeline:
+    """
+    텍스트 정규화 파이프라인
+    
+    스파이더가 정규화 결과(normalized_text)를 붙이지 않은 아이템에 제목 + 본문 필드를
+    정규화해 붙입니다. 이후 파이프라인은 HTML 엔티티/태그/URL 정리와 토큰화를 다시 하지
+    않고 이 결과를 재사용합니다.
+    """
+    
+    def process_item(self, item, spider):
+        get_normalized_text(ItemAdapter(item))
+        return item
+
+
 class SentimentAnalysisPipeline:
-    """감성 분석 파이프라인"""
+    """
+    감성 분석 파이프라인
+    
+    분석 텍스트는 정규화한 텍스트(normalized_text)입니다. 분석 결과는 (VERSION, 텍스트) 키로 SentimentCache에 저장되어, 내용이 같은 글은
+    VADER/TextBlob을 다시 돌리지 않습니다. SENTIMENT_CACHE_PATH를 주면 크롤링 실행 간에도
+    유지되는 SQLite tier를 함께 씁니다. ChangeDetectionPipeline이 내용 변경 없음으로 표시한
+    아이템도 피드에 내보내지므로 점수를 붙이며, 대부분 이 캐시에서 찾습니다.
+    
+    SENTIMENT_WORKERS가 0보다 크면 캐시에 없는 텍스트를 SENTIMENT_BATCH_SIZE개씩 모아
+    프로세스 풀에서 분석하고, 결과가 나오면 발생하는 Deferred를 반환합니다. 덜 찬 배치는
+    SENTIMENT_BATCH_TIMEOUT초 뒤에 보냅니다. 분석 중인 배치가 SENTIMENT_MAX_PENDING_BATCHES개를
+    넘으면 아이템 처리가 늦춰집니다 (backpressure). 0이면 리액터 스레드에서 바로 분석합니다.
+    
+    SENTIMENT_TIER_MODE를 tiered로 두면 VADER 사전만 쓰는 빠른 점수로 먼저 판단하고, 중립 경계에
+    가깝거나 신호가 엇갈리는 텍스트만 VADER+TextBlob 전체 분석을 합니다 (utils.sentiment_tiers).
+    tier별 처리 수는 sentiment/tier/fast, sentiment/tier/full 통계에 기록됩니다. SENTIMENT_TIER_BUDGET은
+    워커 프로세스마다 따로 세는 비율입니다 (sentiment_scoring 참고).
+    """
     
-    def __init__(self):
+    # 분석 로직을 바꾸면 올려서 이전 캐시 결과를 무효화
+    VERSION = 'pipeline-v2'
+    
+    def __init__(self, cache=None, workers=0, batch_size=32, batch_timeout=0.2,
+                 max_pending_batches=None, stats=None, tier_mode='full', tier_neutral_margin=0.15,
+                 tier_budget=1.0):
         self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.cache = cache if cache is not None else get_sentiment_cache()
+        self.policy = TierPolicy(tier_mode, tier_neutral_margin, tier_budget)
+        # 모드마다 결과가 다르므로 캐시 키에 모드를 포함
+        self.namespace = f"{self.VERSION}:{tier_mode}"
+        self.workers = max(0, workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_timeout = batch_timeout
+        self.stats = stats
+        self.semaphore = defer.DeferredSemaphore(max(1, max_pending_batches or self.workers * 2))
+        self.executor = None
+        
+        # 아직 보내지 않은 배치: (캐시 키, 텍스트) 리스트
+        self.batch = []
+        # 분석 중인 캐시 키 -> 결과를 기다리는 아이템 Deferred 리스트 (같은 텍스트는 한 번만 분석)
+        self.waiting = {}
+        self.batch_timer = None
+        self.pending = set()
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        path = crawler.settings.get('SENTIMENT_CACHE_PATH')
+        if path and not os.path.isabs(path):
+            path = os.path.join(data_path('', createdir=True), path)
+        
+        cache = get_sentiment_cache(
+            memory_size=crawler.settings.getint('SENTIMENT_CACHE_SIZE', 10000),
+            path=path or None,
+            max_bytes=crawler.settings.getint('SENTIMENT_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        )
+        cache.stats = crawler.stats
+        return cls(
+            cache=cache,
+            workers=crawler.settings.getint('SENTIMENT_WORKERS', 0),
+            batch_size=crawler.settings.getint('SENTIMENT_BATCH_SIZE', 32),
+            batch_timeout=crawler.settings.getfloat('SENTIMENT_BATCH_TIMEOUT', 0.2),
+            max_pending_batches=crawler.settings.getint('SENTIMENT_MAX_PENDING_BATCHES', 0),
+            stats=crawler.stats,
+            tier_mode=crawler.settings.get('SENTIMENT_TIER_MODE', 'full'),
+            tier_neutral_margin=crawler.settings.getfloat('SENTIMENT_TIER_NEUTRAL_MARGIN', 0.15),
+            tier_budget=crawler.settings.getfloat('SENTIMENT_TIER_BUDGET', 1.0)
+        )
+    
+    def open_spider(self, spider):
+        if self.workers:
+            # 리액터와 DB 쓰기 스레드가 돌고 있는 프로세스를 fork 하지 않도록 spawn 사용
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=sentiment_scoring.init_worker,
+                initargs=(self.policy.mode, self.policy.neutral_margin, self.policy.budget)
+            )
+    
+    @defer.inlineCallbacks
+    def close_spider(self, spider):
+        # 남은 배치 전송 -> 분석 완료 대기 -> 프로세스 풀 종료 순서로 정리
+        self._submit_batch()
+        while self.pending:
+            yield defer.DeferredList(list(self.pending), consumeErrors=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
     
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
         
-        # 분석할 텍스트 수집
-        text_parts = []
+        # 분석할 텍스트 (HTML 엔티티/태그/URL을 정리한 제목 + 본문)
+        combined_text = get_normalized_text(adapter)['text']
+        if not combined_text:
+            return item
         
-        if adapter.get('title'):
-            text_parts.append(adapter['title'])
-        if adapter.get('content'):
-            text_parts.append(adapter['content'])
-        if adapter.get('description'):
-            text_parts.append(adapter['description'])
-        if adapter.get('body'):
-            text_parts.append(adapter['body'])
+        key = cache_key(self.namespace, combined_text)
+        sentiment_score = self.cache.get(key)
+        if sentiment_score is not None:
+            # 캐시는 조회마다 새 dict를 돌려주므로 그대로 넣음
+            adapter['sentiment_score'] = sentiment_score
+            return item
         
-        if text_parts:
-            combined_text = ' '.join(text_parts)
+        if self.executor is None:
             sentiment_score = self._analyze_sentiment(combined_text)
+            self._count_tier(sentiment_score)
+            self.cache.set(key, sentiment_score)
             adapter['sentiment_score'] = sentiment_score
+            return item
+        
+        # 프로세스 풀 배치에 추가하고 결과가 나오면 아이템 반환
+        d = defer.Deferred()
+        d.addCallback(self._set_sentiment, adapter, item)
+        if key in self.waiting:
+            self.waiting[key].append(d)
+            return d
+        self.waiting[key] = [d]
+        self.batch.append((key, combined_text))
+        
+        if len(self.batch) >= self.batch_size:
+            self._submit_batch()
+        elif self.batch_timer is None:
+            from twisted.internet import reactor
+            self.batch_timer = reactor.callLater(self.batch_timeout, self._submit_batch)
         
+        return d
+    
+    def _set_sentiment(self, sentiment_score, adapter, item):
+        # 같은 텍스트를 기다리던 아이템들이 결과 하나를 받으므로 아이템마다 복사
+        adapter['sentiment_score'] = dict(sentiment_score)
         return item
     
+    def _submit_batch(self):
+        """모인 배치를 프로세스 풀로 보냄 (분석 중인 배치 수가 한도면 자리가 날 때까지 대기)"""
+        if self.batch_timer is not None and self.batch_timer.active():
+            self.batch_timer.cancel()
+        self.batch_timer = None
+        
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+        
+        d = self.semaphore.run(self._run_batch, [text for _, text in batch])
+        d.addBoth(self._finish_batch, batch)
+        self.pending.add(d)
+        d.addBoth(lambda result: self.pending.discard(d))
+    
+    def _run_batch(self, texts) -> defer.Deferred:
+        """sentiment_scoring.score_batch를 워커 프로세스에서 실행하고 결과 Deferred 반환"""
+        from twisted.internet import reactor
+        
+        d = defer.Deferred()
+        future = self.executor.submit(sentiment_scoring.score_batch, texts)
+        
+        def done(future):
+            error = future.exception()
+            if error is not None:
+                reactor.callFromThread(d.errback, error)
+            else:
+                reactor.callFromThread(d.callback, future.result())
+        
+        future.add_done_callback(done)
+        return d
+    
+    def _finish_batch(self, result, batch):
+        """배치 결과를 캐시에 넣고 아이템별 Deferred 발생 (리액터 스레드에서 호출)"""
+        if isinstance(result, Failure):
+            # 워커가 죽는 등 배치가 실패하면 이 배치만 리액터 스레드에서 분석
+            logger.error(f"Sentiment worker batch failed, analyzing {len(batch)} texts inline: "
+                         f"{result.getErrorMessage()}")
+            self._inc_stat('sentiment/failed_batches')
+            result = [self._analyze_sentiment(text) for _, text in batch]
+        
+        self._inc_stat('sentiment/batches')
+        self._inc_stat('sentiment/batch_items', len(batch))
+        for (key, _), sentiment_score in zip(batch, result):
+            self._count_tier(sentiment_score)
+            self.cache.set(key, sentiment_score)
+            for d in self.waiting.pop(key, ()):
+                d.callback(sentiment_score)
+    
+    def _count_tier(self, sentiment_score):
+        self._inc_stat(f"sentiment/tier/{sentiment_score.get('tier', 'full')}")
+    
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가 (stats가 없으면 무시)"""
+        if self.stats is not None and count:
+            self.stats.inc_value(key, count)
+    
     def _analyze_sentiment(self, text: str) -> Dict[str, float]:
-        """VADER를 사용한 감성 분석"""
-        try:
-            # VADER 감성 분석
-            vader_scores = self.vader_analyzer.polarity_scores(text)
-            
-            # TextBlob 감성 분석 (보조)
-            blob = TextBlob(text)
-            textblob_polarity = blob.sentiment.polarity
-            textblob_subjectivity = blob.sentiment.subjectivity
-            
-            return {
-                'vader_compound': vader_scores['compound'],
-                'vader_positive': vader_scores['pos'],
-                'vader_neutral': vader_scores['neu'],
-                'vader_negative': vader_scores['neg'],
-                'textblob_polarity': textblob_polarity,
-                'textblob_subjectivity': textblob_subjectivity,
-                'overall_sentiment': self._get_overall_sentiment(vader_scores['compound'])
-            }
-        except Exception as e:
-            logger.error(f"Sentiment analysis error: {e}")
-            return {
-                'vader_compound': 0.0,
-                'vader_positive': 0.0,
-                'vader_neutral': 1.0,
-                'vader_negative': 0.0,
-                'textblob_polarity': 0.0,
-                'textblob_subjectivity': 0.5,
-                'overall_sentiment': 'neutral'
-            }
+        """VADER를 사용한 감성 분석 (tiered 모드면 빠른 점수로 끝날 수 있음)"""
+        return sentiment_scoring.score_tiered(self.vader_analyzer, text, self.policy)
     
     def _get_overall_sentiment(self, compound_score: float) -> str:
         """전체 감성 분류"""
-        if compound_score >= 0.05:
-            return 'positive'
-        elif compound_score <= -0.05:
-            return 'negative'
-        else:
-            return 'neutral'
+        return sentiment_scoring.get_overall_sentiment(compound_score)
+
+
+class DatabaseWriter:
+    """
+    DB 쓰기 작업을 리액터 밖의 스레드 풀에서 실행하는 헬퍼
+    
+    대기 중이거나 실행 중인 작업 수를 max_pending개로 제한합니다. 쓰기가 밀리면
+    submit()이 돌려준 Deferred가 늦게 발생하고, 파이프라인이 이 Deferred를 반환하므로
+    Scrapy가 새 아이템 처리를 늦추게 됩니다 (backpressure).
+    """
+    
+    def __init__(self, name, threads=4, max_pending=16):
+        self.threadpool = ThreadPool(minthreads=1, maxthreads=max(1, threads), name=name)
+        self.semaphore = defer.DeferredSemaphore(max(1, max_pending))
+        self.pending = set()
+    
+    def start(self):
+        self.threadpool.start()
+    
+    def submit(self, func, *args, **kwargs) -> defer.Deferred:
+        """func(*args, **kwargs)를 스레드 풀에서 실행하고 결과 Deferred 반환"""
+        from twisted.internet import reactor
+        
+        d = self.semaphore.run(threads.deferToThreadPool, reactor, self.threadpool, func, *args, **kwargs)
+        self.pending.add(d)
+        
+        def done(result):
+            self.pending.discard(d)
+            return result
+        
+        return d.addBoth(done)
+    
+    @defer.inlineCallbacks
+    def close(self):
+        """남은 작업이 모두 끝난 뒤 스레드 풀 종료"""
+        while self.pending:
+            yield defer.DeferredList(list(self.pending), consumeErrors=True)
+        self.threadpool.stop()
 
 
 class MongoDBPipeline:
-    """MongoDB 저장 파이프라인"""
+    """
+    MongoDB 저장 파이프라인
     
-    def __init__(self, mongo_uri, mongo_db):
+    아이템마다 update_one을 호출하지 않고 컬렉션별로 UpdateOne 연산을 모아 두었다가
+    unordered bulk_write로 한 번에 저장합니다. 버퍼는 다음 경우에 비워집니다.
+    
+    - 컬렉션 버퍼가 MONGODB_BATCH_SIZE개에 도달했을 때
+    - MONGODB_FLUSH_INTERVAL초마다 (남아 있는 버퍼 전체)
+    - close_spider에서
+    
+    MONGODB_BATCH_SIZE를 1로 두면 아이템마다 바로 저장합니다.
+    ChangeDetectionPipeline이 내용 변경 없음으로 표시한 아이템은 METRIC_FIELDS와
+    crawled_at만 $set 합니다 (문서가 없으면 나머지 필드는 $setOnInsert로 함께 삽입).
+    bulk_write는 DatabaseWriter 스레드 풀에서 실행되어 리액터를 막지 않습니다.
+    저장에 성공한 아이템은 items_stored 신호로 ChangeDetectionPipeline에 알립니다.
+    """
+    
+    def __init__(self, mongo_uri, mongo_db, batch_size=100, flush_interval=5.0, stats=None,
+                 writer_threads=4, writer_max_pending=16, signals=None):
         self.mongo_uri = mongo_uri
         self.mongo_db = mongo_db
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.stats = stats
+        self.signals = signals
+        self.writer = DatabaseWriter('mongodb-writer', writer_threads, writer_max_pending)
+        
+        # 컬렉션 이름 -> 저장 대기 중인 UpdateOne 리스트와 같은 순서의 content_key 리스트
+        self.buffers = {}
+        self.buffer_keys = {}
+        self.flush_loop = None
     
     @classmethod
     def from_crawler(cls, crawler):
         return cls(
             mongo_uri=crawler.settings.get('MONGODB_URI'),
-            mongo_db=crawler.settings.get('MONGODB_DATABASE')
+            mongo_db=crawler.settings.get('MONGODB_DATABASE'),
+            batch_size=crawler.settings.getint('MONGODB_BATCH_SIZE', 100),
+            flush_interval=crawler.settings.getfloat('MONGODB_FLUSH_INTERVAL', 5.0),
+            stats=crawler.stats,
+            writer_threads=crawler.settings.getint('DB_WRITER_THREADS', 4),
+            writer_max_pending=crawler.settings.getint('DB_WRITER_MAX_PENDING', 16),
+            signals=crawler.signals
         )
     
     def open_spider(self, spider):
@@ -147,8 +618,22 @@ class MongoDBPipeline:
         
         # 컬렉션별 인덱스 생성
         self._create_indexes()
+        
+        self.writer.start()
+        
+        # 일정 시간마다 남은 버퍼 저장
+        if self.batch_size > 1 and self.flush_interval > 0:
+            self.flush_loop = task.LoopingCall(self.flush_all)
+            self.flush_loop.start(self.flush_interval, now=False)
     
+    @defer.inlineCallbacks
     def close_spider(self, spider):
+        # 주기 저장 중단 -> 남은 버퍼 저장 -> 쓰기 완료 대기 -> 연결 종료 순서로 정리
+        if self.flush_loop is not None and self.flush_loop.running:
+            self.flush_loop.stop()
+        
+        yield self.flush_all()
+        yield self.writer.close()
         self.client.close()
     
     def process_item(self, item, spider):
@@ -156,55 +641,111 @@ class MongoDBPipeline:
         
         # 아이템 타입에 따른 컬렉션 선택
         collection_name = self._get_collection_name(item)
-        collection = self.db[collection_name]
         
         # 중복 체크를 위한 고유 키 생성
         unique_key = self._generate_unique_key(item)
         
-        # 업서트 (중복이면 업데이트, 없으면 삽입)
-        collection.update_one(
-            {'unique_key': unique_key},
-            {'$set': dict(adapter)},
-            upsert=True
-        )
+        buffer = self.buffers.setdefault(collection_name, [])
+        if adapter.get('content_unchanged'):
+            # 내용이 그대로면 점수/댓글 수 같은 지표만 갱신
+            # (앞선 전체 저장이 실패해 문서가 없으면 나머지 필드까지 삽입)
+            fields = metric_update(adapter, collection_name)
+            if not fields:
+                return item
+            row = storage_row(adapter)
+            buffer.append(UpdateOne(
+                {'unique_key': unique_key},
+                {'$set': fields,
+                 '$setOnInsert': {key: value for key, value in row.items() if key not in fields}},
+                upsert=True
+            ))
+        else:
+            # 업서트 (중복이면 업데이트, 없으면 삽입) 연산을 버퍼에 추가
+            buffer.append(UpdateOne(
+                {'unique_key': unique_key},
+                {'$set': storage_row(adapter)},
+                upsert=True
+            ))
+        self.buffer_keys.setdefault(collection_name, []).append(content_key(item))
+        logger.debug(f"Buffered {collection_name} item: {unique_key}")
+        
+        if len(buffer) >= self.batch_size:
+            # 배치를 채운 아이템은 그 배치의 쓰기가 끝날 때까지 붙잡아 backpressure 적용
+            # (DatabaseWriter가 밀려 있으면 대기열 순서를 기다리는 시간도 포함)
+            return self.flush(collection_name).addCallback(lambda _: item)
         
-        logger.info(f"Saved {collection_name} item: {unique_key}")
         return item
     
+    def flush_all(self) -> defer.Deferred:
+        """모든 컬렉션 버퍼 저장"""
+        return defer.DeferredList([self.flush(name) for name in list(self.buffers)])
+    
+    def flush(self, collection_name) -> defer.Deferred:
+        """컬렉션 버퍼를 스레드 풀에서 bulk_write로 저장하고 통계 기록"""
+        operations = self.buffers.pop(collection_name, None)
+        keys = self.buffer_keys.pop(collection_name, [])
+        if not operations:
+            return defer.succeed(None)
+        
+        d = self.writer.submit(self._bulk_write, collection_name, operations)
+        d.addCallback(self._record_flush, collection_name, keys)
+        return d
+    
+    def _bulk_write(self, collection_name, operations):
+        """bulk_write 실행 (writer 스레드에서 호출)"""
+        started = time.monotonic()
+        try:
+            result = self.db[collection_name].bulk_write(operations, ordered=False)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            # unordered 모드에서는 실패한 연산을 제외한 나머지는 저장됨
+            details = e.details
+            logger.error(f"MongoDB bulk write errors in {collection_name}: "
+                         f"{len(details.get('writeErrors', []))} failed")
+        except Exception as e:
+            logger.error(f"MongoDB bulk write failed for {collection_name}: {e}")
+            details = None
+        return details, (time.monotonic() - started) * 1000
+    
+    def _record_flush(self, outcome, collection_name, keys):
+        """저장 결과를 통계에 기록하고 저장된 아이템을 알림 (리액터 스레드에서 호출)"""
+        details, elapsed_ms = outcome
+        count = len(keys)
+        if details is None:
+            self._inc_stat('mongodb/failed_items', count)
+            return
+        
+        upserted = details.get('nUpserted', 0)
+        modified = details.get('nModified', 0)
+        failed = {error['index'] for error in details.get('writeErrors', [])}
+        
+        self._inc_stat('mongodb/flush_count')
+        self._inc_stat('mongodb/flushed_items', count)
+        self._inc_stat('mongodb/upserted_count', upserted)
+        self._inc_stat('mongodb/modified_count', modified)
+        self._inc_stat('mongodb/failed_items', len(failed))
+        self._inc_stat('mongodb/flush_time_total_ms', elapsed_ms)
+        if self.stats is not None:
+            self.stats.max_value('mongodb/flush_time_max_ms', elapsed_ms)
+        
+        logger.info(f"Saved {count} {collection_name} items in {elapsed_ms:.1f}ms "
+                    f"(upserted: {upserted}, modified: {modified})")
+        
+        # unordered 모드에서 실패한 연산(writeErrors의 index)은 빼고 알림
+        notify_stored(self.signals, [key for index, key in enumerate(keys) if key and index not in failed])
+    
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가 (stats가 없으면 무시)"""
+        if self.stats is not None and count:
+            self.stats.inc_value(key, count)
+    
     def _get_collection_name(self, item) -> str:
         """아이템 타입에 따른 컬렉션 이름 반환"""
-        item_type = type(item).__name__
-        collection_mapping = {
-            'RedditPostItem': 'reddit_posts',
-            'HackerNewsItem': 'hackernews_items',
-            'JobPostingItem': 'job_postings',
-            'GitHubRepoItem': 'github_repos',
-            'StackOverflowItem': 'stackoverflow_items',
-            'CompanyNewsItem': 'company_news'
-        }
-        return collection_mapping.get(item_type, 'general_items')
+        return get_storage_name(item)
     
     def _generate_unique_key(self, item) -> str:
         """아이템의 고유 키 생성"""
-        adapter = ItemAdapter(item)
-        
-        # 아이템 타입별 고유 키 생성
-        if 'post_id' in adapter:
-            return f"reddit_{adapter['post_id']}"
-        elif 'item_id' in adapter:
-            return f"hn_{adapter['item_id']}"
-        elif 'job_id' in adapter:
-            return f"job_{adapter['job_id']}"
-        elif 'repo_id' in adapter:
-            return f"repo_{adapter['repo_id']}"
-        elif 'question_id' in adapter:
-            return f"so_{adapter['question_id']}"
-        elif 'news_id' in adapter:
-            return f"news_{adapter['news_id']}"
-        else:
-            # URL 기반 해시 생성
-            url = adapter.get('url', '')
-            return hashlib.md5(url.encode()).hexdigest()
+        return generate_unique_key(item)
     
     def _create_indexes(self):
         """컬렉션별 인덱스 생성"""
@@ -215,6 +756,12 @@ class MongoDBPipeline:
                 [('crawled_at', -1)],
                 [('sentiment_score.vader_compound', 1)]
             ],
+            'reddit_comments': [
+                [('comment_id', 1), ('unique', True)],
+                [('post_id', 1)],
+                [('subreddit', 1), ('created_utc', -1)],
+                [('crawled_at', -1)]
+            ],
             'hackernews_items': [
                 [('item_id', 1), ('unique', True)],
                 [('time', -1)],
@@ -256,27 +803,165 @@ class MongoDBPipeline:
                     logger.warning(f"Index creation failed for {collection_name}: {e}")
 
 
+class TableStatements:
+    """
+    테이블 하나에 대한 고정 컬럼 목록과 미리 만들어 둔 upsert SQL
+    
+    컬럼 목록은 open_spider에서 한 번 정해지므로 아이템의 필드 구성이 달라도 SQL 텍스트가
+    바뀌지 않습니다. 아이템에 없는 필드는 NULL로, 스키마에 없는 필드는 extra(JSONB)로
+    저장됩니다.
+    """
+    
+    def __init__(self, table_name, columns):
+        self.table_name = table_name
+        self.columns = columns
+        self.names = [name for name, _ in columns]
+        self.known = frozenset(self.names)
+        self.extra_index = self.names.index('extra') if 'extra' in self.known else None
+        self.copy_encoders = [copy_encoder(udt_name) for _, udt_name in columns]
+        self.param_adapters = [param_adapter(udt_name) for _, udt_name in columns]
+        
+        column_list = ', '.join(self.names)
+        updates = ', '.join(f"{name} = EXCLUDED.{name}" for name in self.names if name != 'unique_key')
+        upsert = f"ON CONFLICT (unique_key) DO UPDATE SET {updates}"
+        
+        # 아이템별 저장: 연결마다 한 번 PREPARE 해 두고 EXECUTE로 실행
+        self.statement_name = f"{table_name}_upsert"
+        placeholders = ', '.join(f"${i}" for i in range(1, len(self.names) + 1))
+        self.prepare_sql = (f"PREPARE {self.statement_name} AS "
+                            f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders}) {upsert}")
+        self.execute_sql = f"EXECUTE {self.statement_name} ({', '.join(['%s'] * len(self.names))})"
+        
+        # 배치 저장: 임시 스테이징 테이블에 COPY 한 뒤 병합
+        self.staging_table = f"{table_name}_staging"
+        self.create_staging_sql = (f"CREATE TEMP TABLE IF NOT EXISTS {self.staging_table} ON COMMIT DELETE ROWS AS "
+                                   f"SELECT {column_list} FROM {table_name} WITH NO DATA")
+        self.copy_sql = f"COPY {self.staging_table} ({column_list}) FROM STDIN"
+        self.merge_sql = (f"INSERT INTO {table_name} ({column_list}) "
+                          f"SELECT {column_list} FROM {self.staging_table} {upsert}")
+        
+        # 내용이 바뀌지 않은 아이템: 행이 있으면 지표 컬럼만 갱신하고 (아이템에 없는 필드는 기존 값 유지),
+        # 앞선 전체 저장이 실패해 행이 없으면 전체 행을 삽입
+        self.metric_names = [name for name in (*METRIC_FIELDS.get(table_name, ()), 'crawled_at')
+                             if name in self.known]
+        if self.metric_names:
+            assignments = ', '.join(f"{name} = COALESCE(EXCLUDED.{name}, {table_name}.{name})"
+                                    for name in self.metric_names)
+            metric_upsert = f"ON CONFLICT (unique_key) DO UPDATE SET {assignments}"
+        else:
+            metric_upsert = "ON CONFLICT (unique_key) DO NOTHING"
+        self.upsert_metrics_sql = (f"INSERT INTO {table_name} ({column_list}) "
+                                   f"VALUES ({', '.join(['%s'] * len(self.names))}) {metric_upsert}")
+    
+    def values(self, row) -> list:
+        """행(dict)을 컬럼 순서의 값 리스트로 변환 (스키마에 없는 필드는 extra로 모음)"""
+        values = [row.get(name) for name in self.names]
+        if self.extra_index is not None:
+            extra = {key: value for key, value in row.items() if key not in self.known}
+            values[self.extra_index] = extra or None
+        return values
+    
+    def copy_line(self, row) -> str:
+        """COPY 텍스트 포맷 한 줄"""
+        return '\t'.join([encode(value) for encode, value in zip(self.copy_encoders, self.values(row))])
+    
+    def params(self, row) -> list:
+        """EXECUTE / upsert_metrics_sql 파라미터 리스트"""
+        return [adapt(value) for adapt, value in zip(self.param_adapters, self.values(row))]
+    
+
 class PostgreSQLPipeline:
-    """PostgreSQL 저장 파이프라인"""
+    """
+    PostgreSQL 저장 파이프라인
+    
+    POSTGRES_BATCH_SIZE가 1보다 크면 아이템을 테이블별로 모아 두었다가 다음 순서로
+    한 번에 저장합니다.
+    
+    1. COPY ... FROM STDIN으로 세션 전용 임시 스테이징 테이블에 적재 (WAL 기록 없음)
+    2. INSERT ... SELECT ... ON CONFLICT (unique_key) DO UPDATE 한 번으로 본 테이블에 병합
+    
+    버퍼는 배치 크기에 도달했을 때, POSTGRES_FLUSH_INTERVAL초마다, close_spider에서
+    비워집니다. POSTGRES_BATCH_SIZE를 1로 두면 아이템마다 미리 PREPARE 해 둔 upsert를
+    실행합니다.
+    
+    ChangeDetectionPipeline이 내용 변경 없음으로 표시한 아이템은 COPY 하지 않고
+    METRIC_FIELDS와 crawled_at 컬럼만 갱신합니다 (행이 없으면 전체 행을 삽입).
+    저장에 성공한 아이템은 items_stored 신호로 ChangeDetectionPipeline에 알립니다.
+    
+    저장 컬럼은 테이블별로 고정됩니다 (TABLE_ITEMS의 아이템 필드 중 스키마에 있는 것 +
+    unique_key + extra). 스키마에 없는 필드(예: stock_tickers)는 extra JSONB 컬럼에 들어갑니다.
+    
+    쓰기는 DatabaseWriter 스레드 풀에서 실행되며, 스레드마다 연결 풀
+    (ThreadedConnectionPool)에서 연결을 빌려 씁니다.
+    """
+    
+    # 테이블 이름 -> 저장할 아이템 클래스
+    TABLE_ITEMS = {
+        'reddit_posts': RedditPostItem,
+        'reddit_comments': RedditCommentItem,
+        'hackernews_items': HackerNewsItem,
+        'job_postings': JobPostingItem,
+        'github_repos': GitHubRepoItem,
+        'stackoverflow_items': StackOverflowItem,
+        'company_news': CompanyNewsItem
+    }
     
-    def __init__(self, postgres_url):
+    def __init__(self, postgres_url, batch_size=500, flush_interval=5.0, stats=None,
+                 writer_threads=4, writer_max_pending=16, signals=None):
         self.postgres_url = postgres_url
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.stats = stats
+        self.signals = signals
+        self.writer_threads = max(1, writer_threads)
+        self.writer = DatabaseWriter('postgres-writer', self.writer_threads, writer_max_pending)
+        
+        # 테이블 이름 -> TableStatements (open_spider에서 스키마로부터 채움)
+        self.statements = {}
+        # PREPARE를 마친 (백엔드 PID, 테이블 이름)
+        self.prepared = set()
+        # 테이블 이름 -> 저장 대기 중인 아이템(dict) 리스트
+        self.buffers = {}
+        self.flush_loop = None
     
     @classmethod
     def from_crawler(cls, crawler):
         return cls(
-            postgres_url=crawler.settings.get('POSTGRES_URL')
+            postgres_url=crawler.settings.get('POSTGRES_URL'),
+            batch_size=crawler.settings.getint('POSTGRES_BATCH_SIZE', 500),
+            flush_interval=crawler.settings.getfloat('POSTGRES_FLUSH_INTERVAL', 5.0),
+            stats=crawler.stats,
+            writer_threads=crawler.settings.getint('DB_WRITER_THREADS', 4),
+            writer_max_pending=crawler.settings.getint('DB_WRITER_MAX_PENDING', 16),
+            signals=crawler.signals
         )
     
     def open_spider(self, spider):
-        self.connection = psycopg2.connect(self.postgres_url)
-        self.cursor = self.connection.cursor(cursor_factory=RealDictCursor)
-        self._create_tables()
+        self.connection_pool = ThreadedConnectionPool(1, self.writer_threads, self.postgres_url)
+        
+        connection = self.connection_pool.getconn()
+        try:
+            self._create_tables(connection)
+            self.statements = self._build_statements(connection)
+        finally:
+            self.connection_pool.putconn(connection)
+        
+        self.writer.start()
+        
+        # 일정 시간마다 남은 버퍼 저장
+        if self.batch_size > 1 and self.flush_interval > 0:
+            self.flush_loop = task.LoopingCall(self.flush_all)
+            self.flush_loop.start(self.flush_interval, now=False)
     
+    @defer.inlineCallbacks
     def close_spider(self, spider):
-        self.connection.commit()
-        self.cursor.close()
-        self.connection.close()
+        # 주기 저장 중단 -> 남은 버퍼 저장 -> 쓰기 완료 대기 -> 연결 종료 순서로 정리
+        if self.flush_loop is not None and self.flush_loop.running:
+            self.flush_loop.stop()
+        
+        yield self.flush_all()
+        yield self.writer.close()
+        self.connection_pool.closeall()
     
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
@@ -284,47 +969,197 @@ class PostgreSQLPipeline:
         # 아이템 타입에 따른 테이블 선택
         table_name = self._get_table_name(item)
         
-        # 데이터 삽입
-        self._insert_item(adapter, table_name)
+        if self.batch_size == 1:
+            # 데이터 삽입 (스레드 풀에서 실행, 완료되면 아이템 반환)
+            d = self.writer.submit(self._insert_item, adapter, table_name)
+            d.addCallback(lambda stored: notify_stored(self.signals, [content_key(item)] if stored else []))
+            return d.addCallback(lambda _: item)
+        
+        buffer = self.buffers.setdefault(table_name, [])
+        buffer.append((storage_row(adapter), bool(adapter.get('content_unchanged'))))
+        
+        if len(buffer) >= self.batch_size:
+            # 배치를 채운 아이템은 그 배치의 쓰기가 끝날 때까지 붙잡아 backpressure 적용
+            # (DatabaseWriter가 밀려 있으면 대기열 순서를 기다리는 시간도 포함)
+            return self.flush(table_name).addCallback(lambda _: item)
         
         return item
     
+    def flush_all(self) -> defer.Deferred:
+        """모든 테이블 버퍼 저장"""
+        return defer.DeferredList([self.flush(name) for name in list(self.buffers)])
+    
+    def flush(self, table_name) -> defer.Deferred:
+        """테이블 버퍼를 스레드 풀에서 COPY + 병합으로 저장하고 통계 기록"""
+        rows = self.buffers.pop(table_name, None)
+        if not rows:
+            return defer.succeed(None)
+        
+        d = self.writer.submit(self._copy_rows, table_name, rows)
+        d.addCallback(self._record_flush, table_name, rows)
+        return d
+    
+    def _copy_rows(self, table_name, rows):
+        """
+        rows를 스테이징 테이블에 COPY한 뒤 본 테이블로 병합 (writer 스레드에서 호출)
+        
+        병합된 행 수와 소요 시간(ms)을 반환하고, 실패하면 None을 반환합니다.
+        """
+        started = time.monotonic()
+        statements = self.statements.get(table_name)
+        if statements is None:
+            logger.error(f"PostgreSQL table {table_name} has no known columns, dropping {len(rows)} rows")
+            return None
+        
+        # 같은 배치 안에서 unique_key가 겹치면 ON CONFLICT가 한 행을 두 번 갱신하려다
+        # 실패하므로 마지막 값만 남김
+        latest = {}
+        for row, content_unchanged in rows:
+            row['unique_key'] = generate_unique_key(row)
+            latest[row['unique_key']] = (row, content_unchanged)
+        
+        # 내용이 바뀌지 않은 행은 COPY 하지 않고 지표만 갱신
+        changed, unchanged = [], []
+        for row, content_unchanged in latest.values():
+            (unchanged if content_unchanged else changed).append(row)
+        
+        data = io.StringIO()
+        for row in changed:
+            data.write(statements.copy_line(row))
+            data.write('\n')
+        data.seek(0)
+        
+        connection = self.connection_pool.getconn()
+        try:
+            merged = 0
+            with connection.cursor() as cursor:
+                if changed:
+                    # 임시 테이블은 연결(세션)마다 따로 생기므로 writer 스레드끼리 겹치지 않음
+                    cursor.execute(statements.create_staging_sql)
+                    cursor.copy_expert(statements.copy_sql, data)
+                    cursor.execute(statements.merge_sql)
+                    merged = cursor.rowcount
+                if unchanged:
+                    execute_batch(cursor, statements.upsert_metrics_sql,
+                                  [statements.params(row) for row in unchanged])
+                    merged += len(unchanged)
+            connection.commit()
+            
+        except Exception as e:
+            logger.error(f"PostgreSQL COPY error for {table_name}: {e}")
+            connection.rollback()
+            return None
+        finally:
+            self.connection_pool.putconn(connection)
+        
+        return merged, (time.monotonic() - started) * 1000
+    
+    def _record_flush(self, outcome, table_name, rows):
+        """저장 결과를 통계에 기록하고 저장된 아이템을 알림 (리액터 스레드에서 호출)"""
+        count = len(rows)
+        if outcome is None:
+            self._inc_stat('postgres/failed_items', count)
+            return
+        
+        merged, elapsed_ms = outcome
+        self._inc_stat('postgres/flush_count')
+        self._inc_stat('postgres/flushed_items', count)
+        self._inc_stat('postgres/merged_rows', merged)
+        self._inc_stat('postgres/flush_time_total_ms', elapsed_ms)
+        if self.stats is not None:
+            self.stats.max_value('postgres/flush_time_max_ms', elapsed_ms)
+        
+        logger.info(f"Saved {count} {table_name} items in {elapsed_ms:.1f}ms (merged rows: {merged})")
+        
+        # 배치는 한 트랜잭션이므로 성공하면 모두 저장됨
+        notify_stored(self.signals, [key for key in (content_key(row) for row, _ in rows) if key])
+    
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가 (stats가 없으면 무시)"""
+        if self.stats is not None and count:
+            self.stats.inc_value(key, count)
+    
     def _get_table_name(self, item) -> str:
         """아이템 타입에 따른 테이블 이름 반환"""
-        item_type = type(item).__name__
-        table_mapping = {
-            'RedditPostItem': 'reddit_posts',
-            'HackerNewsItem': 'hackernews_items',
-            'JobPostingItem': 'job_postings',
-            'GitHubRepoItem': 'github_repos',
-            'StackOverflowItem': 'stackoverflow_items',
-            'CompanyNewsItem': 'company_news'
-        }
-        return table_mapping.get(item_type, 'general_items')
+        return get_storage_name(item)
     
-    def _insert_item(self, adapter, table_name):
-        """아이템을 테이블에 삽입"""
+    def _insert_item(self, adapter, table_name) -> bool:
+        """아이템을 테이블에 삽입하고 성공 여부를 반환 (writer 스레드에서 호출)"""
+        statements = self.statements.get(table_name)
+        if statements is None:
+            logger.error(f"PostgreSQL table {table_name} has no known columns")
+            return False
+        
+        row = storage_row(adapter)
+        row['unique_key'] = generate_unique_key(row)
+        
+        connection = self.connection_pool.getconn()
         try:
-            # 동적 SQL 생성
-            columns = list(adapter.keys())
-            values = [adapter[col] for col in columns]
-            placeholders = ', '.join(['%s'] * len(columns))
-            
-            query = f"""
-                INSERT INTO {table_name} ({', '.join(columns)})
-                VALUES ({placeholders})
-                ON CONFLICT (unique_key) DO UPDATE SET
-                {', '.join([f"{col} = EXCLUDED.{col}" for col in columns])}
-            """
-            
-            self.cursor.execute(query, values)
-            self.connection.commit()
+            if adapter.get('content_unchanged'):
+                # 내용이 그대로면 점수/댓글 수 같은 지표만 갱신 (행이 없으면 삽입)
+                with connection.cursor() as cursor:
+                    cursor.execute(statements.upsert_metrics_sql, statements.params(row))
+            else:
+                self._prepare(connection, statements)
+                with connection.cursor() as cursor:
+                    execute_batch(cursor, statements.execute_sql, [statements.params(row)])
+            connection.commit()
+            return True
             
         except Exception as e:
             logger.error(f"PostgreSQL insert error: {e}")
-            self.connection.rollback()
+            connection.rollback()
+            return False
+        finally:
+            self.connection_pool.putconn(connection)
     
-    def _create_tables(self):
+    def _prepare(self, connection, statements):
+        """연결에 테이블 upsert 문을 아직 PREPARE 하지 않았으면 PREPARE"""
+        key = (connection.get_backend_pid(), statements.table_name)
+        if key in self.prepared:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(statements.prepare_sql)
+        connection.commit()
+        self.prepared.add(key)
+    
+    def _build_statements(self, connection):
+        """TABLE_ITEMS와 실제 스키마로 테이블별 고정 컬럼 목록과 SQL 생성"""
+        schema_columns = self._load_table_columns(connection)
+        
+        statements = {}
+        for table_name, item_class in self.TABLE_ITEMS.items():
+            columns = [
+                (name, udt_name) for name, udt_name in schema_columns.get(table_name, [])
+                if name in item_class.fields or name in ('unique_key', 'extra')
+            ]
+            if columns:
+                statements[table_name] = TableStatements(table_name, columns)
+        return statements
+    
+    def _load_table_columns(self, connection):
+        """
+        실제 스키마에서 테이블별 컬럼 조회
+        
+        init.sql로 만든 테이블의 id SERIAL처럼 시퀀스로 채워지는 컬럼은 제외합니다.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT table_name, column_name, udt_name
+                FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND (column_default IS NULL OR column_default NOT LIKE 'nextval(%%')
+                ORDER BY table_name, ordinal_position
+            """)
+            rows = cursor.fetchall()
+        connection.commit()
+        
+        table_columns = {}
+        for table_name, column_name, udt_name in rows:
+            table_columns.setdefault(table_name, []).append((column_name, udt_name))
+        return table_columns
+    
+    def _create_tables(self, connection):
         """필요한 테이블 생성"""
         tables = {
             'reddit_posts': """
@@ -345,7 +1180,29 @@ class PostgreSQLPipeline:
                     domain VARCHAR(255),
                     crawled_at TIMESTAMP,
                     sentiment_score JSONB,
-                    tech_keywords TEXT[]
+                    tech_keywords TEXT[],
+                    content_hash VARCHAR(32),
+                    extra JSONB
+                )
+            """,
+            'reddit_comments': """
+                CREATE TABLE IF NOT EXISTS reddit_comments (
+                    unique_key VARCHAR(255) PRIMARY KEY,
+                    comment_id VARCHAR(50),
+                    post_id VARCHAR(50),
+                    parent_id VARCHAR(50),
+                    body TEXT,
+                    author VARCHAR(100),
+                    subreddit VARCHAR(100),
+                    score INTEGER,
+                    depth INTEGER,
+                    created_utc TIMESTAMP,
+                    permalink TEXT,
+                    crawled_at TIMESTAMP,
+                    sentiment_score JSONB,
+                    tech_keywords TEXT[],
+                    content_hash VARCHAR(32),
+                    extra JSONB
                 )
             """,
             'hackernews_items': """
@@ -362,7 +1219,9 @@ class PostgreSQLPipeline:
                     text TEXT,
                     crawled_at TIMESTAMP,
                     sentiment_score JSONB,
-                    tech_keywords TEXT[]
+                    tech_keywords TEXT[],
+                    content_hash VARCHAR(32),
+                    extra JSONB
                 )
             """,
             'job_postings': """
@@ -382,7 +1241,9 @@ class PostgreSQLPipeline:
                     url TEXT,
                     crawled_at TIMESTAMP,
                     tech_skills TEXT[],
-                    seniority_level VARCHAR(50)
+                    seniority_level VARCHAR(50),
+                    content_hash VARCHAR(32),
+                    extra JSONB
                 )
             """,
             'github_repos': """
@@ -405,7 +1266,9 @@ class PostgreSQLPipeline:
                     topics TEXT[],
                     license VARCHAR(255),
                     size INTEGER,
-                    crawled_at TIMESTAMP
+                    crawled_at TIMESTAMP,
+                    content_hash VARCHAR(32),
+                    extra JSONB
                 )
             """,
             'stackoverflow_items': """
@@ -424,7 +1287,9 @@ class PostgreSQLPipeline:
                     last_activity_date TIMESTAMP,
                     is_answered BOOLEAN,
                     crawled_at TIMESTAMP,
-                    tech_category VARCHAR(100)
+                    tech_category VARCHAR(100),
+                    content_hash VARCHAR(32),
+                    extra JSONB
                 )
             """,
             'company_news': """
@@ -440,43 +1305,313 @@ class PostgreSQLPipeline:
                     news_type VARCHAR(100),
                     crawled_at TIMESTAMP,
                     sentiment_score JSONB,
-                    impact_score FLOAT
+                    impact_score FLOAT,
+                    content_hash VARCHAR(32),
+                    extra JSONB
                 )
             """
         }
         
         for table_name, create_sql in tables.items():
             try:
-                self.cursor.execute(create_sql)
-                self.connection.commit()
+                with connection.cursor() as cursor:
+                    cursor.execute(create_sql)
+                    # 이전에 만들어진 테이블에도 content_hash, extra 컬럼 추가
+                    cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS content_hash VARCHAR(32)")
+                    cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS extra JSONB")
+                connection.commit()
             except Exception as e:
                 logger.error(f"Table creation error for {table_name}: {e}")
+                connection.rollback()
 
 
 class DuplicatesPipeline:
-    """중복 제거 파이프라인"""
+    """
+    중복 제거 파이프라인
+    
+    아이템 고유 키(generate_unique_key, ID도 URL도 없으면 제목 해시)를 SeenFilter에
+    기록해 두고, DEDUPE_TTL초 안에 다시 수집된 아이템을 감성 분석과 저장 전에 버립니다.
+    필터는 크롤링 실행이 끝나도 유지되며 (DEDUPE_BACKEND: file 또는 redis), 크기는
+    DEDUPE_CAPACITY와 DEDUPE_ERROR_RATE로 제한됩니다.
+    
+    ChangeDetectionPipeline 뒤에 두어, 고유 ID가 있는 아이템은 내용이 그대로인
+    (content_unchanged) 경우에만 버립니다. 내용이 바뀐 아이템은 다시 분석/저장되도록
+    통과시키고, 내용이 그대로인 아이템도 DEDUPE_TTL이 지나면 통과해 지표가 갱신됩니다.
+    
+    Bloom filter는 처음 보는 아이템을 중복이라고 잘못 답할 수 있습니다.
+    DEDUPE_EXACT_CHECK를 mongodb 또는 postgres로 두면 중복으로 판정된 아이템만
+    저장소에 실제로 있는지 다시 확인하고, 없으면 통과시킵니다.
+    """
+    
+    def __init__(self, backend='file', directory='dedupe', redis_url=None, ttl=86400,
+                 capacity=1000000, error_rate=0.001, generations=4, exact_check='',
+                 mongo_uri=None, mongo_db=None, postgres_url=None, stats=None,
+                 writer_threads=4, writer_max_pending=16):
+        self.backend = backend
+        self.directory = directory
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.generations = generations
+        self.exact_check = (exact_check or '').lower()
+        self.mongo_uri = mongo_uri
+        self.mongo_db = mongo_db
+        self.postgres_url = postgres_url
+        self.stats = stats
+        self.writer_threads = max(1, writer_threads)
+        self.checker = DatabaseWriter('dedupe-checker', self.writer_threads, writer_max_pending)
+        self.seen = None
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            backend=crawler.settings.get('DEDUPE_BACKEND', 'file'),
+            directory=crawler.settings.get('DEDUPE_DIR', 'dedupe'),
+            redis_url=crawler.settings.get('REDIS_URL'),
+            ttl=crawler.settings.getint('DEDUPE_TTL', 86400),
+            capacity=crawler.settings.getint('DEDUPE_CAPACITY', 1000000),
+            error_rate=crawler.settings.getfloat('DEDUPE_ERROR_RATE', 0.001),
+            generations=crawler.settings.getint('DEDUPE_GENERATIONS', 4),
+            exact_check=crawler.settings.get('DEDUPE_EXACT_CHECK', ''),
+            mongo_uri=crawler.settings.get('MONGODB_URI'),
+            mongo_db=crawler.settings.get('MONGODB_DATABASE'),
+            postgres_url=crawler.settings.get('POSTGRES_URL'),
+            stats=crawler.stats,
+            writer_threads=crawler.settings.getint('DB_WRITER_THREADS', 4),
+            writer_max_pending=crawler.settings.getint('DB_WRITER_MAX_PENDING', 16)
+        )
     
-    def __init__(self):
-        self.seen_urls = set()
-        self.seen_titles = set()
+    def open_spider(self, spider):
+        # 스파이더마다 필터를 따로 둠
+        if self.backend == 'redis':
+            self.seen = SeenFilter(
+                f"stock_tech_trends:seen:{spider.name}", self.ttl, self.capacity, self.error_rate,
+                self.generations, redis_client=redis.Redis.from_url(self.redis_url)
+            )
+        else:
+            self.seen = SeenFilter(
+                spider.name, self.ttl, self.capacity, self.error_rate, self.generations,
+                directory=os.path.join(data_path(self.directory, createdir=True), spider.name)
+            )
+        
+        if self.exact_check == 'mongodb':
+            self.client = pymongo.MongoClient(self.mongo_uri)
+            self.db = self.client[self.mongo_db]
+        elif self.exact_check == 'postgres':
+            self.connection_pool = ThreadedConnectionPool(1, self.writer_threads, self.postgres_url)
+        
+        if self.exact_check:
+            self.checker.start()
+    
+    @defer.inlineCallbacks
+    def close_spider(self, spider):
+        if self.exact_check:
+            yield self.checker.close()
+        if self.exact_check == 'mongodb':
+            self.client.close()
+        elif self.exact_check == 'postgres':
+            self.connection_pool.closeall()
+        
+        self.seen.close()
     
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
         
-        # URL 기반 중복 체크
-        url = adapter.get('url', '')
-        if url and url in self.seen_urls:
-            raise DropItem(f"Duplicate URL found: {url}")
-        elif url:
-            self.seen_urls.add(url)
+        unique_key = self._dedupe_key(adapter)
+        if unique_key is None:
+            return item
+        
+        # 처음 보는 아이템
+        if unique_key not in self.seen:
+            self.seen.add(unique_key)
+            self._inc_stat('dedupe/new_items')
+            return item
+        
+        # 이미 본 아이템이라도 내용이 바뀌었으면 통과 (ChangeDetectionPipeline이 해시를 붙인 아이템만)
+        if adapter.get('content_hash') and not adapter.get('content_unchanged'):
+            self.seen.add(unique_key)
+            self._inc_stat('dedupe/changed_items')
+            return item
+        
+        if not self.exact_check:
+            self._inc_stat('dedupe/dropped_items')
+            raise DropItem(f"Duplicate item found: {unique_key}")
+        
+        # 필터가 중복이라고 답한 아이템만 저장소에서 다시 확인 (스레드 풀에서 실행)
+        d = self.checker.submit(self._exists_in_store, item, unique_key)
+        return d.addCallback(self._confirm_duplicate, item, unique_key)
+    
+    def _dedupe_key(self, adapter):
+        """중복 판단 키 (ID나 URL이 있으면 저장소와 같은 unique_key, 없으면 제목 해시)"""
+        if has_unique_id(adapter):
+            return generate_unique_key(adapter.item)
         
-        # 제목 기반 중복 체크 (URL이 없는 경우)
         title = adapter.get('title', '')
-        if title and not url:
-            title_hash = hashlib.md5(title.encode()).hexdigest()
-            if title_hash in self.seen_titles:
-                raise DropItem(f"Duplicate title found: {title}")
-            else:
-                self.seen_titles.add(title_hash)
+        if title:
+            return f"title_{hashlib.md5(title.encode()).hexdigest()}"
+        return None
+    
+    def _exists_in_store(self, item, unique_key) -> bool:
+        """저장소에 unique_key가 있는지 확인 (checker 스레드에서 호출)"""
+        storage_name = get_storage_name(item)
+        try:
+            if self.exact_check == 'mongodb':
+                return self.db[storage_name].find_one({'unique_key': unique_key}, {'_id': 1}) is not None
+            
+            connection = self.connection_pool.getconn()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT 1 FROM {storage_name} WHERE unique_key = %s", (unique_key,))
+                    found = cursor.fetchone() is not None
+                connection.rollback()
+                return found
+            finally:
+                self.connection_pool.putconn(connection)
+                
+        except Exception as e:
+            # 확인할 수 없으면 필터 판단을 따름
+            logger.warning(f"Exact duplicate check failed for {unique_key}: {e}")
+            return True
+    
+    def _confirm_duplicate(self, exists, item, unique_key):
+        """저장소 확인 결과에 따라 아이템을 버리거나 통과 (리액터 스레드에서 호출)"""
+        if exists:
+            self._inc_stat('dedupe/dropped_items')
+            raise DropItem(f"Duplicate item found: {unique_key}")
+        
+        self._inc_stat('dedupe/false_positives')
+        return item
+    
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가 (stats가 없으면 무시)"""
+        if self.stats is not None and count:
+            self.stats.inc_value(key, count)
+
+
+class ChangeDetectionPipeline:
+    """
+    내용 변경 감지 파이프라인
+    
+    (generate_unique_key, 제목/본문 해시) 쌍을 SeenFilter에 기록해 두고, 다시 크롤링된
+    아이템의 내용이 그대로면 content_unchanged로 표시합니다. 표시된 아이템은
+    MongoDB/PostgreSQL 파이프라인이 METRIC_FIELDS(점수, 댓글 수 등)와 crawled_at만 부분
+    업데이트하고, 감성 점수는 SentimentAnalysisPipeline이 캐시에서 붙입니다.
+    
+    필터 저장소와 크기는 DuplicatesPipeline과 같은 DEDUPE_* 설정을 쓰고, 해시를 기억하는
+    시간만 CHANGE_DETECTION_TTL로 따로 정합니다. Bloom filter 오탐이 나면 내용이 바뀐
+    아이템의 감성 점수가 다음 변경 때까지 갱신되지 않을 수 있습니다 (확률 DEDUPE_ERROR_RATE 수준).
+    
+    해시는 아이템이 실제로 저장된 뒤에 필터에 기록합니다. MongoDB/PostgreSQL 파이프라인이
+    켜져 있으면 그 파이프라인이 보내는 items_stored 신호로, 없으면 (피드 내보내기만 할 때)
+    item_scraped 신호로 기록합니다. 저장에 실패한 아이템은 다음 크롤링에서 다시 전체 저장됩니다.
+    그 전까지는 같은 실행 안에서 다시 나온 아이템만 content_unchanged로 표시합니다.
+    """
+    
+    def __init__(self, backend='file', directory='dedupe', redis_url=None, ttl=604800,
+                 capacity=1000000, error_rate=0.001, generations=4, stats=None):
+        self.backend = backend
+        self.directory = directory
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.generations = generations
+        self.stats = stats
+        self.seen = None
+        # 이번 실행에서 통과시켰지만 아직 저장이 확인되지 않은 키
+        self.pending = set()
+    
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls(
+            backend=crawler.settings.get('DEDUPE_BACKEND', 'file'),
+            directory=crawler.settings.get('DEDUPE_DIR', 'dedupe'),
+            redis_url=crawler.settings.get('REDIS_URL'),
+            ttl=crawler.settings.getint('CHANGE_DETECTION_TTL', 604800),
+            capacity=crawler.settings.getint('DEDUPE_CAPACITY', 1000000),
+            error_rate=crawler.settings.getfloat('DEDUPE_ERROR_RATE', 0.001),
+            generations=crawler.settings.getint('DEDUPE_GENERATIONS', 4),
+            stats=crawler.stats
+        )
+        crawler.signals.connect(pipeline.items_stored, signal=items_stored)
+        if not cls._storage_enabled(crawler.settings):
+            crawler.signals.connect(pipeline.item_scraped, signal=signals.item_scraped)
+        return pipeline
+    
+    @staticmethod
+    def _storage_enabled(settings) -> bool:
+        """ITEM_PIPELINES에 items_stored를 보내는 저장 파이프라인이 있는지 여부"""
+        for path in build_component_list(settings.getwithbase('ITEM_PIPELINES')):
+            pipeline_class = load_object(path)
+            if isinstance(pipeline_class, type) and issubclass(pipeline_class, (MongoDBPipeline, PostgreSQLPipeline)):
+                return True
+        return False
+    
+    def open_spider(self, spider):
+        # 스파이더마다 필터를 따로 둠 (DuplicatesPipeline 필터와 이름이 겹치지 않게)
+        if self.backend == 'redis':
+            self.seen = SeenFilter(
+                f"stock_tech_trends:content:{spider.name}", self.ttl, self.capacity, self.error_rate,
+                self.generations, redis_client=redis.Redis.from_url(self.redis_url)
+            )
+        else:
+            self.seen = SeenFilter(
+                f"{spider.name}-content", self.ttl, self.capacity, self.error_rate, self.generations,
+                directory=os.path.join(data_path(self.directory, createdir=True), f"{spider.name}-content")
+            )
+    
+    def close_spider(self, spider):
+        self.seen.close()
+        self.pending.clear()
+    
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        
+        # 저장소 키를 만들 수 없는 아이템은 항상 새 아이템으로 처리
+        if not has_unique_id(adapter):
+            return item
+        
+        adapter['content_hash'] = generate_content_hash(adapter)
         
+        key = content_key(item)
+        if key in self.pending or key in self.seen:
+            adapter['content_unchanged'] = True
+            self._inc_stat('change_detection/unchanged_items')
+        else:
+            self.pending.add(key)
+            self._inc_stat('change_detection/changed_items')
+        
+        return item
+    
+    def items_stored(self, keys):
+        """저장 파이프라인이 저장을 마친 아이템의 해시를 필터에 기록"""
+        for key in keys:
+            self.seen.add(key)
+            self.pending.discard(key)
+    
+    def item_scraped(self, item, spider):
+        """저장 파이프라인이 없을 때: 피드로 내보낸 아이템의 해시를 필터에 기록"""
+        key = content_key(item)
+        if key is not None:
+            self.items_stored([key])
+    
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가 (stats가 없으면 무시)"""
+        if self.stats is not None and count:
+            self.stats.inc_value(key, count)
+
+
+class TransientFieldsPipeline:
+    """
+    내부 필드 제거 파이프라인
+    
+    content_unchanged, normalized_text처럼 파이프라인끼리만 쓰는 필드를 지워 피드 내보내기
+    (scrapy crawl -o)에 남지 않게 합니다. 모든 파이프라인 뒤에 둡니다.
+    """
+    
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        for field in TRANSIENT_FIELDS:
+            adapter.pop(field, None)
         return item
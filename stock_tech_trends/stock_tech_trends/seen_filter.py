@@ -0,0 +1,233 @@
+"""
+크롤링 실행 간에 유지되는 "이미 본 아이템" 필터
+
+시간 세대(generation)로 나눈 Bloom filter 묶음입니다. 각 세대는 ttl / generations초
+동안만 새 키를 받고, 생성 후 (세대 길이 + ttl)초가 지나면 통째로 삭제됩니다.
+따라서 한 번 본 키는 최소 ttl초 동안 기억되고, 저장 공간은 세대 수 x 세대 크기
+정도로 제한됩니다.
+
+저장소는 두 가지입니다.
+- file: 세대마다 mmap 파일 하나 (스파이더 프로세스 하나가 쓰는 경우)
+- redis: 세대마다 Redis 비트맵 키 하나 (여러 프로세스가 공유하는 경우, EXPIREAT로 자동 삭제)
+"""
+
+import os
+import math
+import mmap
+import time
+import glob
+import struct
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def bloom_parameters(capacity: int, error_rate: float):
+    """예상 키 수와 오탐률로 (비트 수, 해시 함수 수) 계산"""
+    num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+    num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+    return num_bits, num_hashes
+
+
+def bit_positions(key: str, num_bits: int, num_hashes: int):
+    """키의 비트 위치 목록 (blake2b 128비트를 둘로 나눈 double hashing)"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+
+class MmapBloomFilter:
+    """mmap 파일에 저장되는 고정 크기 Bloom filter (세대 하나)"""
+    
+    MAGIC = b'STTBLOOM'
+    # magic, 비트 수, 해시 함수 수, 추가된 키 수, 생성 시각
+    HEADER = struct.Struct('<8sQQQd')
+    
+    def __init__(self, path, capacity=None, error_rate=None, created=None):
+        self.path = path
+        
+        if not os.path.exists(path):
+            num_bits, num_hashes = bloom_parameters(capacity, error_rate)
+            with open(path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, num_bits, num_hashes, 0, created or time.time()))
+                f.truncate(self.HEADER.size + (num_bits + 7) // 8)
+        
+        self.file = open(path, 'r+b')
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+        magic, self.num_bits, self.num_hashes, self.count, self.created = self.HEADER.unpack_from(self.mm, 0)
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"Not a bloom filter file: {path}")
+    
+    def __contains__(self, key):
+        mm = self.mm
+        offset = self.HEADER.size
+        for position in bit_positions(key, self.num_bits, self.num_hashes):
+            if not mm[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+    
+    def add(self, key):
+        mm = self.mm
+        offset = self.HEADER.size
+        for position in bit_positions(key, self.num_bits, self.num_hashes):
+            index = offset + (position >> 3)
+            mm[index] = mm[index] | (1 << (position & 7))
+        self.count += 1
+        self.HEADER.pack_into(mm, 0, self.MAGIC, self.num_bits, self.num_hashes, self.count, self.created)
+    
+    def close(self):
+        self.mm.flush()
+        self.mm.close()
+        self.file.close()
+    
+    def delete(self):
+        self.close()
+        os.remove(self.path)
+
+
+class RedisBloomFilter:
+    """Redis 비트맵 키에 저장되는 고정 크기 Bloom filter (세대 하나)"""
+    
+    def __init__(self, client, index_key, key, num_bits, num_hashes, created, expire_at):
+        self.client = client
+        self.index_key = index_key
+        self.key = key
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.created = created
+        self.expire_at = expire_at
+    
+    @property
+    def count(self):
+        return int(self.client.get(f"{self.key}:count") or 0)
+    
+    def __contains__(self, key):
+        pipe = self.client.pipeline(transaction=False)
+        for position in bit_positions(key, self.num_bits, self.num_hashes):
+            pipe.getbit(self.key, position)
+        return all(pipe.execute())
+    
+    def add(self, key):
+        pipe = self.client.pipeline(transaction=False)
+        for position in bit_positions(key, self.num_bits, self.num_hashes):
+            pipe.setbit(self.key, position, 1)
+        pipe.incr(f"{self.key}:count")
+        # 세대가 끝나면 Redis가 알아서 삭제
+        pipe.expireat(self.key, int(self.expire_at))
+        pipe.expireat(f"{self.key}:count", int(self.expire_at))
+        pipe.execute()
+    
+    def close(self):
+        pass
+    
+    def delete(self):
+        self.client.delete(self.key, f"{self.key}:count")
+        self.client.zrem(self.index_key, self.key)
+
+
+class SeenFilter:
+    """
+    TTL이 있는 영속 Bloom filter
+    
+    `key in seen` 으로 조회하고 `seen.add(key)` 로 추가합니다. Bloom filter 특성상
+    없는 키를 있다고 답할 수 있으므로 (오탐률 error_rate), 정확한 판단이 필요하면
+    저장소를 다시 확인해야 합니다.
+    
+    현재 세대가 capacity개를 넘으면 세대 길이와 상관없이 새 세대를 시작하므로 세대마다
+    오탐률이 error_rate 이하로 유지됩니다. 전체 오탐률은 대략 살아 있는 세대 수 x error_rate입니다.
+    
+    키는 최소 ttl초, 최대 ttl + ttl / generations초 동안 기억됩니다. 만료된 세대는 add가
+    없어도 조회에서 바로 제외됩니다.
+    """
+    
+    def __init__(self, name, ttl=86400, capacity=1000000, error_rate=0.001, generations=4,
+                 directory=None, redis_client=None):
+        if directory is None and redis_client is None:
+            raise ValueError("SeenFilter needs a directory or a redis client")
+        
+        self.name = name
+        self.ttl = ttl
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.generation_seconds = ttl / max(1, generations)
+        self.directory = directory
+        self.redis = redis_client
+        
+        self.generations = self._load_generations()
+        self.expire()
+    
+    def __contains__(self, key):
+        now = time.time()
+        return any(key in generation for generation in self.generations
+                   if self._expire_at(generation.created) >= now)
+    
+    def add(self, key):
+        current = self.generations[-1] if self.generations else None
+        now = time.time()
+        if (current is None or now - current.created >= self.generation_seconds
+                or current.count >= self.capacity):
+            self.expire(now)
+            current = self._new_generation(now)
+            self.generations.append(current)
+        current.add(key)
+    
+    def expire(self, now=None):
+        """ttl이 지난 세대 삭제"""
+        now = now or time.time()
+        live = []
+        for generation in self.generations:
+            if self._expire_at(generation.created) < now:
+                logger.debug(f"Expiring seen filter generation {generation.created:.0f} of {self.name}")
+                generation.delete()
+            else:
+                live.append(generation)
+        self.generations = live
+    
+    def close(self):
+        for generation in self.generations:
+            generation.close()
+        self.generations = []
+    
+    def _expire_at(self, created):
+        return created + self.generation_seconds + self.ttl
+    
+    def _load_generations(self):
+        """저장소에 남아 있는 세대를 생성 시각 순으로 로드"""
+        if self.redis is not None:
+            generations = []
+            index_key = f"{self.name}:generations"
+            for member, created in self.redis.zrange(index_key, 0, -1, withscores=True):
+                key = member.decode() if isinstance(member, bytes) else member
+                if not self.redis.exists(key):
+                    # EXPIRE로 이미 사라진 세대
+                    self.redis.zrem(index_key, member)
+                    continue
+                num_bits, num_hashes = bloom_parameters(self.capacity, self.error_rate)
+                generations.append(RedisBloomFilter(self.redis, index_key, key, num_bits, num_hashes,
+                                                    created, self._expire_at(created)))
+            return generations
+        
+        os.makedirs(self.directory, exist_ok=True)
+        generations = []
+        for path in sorted(glob.glob(os.path.join(self.directory, '*.bloom'))):
+            try:
+                generations.append(MmapBloomFilter(path))
+            except (ValueError, OSError, struct.error) as e:
+                logger.warning(f"Ignoring broken seen filter file {path}: {e}")
+        return sorted(generations, key=lambda generation: generation.created)
+    
+    def _new_generation(self, now):
+        """새 세대 생성"""
+        if self.redis is not None:
+            index_key = f"{self.name}:generations"
+            key = f"{self.name}:{now:.6f}"
+            self.redis.zadd(index_key, {key: now})
+            self.redis.expireat(index_key, int(self._expire_at(now)))
+            num_bits, num_hashes = bloom_parameters(self.capacity, self.error_rate)
+            return RedisBloomFilter(self.redis, index_key, key, num_bits, num_hashes, now, self._expire_at(now))
+        
+        path = os.path.join(self.directory, f"{now:.6f}.bloom")
+        return MmapBloomFilter(path, self.capacity, self.error_rate, created=now)
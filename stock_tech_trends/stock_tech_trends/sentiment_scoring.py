@@ -0,0 +1,117 @@
+"""
+VADER/TextBlob 감성 점수 계산
+
+SentimentAnalysisPipeline이 리액터 스레드에서 직접 호출하거나, SENTIMENT_WORKERS개의
+프로세스 풀에서 배치 단위로 호출합니다. 워커 프로세스는 spawn 방식으로 이 모듈만
+불러오므로 Scrapy, DB 드라이버 같은 무거운 의존성은 여기서 import 하지 않습니다.
+
+SENTIMENT_TIER_MODE가 tiered면 TierPolicy에 따라 VADER 사전만 쓰는 빠른 점수로 끝내거나
+전체 분석으로 넘어갑니다. 이때 결과에 'tier' (fast/full)가 붙습니다. fast 결과는 TextBlob을
+돌리지 않으므로 textblob_polarity/textblob_subjectivity가 중립값(0.0/0.5)이고, 실제 TextBlob
+점수가 필요하면 tier가 'fast'인 결과를 걸러야 합니다.
+
+TierPolicy의 budget 카운터는 프로세스마다 따로입니다. 워커가 SENTIMENT_WORKERS개면 워커마다
+자기가 받은 텍스트 중 budget 비율까지 전체 분석하고 (리액터 스레드의 인라인 분석도 따로),
+전체 비율은 워커들 비율의 가중 평균이라 budget을 넘지 않지만 워커 사이에 예산을 빌려주지는
+않습니다.
+"""
+
+import os
+import sys
+import logging
+from typing import Dict, List
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from textblob import TextBlob
+
+# utils 모듈 경로 추가
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
+from utils.sentiment_tiers import TierPolicy, fast_lexicon_score
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스마다 한 번 만드는 VADER 분석기와 정책 (init_worker에서 생성)
+_worker_analyzer = None
+_worker_policy = None
+
+
+def get_overall_sentiment(compound_score: float) -> str:
+    """전체 감성 분류"""
+    if compound_score >= 0.05:
+        return 'positive'
+    elif compound_score <= -0.05:
+        return 'negative'
+    else:
+        return 'neutral'
+
+
+def score_sentiment(vader_analyzer, text: str) -> Dict[str, float]:
+    """VADER를 사용한 감성 분석 (TextBlob 점수 포함)"""
+    try:
+        # VADER 감성 분석
+        vader_scores = vader_analyzer.polarity_scores(text)
+
+        # TextBlob 감성 분석 (보조)
+        blob = TextBlob(text)
+        textblob_polarity = blob.sentiment.polarity
+        textblob_subjectivity = blob.sentiment.subjectivity
+
+        return {
+            'vader_compound': vader_scores['compound'],
+            'vader_positive': vader_scores['pos'],
+            'vader_neutral': vader_scores['neu'],
+            'vader_negative': vader_scores['neg'],
+            'textblob_polarity': textblob_polarity,
+            'textblob_subjectivity': textblob_subjectivity,
+            'overall_sentiment': get_overall_sentiment(vader_scores['compound'])
+        }
+    except Exception as e:
+        logger.error(f"Sentiment analysis error: {e}")
+        return {
+            'vader_compound': 0.0,
+            'vader_positive': 0.0,
+            'vader_neutral': 1.0,
+            'vader_negative': 0.0,
+            'textblob_polarity': 0.0,
+            'textblob_subjectivity': 0.5,
+            'overall_sentiment': 'neutral'
+        }
+
+
+def score_tiered(vader_analyzer, text: str, policy: TierPolicy) -> Dict[str, float]:
+    """정책에 따라 빠른 점수 또는 전체 분석 결과 반환"""
+    if not policy.tiered:
+        policy.decide(None)
+        return score_sentiment(vader_analyzer, text)
+
+    fast = fast_lexicon_score(vader_analyzer.lexicon, text)
+    if policy.decide(fast):
+        result = score_sentiment(vader_analyzer, text)
+        result['tier'] = 'full'
+        return result
+
+    return {
+        'vader_compound': fast['compound'],
+        'vader_positive': fast['positive'],
+        'vader_neutral': fast['neutral'],
+        'vader_negative': fast['negative'],
+        # TextBlob을 돌리지 않았으므로 중립값 (tier로 구분)
+        'textblob_polarity': 0.0,
+        'textblob_subjectivity': 0.5,
+        'overall_sentiment': get_overall_sentiment(fast['compound']),
+        'tier': 'fast'
+    }
+
+
+def init_worker(mode='full', neutral_margin=0.15, budget=1.0):
+    """프로세스 풀 initializer: 워커마다 VADER 사전과 정책을 한 번만 준비"""
+    global _worker_analyzer, _worker_policy
+    _worker_analyzer = SentimentIntensityAnalyzer()
+    _worker_policy = TierPolicy(mode, neutral_margin, budget)
+
+
+def score_batch(texts: List[str]) -> List[Dict[str, float]]:
+    """텍스트 배치 감성 분석 (워커 프로세스에서 호출)"""
+    if _worker_analyzer is None:
+        init_worker()
+    return [score_tiered(_worker_analyzer, text, _worker_policy) for text in texts]
@@ -1,8 +1,33 @@
 import scrapy
 import json
-import requests
-from datetime import datetime
+from datetime import datetime, timedelta
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import JsonRequest
 from ..items import GitHubRepoItem
+import sys
+import os
+
+# utils 모듈 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+from utils.keyword_matcher import KeywordMatcher
+from utils.text_normalizer import normalize_text
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# 저장소 노드 ID로 언어(바이트 수), 토픽, 별 수를 한 번에 조회 (nodes는 최대 100개)
+REPO_ENRICHMENT_QUERY = """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    ... on Repository {
+      id
+      stargazerCount
+      repositoryTopics(first: 20) { nodes { topic { name } } }
+      languages(first: 20, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+    }
+  }
+}
+"""
 
 
 class GithubSpiderSpider(scrapy.Spider):
@@ -25,6 +50,24 @@ class GithubSpiderSpider(scrapy.Spider):
         'ar', 'vr', 'metaverse', 'nft'
     ]
     
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        # TECH/STOCK/BLOCKED_KEYWORDS를 한 번만 컴파일
+        spider.keyword_matcher = KeywordMatcher.from_settings(crawler.settings)
+        
+        settings = crawler.settings
+        spider.enrichment = settings.get('GITHUB_ENRICHMENT', 'graphql')
+        spider.batch_size = min(100, max(1, settings.getint('GITHUB_GRAPHQL_BATCH_SIZE', 100)))
+        spider.batch_timeout = settings.getfloat('GITHUB_GRAPHQL_FLUSH_TIMEOUT', 5.0)
+        spider.api_headers = {}
+        # 노드 ID -> 보강을 기다리는 아이템 (배치에 넣기 전 / GraphQL 응답 대기 중)
+        spider.batch = {}
+        spider.enriching = {}
+        spider.batch_timer = None
+        crawler.signals.connect(spider.spider_idle, signal=signals.spider_idle)
+        return spider
+    
     def start_requests(self):
         """GitHub API를 사용하여 기술 관련 저장소들 검색"""
         # GitHub API 토큰 가져오기
@@ -39,13 +82,14 @@ class GithubSpiderSpider(scrapy.Spider):
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'StockTechTrends/1.0'
         }
+        self.api_headers = headers
         
         # 각 기술 쿼리에 대해 검색 요청 생성
         for query in self.tech_queries:
-            # 최근 7일 내에 업데이트된 저장소만 검색
+            # 최근 7일 내에 업데이트된 저장소만 검색 (날짜 단위라 하루 동안 URL이 같아 조건부 요청이 맞음)
             search_url = (
                 f"https://api.github.com/search/repositories"
-                f"?q={query}+pushed:>{(datetime.now().timestamp() - 7*24*3600):.0f}"
+                f"?q={query}+pushed:>{(datetime.now() - timedelta(days=7)):%Y-%m-%d}"
                 f"&sort=stars&order=desc&per_page=50"
             )
             
@@ -53,12 +97,17 @@ class GithubSpiderSpider(scrapy.Spider):
                 url=search_url,
                 headers=headers,
                 callback=self.parse_search_results,
-                meta={'query': query},
+                # 결과가 그대로면(304) 저장소 정보도 그대로이므로 다시 파싱하지 않음
+                meta={'query': query, 'conditional_skip_unchanged': True},
                 dont_filter=True
             )
     
     def parse_search_results(self, response):
         """검색 결과 파싱"""
+        if 'unchanged' in response.flags:
+            self.crawler.stats.inc_value('github/unchanged_searches')
+            return
+        
         try:
             data = json.loads(response.text)
             query = response.meta['query']
@@ -70,8 +119,11 @@ class GithubSpiderSpider(scrapy.Spider):
             repos = data['items']
             
             for repo_data in repos:
+                # 설명을 한 번만 정규화해 필터링과 감성 분석에 재사용
+                normalized = normalize_text(repo_data.get('description'))
+                
                 # 기술 관련 저장소 필터링
-                if self._is_relevant_repo(repo_data):
+                if self._is_relevant_repo(repo_data, normalized):
                     item = GitHubRepoItem()
                     
                     # 기본 정보
@@ -79,6 +131,7 @@ class GithubSpiderSpider(scrapy.Spider):
                     item['name'] = repo_data.get('name', '')
                     item['full_name'] = repo_data.get('full_name', '')
                     item['description'] = repo_data.get('description', '')
+                    item['normalized_text'] = normalized
                     
                     # 소유자 정보
                     owner = repo_data.get('owner', {})
@@ -112,9 +165,15 @@ class GithubSpiderSpider(scrapy.Spider):
                     item['topics'] = repo_data.get('topics', [])
                     item['license'] = repo_data.get('license', {}).get('name', '') if repo_data.get('license') else ''
                     
+                    # 언어/토픽/별 수 보강: GraphQL로 모아서 조회
+                    node_id = repo_data.get('node_id')
+                    if self.enrichment == 'graphql' and node_id:
+                        yield from self._add_to_batch(node_id, item)
+                        continue
+                    
                     # 언어 정보를 위한 추가 요청
                     languages_url = repo_data.get('languages_url')
-                    if languages_url:
+                    if self.enrichment == 'rest' and languages_url:
                         yield scrapy.Request(
                             url=languages_url,
                             headers=response.request.headers,
@@ -144,20 +203,105 @@ class GithubSpiderSpider(scrapy.Spider):
             # 언어 정보 파싱 실패 시에도 기본 아이템 반환
             yield response.meta['item']
     
-    def _is_relevant_repo(self, repo):
-        """저장소가 기술 관련인지 확인"""
-        name = repo.get('name', '').lower()
-        description = repo.get('description', '').lower()
-        topics = [topic.lower() for topic in repo.get('topics', [])]
+    def _add_to_batch(self, node_id, item):
+        """보강 배치에 아이템 추가 (GITHUB_GRAPHQL_BATCH_SIZE개가 차면 바로 GraphQL 요청)"""
+        if node_id in self.batch or node_id in self.enriching:
+            # 여러 검색어에 걸린 같은 저장소
+            self.crawler.stats.inc_value('github/duplicate_repos')
+            return
         
-        combined_text = name + ' ' + description + ' ' + ' '.join(topics)
+        self.batch[node_id] = item
+        if len(self.batch) >= self.batch_size:
+            yield self._enrichment_request()
+        elif self.batch_timer is None:
+            from twisted.internet import reactor
+            self.batch_timer = reactor.callLater(self.batch_timeout, self._flush_batch)
+    
+    def _enrichment_request(self):
+        """배치에 쌓인 저장소들의 GraphQL 보강 요청 (배치는 비움)"""
+        if self.batch_timer is not None and self.batch_timer.active():
+            self.batch_timer.cancel()
+        self.batch_timer = None
         
-        # 기술 키워드 체크
-        tech_keywords = self.settings.get('TECH_KEYWORDS', [])
+        node_ids = list(self.batch)
+        self.enriching.update(self.batch)
+        self.batch = {}
+        self.crawler.stats.inc_value('github/graphql_batches')
         
-        for keyword in tech_keywords:
-            if keyword.lower() in combined_text:
-                return True
+        headers = dict(self.api_headers)
+        headers.pop('Accept', None)
+        return JsonRequest(
+            url=GRAPHQL_URL,
+            data={'query': REPO_ENRICHMENT_QUERY, 'variables': {'ids': node_ids}},
+            headers=headers,
+            callback=self.parse_enrichment,
+            errback=self.enrichment_failed,
+            meta={'node_ids': node_ids},
+            dont_filter=True
+        )
+    
+    def _flush_batch(self):
+        """타임아웃/유휴 시 배치가 다 차지 않아도 보냄"""
+        self.batch_timer = None
+        if self.batch:
+            self.crawler.engine.crawl(self._enrichment_request())
+    
+    def spider_idle(self):
+        # 검색 결과를 다 받았는데 배치에 남은 저장소가 있으면 마저 보강
+        if self.batch:
+            self._flush_batch()
+            raise DontCloseSpider
+    
+    def parse_enrichment(self, response):
+        """GraphQL 응답으로 언어/토픽/별 수를 채우고 아이템 반환"""
+        node_ids = response.meta['node_ids']
+        try:
+            data = json.loads(response.text)
+            if data.get('errors'):
+                self.logger.warning(f"GitHub GraphQL errors: {data['errors'][:3]}")
+            nodes = (data.get('data') or {}).get('nodes') or []
+            
+            for node in nodes:
+                item = self.enriching.pop(node.get('id'), None) if node else None
+                if item is None:
+                    continue
+                
+                item['languages'] = {
+                    edge['node']['name']: edge['size'] for edge in node.get('languages', {}).get('edges', [])
+                }
+                item['topics'] = [
+                    topic['topic']['name'] for topic in node.get('repositoryTopics', {}).get('nodes', [])
+                ]
+                item['stars'] = node.get('stargazerCount', item.get('stars', 0))
+                yield item
+                
+        except Exception as e:
+            self.logger.error(f"Error parsing GitHub GraphQL response: {e}")
+        
+        # 조회되지 않은 저장소(삭제/권한 없음/파싱 실패)도 기본 아이템으로 반환
+        yield from self._release(node_ids)
+    
+    def enrichment_failed(self, failure):
+        """GraphQL 요청 실패 시 보강 없이 아이템 반환"""
+        self.logger.error(f"GitHub GraphQL request failed: {failure.value}")
+        yield from self._release(failure.request.meta['node_ids'])
+    
+    def _release(self, node_ids):
+        for node_id in node_ids:
+            item = self.enriching.pop(node_id, None)
+            if item is not None:
+                yield item
+    
+    def _is_relevant_repo(self, repo, normalized):
+        """저장소가 기술 관련인지 확인 (normalized: 설명 정규화 결과)"""
+        # 저장소 이름과 토픽은 'machine-learning', 'pytorch_lightning'처럼 단어를 이어 쓰므로 분리
+        name = repo.get('name', '').lower()
+        topics = ' '.join(repo.get('topics', [])).lower()
+        combined_text = f"{name} {topics}".replace('-', ' ').replace('_', ' ') + ' ' + normalized['lower']
+        
+        # 기술 키워드 체크
+        if self.keyword_matcher.match(combined_text).tech:
+            return True
         
         # 인기도 체크 (별표 수)
         stars = repo.get('stargazers_count', 0)
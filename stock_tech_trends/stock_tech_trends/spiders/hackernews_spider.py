@@ -1,53 +1,249 @@
 import scrapy
 import json
-import requests
+import os
+import sys
+import time
 from datetime import datetime
+from scrapy.utils.project import data_path
 from ..items import HackerNewsItem
+from ..crawl_state import CrawlStateStore
+
+# utils 모듈 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+from utils.keyword_matcher import KeywordMatcher
+from utils.text_normalizer import normalize_text
+
+API_BASE = "https://hacker-news.firebaseio.com/v0"
+
+
+# 목록 이름 -> 엔드포인트
+LIST_ENDPOINTS = {
+    'top': 'topstories.json',
+    'new': 'newstories.json',
+    'best': 'beststories.json',
+    'ask': 'askstories.json',
+    'show': 'showstories.json',
+}
+
+# 스토리 요청 우선순위: 아직 추적하지 않는 스토리 가산점 + 목록 순위 (0~RANK_PRIORITY)
+UNSEEN_PRIORITY = 200
+RANK_PRIORITY = 100
 
 
 class HackernewsSpiderSpider(scrapy.Spider):
+    """
+    Hacker News 스파이더
+    
+    HACKERNEWS_LISTS의 스토리 목록(top/new/best/ask/show)을 동시에 요청하고, 목록마다
+    지정한 깊이만큼의 ID를 하나의 집합으로 합칩니다. 여러 목록에 있는 스토리도 한 번만
+    요청하며, 아직 추적하지 않는 스토리, 목록 순위가 높은 스토리 순으로 우선순위를 줍니다.
+    
+    HACKERNEWS_INCREMENTAL이 켜져 있으면 (기본) 증분 모드로 동작합니다.
+    
+    - maxitem.json으로 현재 최대 아이템 ID를 확인해 실행이 끝나면 워터마크로 저장
+    - updates.json에서 바뀐 아이템 중 이미 추적 중인 스토리만 다시 요청
+    - 목록에 있어도 추적 중이고 바뀌지 않은 스토리는 요청하지 않음
+    - newstories.json에서 지난 워터마크보다 큰 스토리는 깊이와 관계없이 요청
+    
+    추적 중인 스토리의 마지막 score/descendants와 maxitem 워터마크는 CrawlStateStore
+    (HACKERNEWS_STATE_PATH)에 저장되고, 다시 받은 스토리의 지표가 그대로면 아이템을 내보내지
+    않습니다. 스토리는 HACKERNEWS_TRACK_DAYS일, 최대 HACKERNEWS_TRACK_LIMIT개까지 추적합니다.
+    첫 실행(워터마크 없음)이나 증분 모드를 끄면 목록의 스토리를 모두 가져옵니다.
+    -a incremental=0으로 실행마다 끌 수 있습니다.
+    """
+    
     name = "hackernews_spider"
     allowed_domains = ["hacker-news.firebaseio.com", "news.ycombinator.com"]
     
     # Hacker News API를 사용하므로 start_urls는 사용하지 않음
     start_urls = []
     
+    # 상태 저장소 namespace
+    state_namespace = 'hackernews'
+    
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        settings = crawler.settings
+        # TECH/STOCK/BLOCKED_KEYWORDS를 한 번만 컴파일
+        spider.keyword_matcher = KeywordMatcher.from_settings(settings)
+        
+        incremental = getattr(spider, 'incremental', None)
+        if incremental is None:
+            spider.incremental = settings.getbool('HACKERNEWS_INCREMENTAL', True)
+        else:
+            spider.incremental = str(incremental).lower() not in ('0', 'false', 'no', 'off')
+        spider.list_depths = {name: depth for name, depth in
+                              settings.getdict('HACKERNEWS_LISTS', {'top': 100}).items()
+                              if name in LIST_ENDPOINTS and depth > 0}
+        spider.track_days = settings.getfloat('HACKERNEWS_TRACK_DAYS', 3)
+        spider.track_limit = settings.getint('HACKERNEWS_TRACK_LIMIT', 5000)
+        
+        spider.state = None
+        if spider.incremental:
+            path = settings.get('HACKERNEWS_STATE_PATH', 'hackernews_state.sqlite')
+            if not os.path.isabs(path):
+                path = os.path.join(data_path('', createdir=True), path)
+            spider.state = CrawlStateStore(path)
+        
+        # 지난 실행의 maxitem (None이면 첫 실행이거나 증분 모드 아님)
+        spider.last_maxitem = None
+        # 실행이 정상 종료되면 저장할 maxitem
+        spider.pending_maxitem = None
+        # 아직 응답을 기다리는 목록 -> 받은 목록 ID, updates.json의 바뀐 아이템 ID
+        spider.waiting_lists = set()
+        spider.list_ids = {}
+        spider.updated_ids = []
+        return spider
+    
     def start_requests(self):
-        """Hacker News API를 사용하여 최신 스토리들 가져오기"""
-        # Hacker News API 엔드포인트
-        api_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
+        """스토리 목록(과 증분 모드의 maxitem, updates)을 동시에 요청"""
+        if self.state is not None:
+            self.last_maxitem = self.state.get_cursor(self.state_namespace, 'maxitem')
+            if self.last_maxitem is None:
+                # 첫 실행: 목록의 스토리로 추적 시작
+                self.logger.info("No Hacker News watermark yet, seeding from story lists")
+            else:
+                self.logger.info(f"Hacker News watermark {self.last_maxitem}, "
+                                 f"tracking {self.state.count_items(self.state_namespace)} stories")
+            # 목록/maxitem/updates는 계속 바뀌므로 HTTP 캐시를 거치지 않음
+            yield scrapy.Request(f"{API_BASE}/maxitem.json", callback=self.parse_maxitem,
+                                 meta={'dont_cache': True})
         
+        lists = dict(self.list_depths)
+        if self.last_maxitem is not None:
+            lists.setdefault('new', 0)
+            self.waiting_lists.add('updates')
+            yield scrapy.Request(f"{API_BASE}/updates.json", callback=self.parse_updates,
+                                 errback=self.list_failed, meta={'list_name': 'updates', 'dont_cache': True})
+        
+        for name in lists:
+            self.waiting_lists.add(name)
+            yield scrapy.Request(f"{API_BASE}/{LIST_ENDPOINTS[name]}", callback=self.parse_list,
+                                 errback=self.list_failed, meta={'list_name': name, 'dont_cache': True})
+    
+    def parse_maxitem(self, response):
+        """현재 maxitem 저장 (실행이 정상 종료되면 워터마크가 됨)"""
         try:
-            # 최신 스토리 ID 목록 가져오기
-            response = requests.get(api_url)
-            response.raise_for_status()
-            
-            story_ids = response.json()
+            self.pending_maxitem = int(json.loads(response.text))
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Failed to fetch Hacker News maxitem: {e}")
+    
+    def parse_list(self, response):
+        """스토리 ID 목록 저장, 모든 목록이 모이면 스토리 요청"""
+        name = response.meta['list_name']
+        try:
+            self.list_ids[name] = json.loads(response.text) or []
+        except ValueError as e:
+            self.logger.error(f"Failed to fetch Hacker News {name} stories: {e}")
+        yield from self._list_done(name)
+    
+    def parse_updates(self, response):
+        """바뀐 아이템 ID 저장 (댓글/사용자 변경도 섞여 있음)"""
+        try:
+            self.updated_ids = json.loads(response.text).get('items', [])
+        except (AttributeError, ValueError) as e:
+            self.logger.error(f"Failed to fetch Hacker News updates: {e}")
+        yield from self._list_done('updates')
+    
+    def list_failed(self, failure):
+        """목록 요청 실패 (나머지 목록으로 계속 진행)"""
+        name = failure.request.meta['list_name']
+        self.logger.error(f"Failed to fetch Hacker News {name} list: {failure.value}")
+        yield from self._list_done(name)
+    
+    def _list_done(self, name):
+        self.waiting_lists.discard(name)
+        if not self.waiting_lists:
+            yield from self._schedule_stories()
+    
+    def _schedule_stories(self):
+        """목록을 합쳐 중복 없이, 우선순위를 매겨 스토리 요청"""
+        # 스토리 ID -> 목록 안의 가장 높은 상대 순위 (0이 1위)
+        ranks = {}
+        listed = 0
+        for name, depth in self.list_depths.items():
+            story_ids = self.list_ids.get(name, [])[:depth]
+            listed += len(story_ids)
+            for position, story_id in enumerate(story_ids):
+                rank = position / depth
+                if rank < ranks.get(story_id, 1.0):
+                    ranks[story_id] = rank
+        self._inc_stat('hackernews/listed_ids', listed)
+        self._inc_stat('hackernews/duplicate_list_ids', listed - len(ranks))
+        
+        if self.last_maxitem is not None:
+            new_ids = self.list_ids.get('new', [])
+            if new_ids and min(new_ids) > self.last_maxitem:
+                # newstories는 최근 500개만 주므로 실행 간격이 너무 길면 일부를 놓침
+                self.logger.warning(f"Hacker News new stories list does not reach back to item "
+                                    f"{self.last_maxitem}, some stories may be missed")
+            for story_id in new_ids:
+                if story_id > self.last_maxitem:
+                    ranks.setdefault(story_id, 1.0)
+        
+        if self.state is None or self.last_maxitem is None:
+            # 비증분 모드 / 첫 실행: 목록의 스토리를 모두 요청
+            tracked, updated = set(), set()
+        else:
+            updated = set(self.updated_ids)
+            tracked = self.state.known_items(self.state_namespace, set(ranks) | updated)
+            # 목록 밖의 스토리도 추적 중이고 바뀌었으면 다시 받음
+            for story_id in updated:
+                if str(story_id) in tracked:
+                    ranks.setdefault(story_id, 1.0)
+        
+        for story_id, rank in ranks.items():
+            seen = str(story_id) in tracked
+            if seen and story_id not in updated:
+                continue
             
-            # 상위 100개 스토리만 처리
-            for story_id in story_ids[:100]:
-                story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-                
-                yield scrapy.Request(
-                    url=story_url,
-                    callback=self.parse_story,
-                    meta={'story_id': story_id},
-                    dont_filter=True
-                )
-                
-        except Exception as e:
-            self.logger.error(f"Failed to fetch Hacker News stories: {e}")
+            self._inc_stat('hackernews/updated_requests' if seen else 'hackernews/new_requests')
+            priority = int((1 - rank) * RANK_PRIORITY) + (0 if seen else UNSEEN_PRIORITY)
+            yield scrapy.Request(
+                url=f"{API_BASE}/item/{story_id}.json",
+                callback=self.parse_story,
+                priority=priority,
+                # 추적 중인 스토리는 바뀌어서 다시 받는 것이므로 캐시된 응답을 쓰지 않음
+                meta={'story_id': story_id, 'dont_cache': seen}
+            )
+    
+    def closed(self, reason):
+        """정상 종료면 maxitem 워터마크 저장, 오래된 추적 스토리 정리"""
+        if self.state is None:
+            return
+        
+        if reason == 'finished' and self.pending_maxitem is not None:
+            self.state.set_cursor(self.state_namespace, 'maxitem', self.pending_maxitem)
+        pruned = self.state.prune_items(self.state_namespace, time.time() - self.track_days * 86400,
+                                        keep=self.track_limit)
+        if pruned:
+            self.logger.info(f"Stopped tracking {pruned} old Hacker News stories")
+        self.state.close()
+    
+    def _inc_stat(self, key, count=1):
+        """Scrapy 통계 증가"""
+        self.crawler.stats.inc_value(key, count)
     
     def parse_story(self, response):
         """개별 스토리 파싱"""
         try:
             data = json.loads(response.text)
             
-            if not data or data.get('type') != 'story':
+            if not data or data.get('type') != 'story' or data.get('deleted') or data.get('dead'):
                 return
             
+            # 증분 모드: 추적 중인 스토리의 지표가 그대로면 내보내지 않음
+            if self.state is not None and not self._record_story(data):
+                self._inc_stat('hackernews/unchanged_stories')
+                return
+            
+            # 제목 + 본문(HTML)을 한 번만 정규화해 필터링, 키워드 추출, 감성 분석에 재사용
+            normalized = normalize_text((data.get('title') or '') + ' ' + (data.get('text') or ''))
+            matches = self.keyword_matcher.match(normalized['lower'])
+            
             # 기술/주식 관련 키워드 필터링
-            if self._is_relevant_story(data):
+            if self._is_relevant_story(data, matches):
                 item = HackerNewsItem()
                 
                 # 기본 정보
@@ -68,35 +264,23 @@ class HackernewsSpiderSpider(scrapy.Spider):
                 item['text'] = data.get('text', '')
                 
                 # 기술 키워드 추출
-                text_content = item['title'] + ' ' + (item['text'] or '')
-                item['tech_keywords'] = self._extract_tech_keywords(text_content)
+                item['tech_keywords'] = matches.keywords
+                item['normalized_text'] = normalized
                 
                 yield item
                 
         except Exception as e:
             self.logger.error(f"Error parsing story {response.meta['story_id']}: {e}")
     
-    def _is_relevant_story(self, story):
-        """스토리가 기술/주식 관련인지 확인"""
-        title = story.get('title', '').lower()
-        text = story.get('text', '').lower()
-        combined_text = title + ' ' + text
-        
-        # 기술 키워드 체크
-        tech_keywords = self.settings.get('TECH_KEYWORDS', [])
-        stock_keywords = self.settings.get('STOCK_KEYWORDS', [])
-        blocked_keywords = self.settings.get('BLOCKED_KEYWORDS', [])
-        
+    def _is_relevant_story(self, story, matches):
+        """스토리가 기술/주식 관련인지 확인 (matches: 제목 + 본문의 KeywordMatches)"""
         # 금지된 키워드 체크
-        for blocked in blocked_keywords:
-            if blocked.lower() in combined_text:
-                return False
+        if matches.blocked:
+            return False
         
         # 기술 또는 주식 키워드가 포함되어 있는지 확인
-        relevant_keywords = tech_keywords + stock_keywords
-        for keyword in relevant_keywords:
-            if keyword.lower() in combined_text:
-                return True
+        if matches.relevant:
+            return True
         
         # 높은 점수나 많은 댓글이 있는 스토리는 포함
         score = story.get('score', 0)
@@ -107,21 +291,9 @@ class HackernewsSpiderSpider(scrapy.Spider):
         
         return False
     
-    def _extract_tech_keywords(self, text):
-        """텍스트에서 기술 키워드 추출"""
-        if not text:
-            return []
-        
-        text_lower = text.lower()
-        found_keywords = []
-        
-        tech_keywords = self.settings.get('TECH_KEYWORDS', [])
-        stock_keywords = self.settings.get('STOCK_KEYWORDS', [])
-        
-        all_keywords = tech_keywords + stock_keywords
-        
-        for keyword in all_keywords:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
-        
-        return found_keywords
+    def _record_story(self, story):
+        """스토리 지표를 저장소에 기록하고, 새 스토리이거나 지표가 바뀌었으면 True"""
+        metrics = {'score': story.get('score', 0), 'descendants': story.get('descendants', 0)}
+        previous = self.state.get_item(self.state_namespace, story['id'])
+        self.state.put_item(self.state_namespace, story['id'], metrics, item_time=story.get('time'))
+        return previous != metrics
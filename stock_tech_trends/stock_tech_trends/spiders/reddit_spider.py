@@ -1,16 +1,26 @@
 import scrapy
 import json
-import base64
-import requests
+import time
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
-from ..items import RedditPostItem
+from scrapy.utils.project import data_path
+from ..items import RedditPostItem, RedditCommentItem
+from ..crawl_state import CrawlStateStore
 import sys
 import os
 
 # utils 모듈 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../../../'))
+from utils.keyword_matcher import KeywordMatcher
 from utils.stock_ticker_extractor import extract_stock_tickers
+from utils.text_normalizer import aligned_lower, normalize_text
+
+# 멀티레딧 경로(r/a+b+c)의 최대 길이 (URL 길이 제한 대비)
+MULTIREDDIT_MAX_PATH = 1500
+# /api/morechildren 한 번에 펼칠 수 있는 댓글 ID 수
+MORECHILDREN_BATCH = 100
+# /api/info 한 번에 조회할 수 있는 포스트 수
+INFO_BATCH = 100
 
 
 class RedditSpiderSpider(scrapy.Spider):
@@ -31,146 +41,441 @@ class RedditSpiderSpider(scrapy.Spider):
         'computervision', 'nlp', 'robotics', 'IoT', '5G', 'quantumcomputing'
     ]
     
-    def __init__(self, *args, **kwargs):
-        super(RedditSpiderSpider, self).__init__(*args, **kwargs)
-        self.access_token = None
-        self.headers = {}
+    # oauth.reddit.com 요청의 토큰은 RedditTokenMiddleware가 붙임
+    reddit_oauth = True
+    
+    # 상태 저장소 namespace (워터마크, 댓글 수를 다시 확인할 포스트)
+    state_namespace = 'reddit'
+    comments_namespace = 'reddit_comments'
+    
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        settings = crawler.settings
+        # TECH/STOCK/BLOCKED_KEYWORDS를 한 번만 컴파일
+        spider.keyword_matcher = KeywordMatcher.from_settings(settings)
         
-    def start_requests(self):
-        """Reddit API 인증 후 크롤링 시작"""
-        # Reddit API 인증
-        auth_url = "https://www.reddit.com/api/v1/access_token"
+        incremental = getattr(spider, 'incremental', None)
+        if incremental is None:
+            spider.incremental = settings.getbool('REDDIT_INCREMENTAL', True)
+        else:
+            spider.incremental = str(incremental).lower() not in ('0', 'false', 'no', 'off')
+        spider.max_pages = settings.getint('REDDIT_MAX_PAGES', 10)
+        spider.first_run_hours = settings.getfloat('REDDIT_FIRST_RUN_HOURS', 24)
         
-        # 환경 변수에서 API 키 가져오기
-        client_id = self.settings.get('REDDIT_CLIENT_ID')
-        client_secret = self.settings.get('REDDIT_CLIENT_SECRET')
-        user_agent = self.settings.get('REDDIT_USER_AGENT', 'StockTechTrends/1.0')
+        spider.crawl_comments = settings.getbool('REDDIT_COMMENTS', True)
+        spider.comments_min_comments = settings.getint('REDDIT_COMMENTS_MIN_COMMENTS', 20)
+        spider.comments_limit = settings.getint('REDDIT_COMMENTS_LIMIT', 500)
+        spider.morechildren_max_calls = settings.getint('REDDIT_MORECHILDREN_MAX_CALLS', 10)
+        spider.comments_track_hours = settings.getfloat('REDDIT_COMMENTS_TRACK_HOURS', 24)
+        
+        spider.state = None
+        if spider.incremental:
+            path = settings.get('REDDIT_STATE_PATH', 'reddit_state.sqlite')
+            if not os.path.isabs(path):
+                path = os.path.join(data_path('', createdir=True), path)
+            spider.state = CrawlStateStore(path)
+        return spider
+    
+    def start_requests(self):
+        """
+        서브레딧 묶음별 크롤링 시작 (인증은 RedditTokenMiddleware가 처리)
         
-        if not client_id or not client_secret:
+        REDDIT_MULTIREDDIT_SIZE개씩 r/a+b+c 멀티레딧 요청 하나로 묶고, 포스트는 응답의
+        subreddit 필드로 원래 서브레딧에 돌려줍니다.
+        """
+        if not self.settings.get('REDDIT_CLIENT_ID') or not self.settings.get('REDDIT_CLIENT_SECRET'):
             self.logger.error("Reddit API credentials not found in settings")
             return
         
-        # API 인증 요청
-        auth_data = {
-            'grant_type': 'client_credentials'
-        }
-        
-        auth_string = f"{client_id}:{client_secret}"
-        auth_bytes = auth_string.encode('ascii')
-        auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
-        
-        auth_headers = {
-            'Authorization': f'Basic {auth_b64}',
-            'User-Agent': user_agent
-        }
-        
-        # 인증 토큰 요청
-        try:
-            response = requests.post(auth_url, data=auth_data, headers=auth_headers)
-            response.raise_for_status()
-            
-            token_data = response.json()
-            self.access_token = token_data['access_token']
-            
-            # API 요청용 헤더 설정
-            self.headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'User-Agent': user_agent
-            }
-            
-            self.logger.info("Reddit API authentication successful")
-            
-            # 각 서브레딧에 대해 크롤링 요청 생성
-            for subreddit in self.tech_subreddits:
+        # 각 서브레딧 묶음에 대해 크롤링 요청 생성
+        for subreddits in self._subreddit_batches():
+            if self.state is None:
                 yield scrapy.Request(
-                    url=f"https://oauth.reddit.com/r/{subreddit}/hot.json?limit=100",
-                    headers=self.headers,
+                    url=f"https://oauth.reddit.com/r/{'+'.join(subreddits)}/hot.json?limit=100",
                     callback=self.parse_subreddit,
-                    meta={'subreddit': subreddit},
+                    meta={'subreddits': subreddits},
                     dont_filter=True
                 )
-                
-        except Exception as e:
-            self.logger.error(f"Reddit API authentication failed: {e}")
+            else:
+                # 워터마크가 없는 서브레딧(첫 실행, 새로 추가, 상태 유실)은 REDDIT_FIRST_RUN_HOURS 전부터 읽음
+                seed = {'name': None, 'created_utc': time.time() - self.first_run_hours * 3600}
+                watermarks, missing = {}, []
+                for subreddit in subreddits:
+                    watermark = self.state.get_cursor(self.state_namespace, f"watermark:{subreddit}")
+                    if watermark is None:
+                        missing.append(subreddit)
+                        watermark = seed
+                    watermarks[subreddit] = watermark
+                if missing:
+                    self.logger.info(f"No Reddit watermark for {', '.join(missing)} yet, "
+                                     f"reading posts from the last {self.first_run_hours:g} hours")
+                yield self._new_posts_request(subreddits, watermarks)
+        
+        if self.state is not None and self.crawl_comments:
+            yield from self._comment_recheck_requests()
+    
+    def _subreddit_batches(self):
+        """tech_subreddits를 REDDIT_MULTIREDDIT_SIZE개, 경로 MULTIREDDIT_MAX_PATH자 이하로 나눔"""
+        batch_size = max(1, self.settings.getint('REDDIT_MULTIREDDIT_SIZE', 10))
+        batches, batch = [], []
+        for subreddit in dict.fromkeys(self.tech_subreddits):
+            if batch and (len(batch) >= batch_size or
+                          len('+'.join(batch + [subreddit])) > MULTIREDDIT_MAX_PATH):
+                batches.append(batch)
+                batch = []
+            batch.append(subreddit)
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _new_posts_request(self, subreddits, watermarks, after=None, page=1, newest=None):
+        """/new 목록 한 페이지 요청 (after: 이전 페이지의 마지막 포스트 fullname)"""
+        query = {'limit': 100}
+        if after:
+            query['after'] = after
+        return scrapy.Request(
+            url=f"https://oauth.reddit.com/r/{'+'.join(subreddits)}/new.json?{urlencode(query)}",
+            callback=self.parse_subreddit,
+            meta={'subreddits': subreddits, 'watermarks': watermarks, 'page': page, 'newest': newest},
+            dont_filter=True
+        )
     
     def parse_subreddit(self, response):
-        """서브레딧의 포스트들을 파싱"""
+        """
+        서브레딧 묶음의 포스트들을 파싱
+        
+        증분 모드(REDDIT_INCREMENTAL)에서는 /new 목록을 after 커서로 넘기며 읽다가, 묶음에서
+        가장 오래된 워터마크(지난 실행에서 본 가장 최신 포스트의 fullname과 created_utc)보다
+        오래된 포스트에 닿으면 멈추고, 이번 실행에서 본 가장 최신 포스트를 묶음의 모든
+        서브레딧에 새 워터마크로 저장합니다. 워터마크가 없는 서브레딧은 REDDIT_FIRST_RUN_HOURS
+        시간 전을 워터마크로 삼아 (묶음 크기와 상관없이 같은 기간을) 읽고, 워터마크에 닿기 전에
+        REDDIT_MAX_PAGES 페이지를 넘으면 경고를 남깁니다.
+        
+        증분 모드에서는 포스트를 만들어진 직후에 한 번만 보므로, 댓글이 아직
+        REDDIT_COMMENTS_MIN_COMMENTS개가 안 되는 포스트는 상태 저장소에 기록해 두고 다음
+        실행들에서 댓글 수를 다시 확인합니다 (_comment_recheck_requests).
+        """
+        subreddits = response.meta['subreddits']
+        label = '+'.join(subreddits)
         try:
             data = json.loads(response.text)
-            subreddit = response.meta['subreddit']
             
             if 'data' not in data or 'children' not in data['data']:
-                self.logger.warning(f"No data found for subreddit: {subreddit}")
+                self.logger.warning(f"No data found for subreddit: {label}")
                 return
             
-            posts = data['data']['children']
+            listing = data['data']
+            posts = listing['children']
+            # 응답의 subreddit 필드(표시 이름)를 설정의 서브레딧 이름으로
+            names = {subreddit.lower(): subreddit for subreddit in subreddits}
+            watermarks = response.meta.get('watermarks') or {}
+            # 묶음 전체가 이 지점까지는 지난 실행에서 읽었음 (서브레딧이 추가된 묶음은 가장 오래된 워터마크)
+            floor = min(watermarks.values(), key=lambda watermark: watermark.get('created_utc', 0), default=None)
+            reached_watermark = False
             
             for post_data in posts:
                 post = post_data['data']
+                subreddit = names.get(str(post.get('subreddit', '')).lower(), post.get('subreddit'))
                 
-                # 기술/주식 관련 키워드 필터링
-                if self._is_relevant_post(post):
-                    item = RedditPostItem()
-                    
-                    # 기본 정보
-                    item['post_id'] = post.get('id')
-                    item['title'] = post.get('title', '')
-                    item['content'] = post.get('selftext', '')
-                    item['author'] = post.get('author')
-                    item['subreddit'] = subreddit
-                    
-                    # 통계 정보
-                    item['score'] = post.get('score', 0)
-                    item['upvote_ratio'] = post.get('upvote_ratio', 0)
-                    item['num_comments'] = post.get('num_comments', 0)
-                    
-                    # 시간 정보
-                    created_utc = post.get('created_utc')
-                    if created_utc:
-                        item['created_utc'] = datetime.fromtimestamp(created_utc).isoformat()
-                    
-                    # URL 정보
-                    item['url'] = post.get('url', '')
-                    item['permalink'] = f"https://reddit.com{post.get('permalink', '')}"
-                    item['is_self'] = post.get('is_self', False)
-                    item['domain'] = post.get('domain', '')
-                    
-                    # 기술 키워드 추출
-                    item['tech_keywords'] = self._extract_tech_keywords(
-                        item['title'] + ' ' + item['content']
-                    )
-                    
-                    # 주식 티커 심볼 추출
-                    item['stock_tickers'] = self._extract_stock_tickers(
-                        item['title'] + ' ' + item['content']
-                    )
-                    
+                if floor is not None:
+                    if self._is_seen(post, floor):
+                        reached_watermark = True
+                        break
+                    if self._is_seen(post, watermarks.get(subreddit, floor)):
+                        continue
+                
+                item = self._build_item(post, subreddit)
+                if item is not None:
                     yield item
+                    if not self.crawl_comments:
+                        continue
+                    if post.get('num_comments', 0) >= self.comments_min_comments:
+                        yield self._comments_request(post, subreddit)
+                    elif self.state is not None:
+                        self.state.put_item(self.comments_namespace, post['id'], {'subreddit': subreddit},
+                                            item_time=post.get('created_utc'))
+            
+            if self.state is None:
+                return
+            
+            # 첫 페이지의 맨 앞 포스트가 이번 실행의 새 워터마크
+            newest = response.meta.get('newest')
+            if newest is None and posts:
+                first = posts[0]['data']
+                newest = {'name': first.get('name'), 'created_utc': first.get('created_utc')}
+            
+            page = response.meta.get('page', 1)
+            after = listing.get('after')
+            self.crawler.stats.inc_value('reddit/listing_pages')
+            
+            if after and not reached_watermark:
+                more_pages = page < self.max_pages
+                if not more_pages:
+                    self.crawler.stats.inc_value('reddit/watermark_not_reached')
+                    self.logger.warning(f"r/{label}: stopped after {page} pages before reaching the "
+                                        f"watermark, older new posts may be missed")
+                if more_pages:
+                    yield self._new_posts_request(subreddits, watermarks, after, page + 1, newest)
+                    return
+            
+            # 페이지 넘김이 끝난 뒤에만 워터마크를 옮김 (중간에 실패하면 다음 실행에서 다시 읽음)
+            # 멀티레딧 목록은 묶음 전체를 시간순으로 담으므로 묶음의 모든 서브레딧이 newest까지 읽힌 것
+            if newest is not None:
+                for subreddit in subreddits:
+                    self.state.set_cursor(self.state_namespace, f"watermark:{subreddit}", newest)
                     
         except Exception as e:
-            self.logger.error(f"Error parsing subreddit {response.meta['subreddit']}: {e}")
+            self.logger.error(f"Error parsing subreddit {label}: {e}")
+    
+    def _comment_recheck_requests(self):
+        """
+        댓글이 적어 기록해 둔 포스트의 현재 댓글 수를 /api/info로 INFO_BATCH개씩 조회
+        
+        REDDIT_COMMENTS_TRACK_HOURS보다 오래된 포스트는 더 확인하지 않습니다.
+        """
+        pruned = self.state.prune_items(self.comments_namespace,
+                                        time.time() - self.comments_track_hours * 3600)
+        if pruned:
+            self.crawler.stats.inc_value('reddit/comment_tracking_expired', pruned)
+        
+        tracked = self.state.get_items(self.comments_namespace)
+        post_ids = list(tracked)
+        for start in range(0, len(post_ids), INFO_BATCH):
+            batch = {post_id: tracked[post_id]['subreddit'] for post_id in post_ids[start:start + INFO_BATCH]}
+            query = {'id': ','.join(f"t3_{post_id}" for post_id in batch)}
+            yield scrapy.Request(
+                url=f"https://oauth.reddit.com/api/info.json?{urlencode(query)}",
+                callback=self.parse_comment_recheck,
+                meta={'tracked': batch},
+                dont_filter=True
+            )
+    
+    def parse_comment_recheck(self, response):
+        """댓글 수가 REDDIT_COMMENTS_MIN_COMMENTS개에 닿은 포스트의 댓글 수집 (이후로는 추적하지 않음)"""
+        tracked = response.meta['tracked']
+        try:
+            data = json.loads(response.text)
+            
+            ready = []
+            for post_data in data.get('data', {}).get('children', []):
+                post = post_data['data']
+                subreddit = tracked.get(post.get('id'))
+                if subreddit is None or post.get('num_comments', 0) < self.comments_min_comments:
+                    continue
+                ready.append(post['id'])
+                yield self._comments_request(post, subreddit)
+            
+            self.crawler.stats.inc_value('reddit/comment_rechecks', len(tracked))
+            self.crawler.stats.inc_value('reddit/comment_rechecks_ready', len(ready))
+            self.state.delete_items(self.comments_namespace, ready)
+            
+        except Exception as e:
+            self.logger.error(f"Error rechecking comment counts for {len(tracked)} posts: {e}")
     
-    def _is_relevant_post(self, post):
-        """포스트가 기술/주식 관련인지 확인"""
-        title = post.get('title', '').lower()
-        content = post.get('selftext', '').lower()
-        text = title + ' ' + content
+    def _comments_request(self, post, subreddit):
+        """포스트의 댓글 트리 요청"""
+        query = {'limit': self.comments_limit, 'sort': 'top'}
+        return scrapy.Request(
+            url=f"https://oauth.reddit.com/comments/{post['id']}.json?{urlencode(query)}",
+            callback=self.parse_comments,
+            meta={'post_id': post['id'], 'subreddit': subreddit},
+            dont_filter=True
+        )
+    
+    def _morechildren_request(self, meta, more_ids, calls):
+        """
+        접힌 댓글 ID를 MORECHILDREN_BATCH개씩 펼치는 /api/morechildren 요청
         
-        # 기술 키워드 체크
-        tech_keywords = self.settings.get('TECH_KEYWORDS', [])
-        stock_keywords = self.settings.get('STOCK_KEYWORDS', [])
-        blocked_keywords = self.settings.get('BLOCKED_KEYWORDS', [])
+        Reddit은 morechildren을 동시에 하나만 보내도록 요구하므로 포스트마다 응답을 받은 뒤
+        남은 ID로 다음 요청을 보냅니다. REDDIT_MORECHILDREN_MAX_CALLS번을 넘으면 남은 ID는
+        버립니다.
+        """
+        if not more_ids:
+            return None
+        if calls >= self.morechildren_max_calls:
+            self.crawler.stats.inc_value('reddit/morechildren_skipped', len(more_ids))
+            return None
         
+        query = {
+            'api_type': 'json',
+            'link_id': f"t3_{meta['post_id']}",
+            'children': ','.join(more_ids[:MORECHILDREN_BATCH]),
+            'limit_children': 'false'
+        }
+        self.crawler.stats.inc_value('reddit/morechildren_calls')
+        return scrapy.Request(
+            url=f"https://oauth.reddit.com/api/morechildren.json?{urlencode(query)}",
+            callback=self.parse_morechildren,
+            meta={'post_id': meta['post_id'], 'subreddit': meta['subreddit'],
+                  'more_ids': more_ids[MORECHILDREN_BATCH:], 'calls': calls + 1},
+            dont_filter=True
+        )
+    
+    def parse_comments(self, response):
+        """포스트의 댓글 트리 파싱 (접힌 댓글 ID는 모아서 morechildren으로 펼침)"""
+        try:
+            data = json.loads(response.text)
+            
+            # [포스트 목록, 댓글 목록]
+            if not isinstance(data, list) or len(data) < 2:
+                self.logger.warning(f"No comments found for post: {response.meta['post_id']}")
+                return
+            
+            more_ids = []
+            yield from self._walk_comments(data[1]['data']['children'], response.meta, more_ids)
+            
+            request = self._morechildren_request(response.meta, more_ids, 0)
+            if request is not None:
+                yield request
+                
+        except Exception as e:
+            self.logger.error(f"Error parsing comments for post {response.meta['post_id']}: {e}")
+    
+    def parse_morechildren(self, response):
+        """morechildren으로 펼친 댓글 파싱 (things는 트리가 아닌 평평한 목록)"""
+        try:
+            data = json.loads(response.text)
+            things = data.get('json', {}).get('data', {}).get('things', [])
+            
+            more_ids = list(response.meta['more_ids'])
+            yield from self._walk_comments(things, response.meta, more_ids)
+            
+            request = self._morechildren_request(response.meta, more_ids, response.meta['calls'])
+            if request is not None:
+                yield request
+                
+        except Exception as e:
+            self.logger.error(f"Error parsing morechildren for post {response.meta['post_id']}: {e}")
+    
+    def _walk_comments(self, children, meta, more_ids):
+        """댓글 트리를 순회하며 아이템 생성 (접힌 댓글 ID는 more_ids에 추가)"""
+        stack = list(reversed(children))
+        while stack:
+            child = stack.pop()
+            kind = child.get('kind')
+            comment = child.get('data') or {}
+            
+            if kind == 'more':
+                # 'continue this thread' 링크는 children이 비어 있어 morechildren으로 펼칠 수 없음
+                more_ids.extend(comment.get('children', []))
+            elif kind == 't1':
+                self.crawler.stats.inc_value('reddit/comments_seen')
+                item = self._build_comment_item(comment, meta)
+                if item is not None:
+                    yield item
+                
+                replies = comment.get('replies')
+                if replies:
+                    stack.extend(reversed(replies['data']['children']))
+    
+    def _build_comment_item(self, comment, meta):
+        """댓글 하나를 아이템으로 변환 (기술 키워드나 티커가 없으면 None)"""
+        body = comment.get('body') or ''
+        if body in ('[deleted]', '[removed]'):
+            return None
+        
+        normalized = normalize_text(body)
+        matches = self.keyword_matcher.match(normalized['lower'])
+        if matches.blocked:
+            return None
+        
+        stock_tickers = self._extract_stock_tickers(normalized)
+        if not matches.relevant and not stock_tickers:
+            return None
+        
+        item = RedditCommentItem()
+        
+        # 기본 정보
+        item['comment_id'] = comment.get('id')
+        item['post_id'] = meta['post_id']
+        item['parent_id'] = comment.get('parent_id')
+        item['body'] = body
+        item['author'] = comment.get('author')
+        item['subreddit'] = meta['subreddit']
+        
+        # 통계 정보
+        item['score'] = comment.get('score', 0)
+        item['depth'] = comment.get('depth', 0)
+        
+        # 시간 정보
+        created_utc = comment.get('created_utc')
+        if created_utc:
+            item['created_utc'] = datetime.fromtimestamp(created_utc).isoformat()
+        
+        item['permalink'] = f"https://reddit.com{comment.get('permalink', '')}"
+        
+        # 기술 키워드와 주식 티커 심볼
+        item['tech_keywords'] = matches.keywords
+        item['stock_tickers'] = stock_tickers
+        item['normalized_text'] = normalized
+        
+        return item
+    
+    def closed(self, reason):
+        if self.state is not None:
+            self.state.close()
+    
+    def _is_seen(self, post, watermark):
+        """지난 실행에서 이미 본 포스트인지 (워터마크 포스트이거나 그보다 오래됨)"""
+        if watermark.get('name') and post.get('name') == watermark.get('name'):
+            return True
+        created_utc = post.get('created_utc')
+        return created_utc is not None and created_utc < watermark.get('created_utc', 0)
+    
+    def _build_item(self, post, subreddit):
+        """포스트 하나를 아이템으로 변환 (기술/주식과 관련 없으면 None)"""
+        # 제목 + 본문을 한 번만 정규화해 필터링, 키워드/티커 추출, 감성 분석에 재사용
+        normalized = normalize_text(post.get('title', '') + ' ' + post.get('selftext', ''))
+        matches = self.keyword_matcher.match(normalized['lower'])
+        
+        # 기술/주식 관련 키워드 필터링
+        if not self._is_relevant_post(post, matches):
+            return None
+        
+        item = RedditPostItem()
+        
+        # 기본 정보
+        item['post_id'] = post.get('id')
+        item['title'] = post.get('title', '')
+        item['content'] = post.get('selftext', '')
+        item['author'] = post.get('author')
+        item['subreddit'] = subreddit
+        
+        # 통계 정보
+        item['score'] = post.get('score', 0)
+        item['upvote_ratio'] = post.get('upvote_ratio', 0)
+        item['num_comments'] = post.get('num_comments', 0)
+        
+        # 시간 정보
+        created_utc = post.get('created_utc')
+        if created_utc:
+            item['created_utc'] = datetime.fromtimestamp(created_utc).isoformat()
+        
+        # URL 정보
+        item['url'] = post.get('url', '')
+        item['permalink'] = f"https://reddit.com{post.get('permalink', '')}"
+        item['is_self'] = post.get('is_self', False)
+        item['domain'] = post.get('domain', '')
+        
+        # 기술 키워드 추출
+        item['tech_keywords'] = matches.keywords
+        
+        # 주식 티커 심볼 추출
+        item['stock_tickers'] = self._extract_stock_tickers(normalized)
+        item['normalized_text'] = normalized
+        
+        return item
+    
+    def _is_relevant_post(self, post, matches):
+        """포스트가 기술/주식 관련인지 확인 (matches: 제목 + 본문의 KeywordMatches)"""
         # 금지된 키워드 체크
-        for blocked in blocked_keywords:
-            if blocked.lower() in text:
-                return False
+        if matches.blocked:
+            return False
         
         # 기술 또는 주식 키워드가 포함되어 있는지 확인
-        relevant_keywords = tech_keywords + stock_keywords
-        for keyword in relevant_keywords:
-            if keyword.lower() in text:
-                return True
+        if matches.relevant:
+            return True
         
         # 점수나 댓글 수로 인기도 체크
         score = post.get('score', 0)
@@ -182,32 +487,13 @@ class RedditSpiderSpider(scrapy.Spider):
         
         return False
     
-    def _extract_tech_keywords(self, text):
-        """텍스트에서 기술 키워드 추출"""
-        if not text:
-            return []
-        
-        text_lower = text.lower()
-        found_keywords = []
-        
-        tech_keywords = self.settings.get('TECH_KEYWORDS', [])
-        stock_keywords = self.settings.get('STOCK_KEYWORDS', [])
-        
-        all_keywords = tech_keywords + stock_keywords
-        
-        for keyword in all_keywords:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
-        
-        return found_keywords
-    
-    def _extract_stock_tickers(self, text):
-        """텍스트에서 주식 티커 심볼 추출"""
-        if not text:
+    def _extract_stock_tickers(self, normalized):
+        """정규화한 텍스트에서 주식 티커 심볼 추출 (대소문자를 유지한 텍스트 사용)"""
+        if not normalized['text']:
             return []
         
         try:
-            tickers = extract_stock_tickers(text)
+            tickers = extract_stock_tickers(normalized['text'], lowered=aligned_lower(normalized))
             return tickers
         except Exception as e:
             self.logger.warning(f"Error extracting stock tickers: {e}")
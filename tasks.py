@@ -137,7 +137,7 @@ def generate_weekly_report():
         # 지난 주 데이터
         week_ago = datetime.utcnow() - timedelta(days=7)
         
-        collections = ['reddit_posts', 'hackernews_items', 'github_repos']
+        collections = ['reddit_posts', 'reddit_comments', 'hackernews_items', 'github_repos']
         report = {
             'report_date': datetime.utcnow().isoformat(),
             'period': '7_days',
@@ -179,7 +179,7 @@ def cleanup_old_data():
         client = MongoClient(MONGODB_URI)
         db = client['stock_tech_trends']
         
-        collections = ['reddit_posts', 'hackernews_items', 'github_repos']
+        collections = ['reddit_posts', 'reddit_comments', 'hackernews_items', 'github_repos']
         deleted_counts = {}
         
         for collection_name in collections:
@@ -193,7 +193,7 @@ def cleanup_old_data():
         conn = psycopg2.connect(POSTGRES_URL)
         cursor = conn.cursor()
         
-        tables = ['reddit_posts', 'hackernews_items', 'github_repos']
+        tables = ['reddit_posts', 'reddit_comments', 'hackernews_items', 'github_repos']
         
         for table in tables:
             cursor.execute(f"DELETE FROM {table} WHERE crawled_at < %s", (cutoff_date,))
@@ -0,0 +1,192 @@
+"""
+조건부 요청 (ETag / Last-Modified) 테스트
+
+ConditionalRequestMiddleware가 검증자를 저장하고 붙이는지, 304를 저장한 응답으로
+되돌려 주는지, 본문 없이 저장한 항목을 플래그 없는 요청에 쓰지 않는지 확인합니다.
+
+사용법:
+    python -m pytest test_conditional_requests.py
+    python test_conditional_requests.py
+"""
+
+import os
+import sys
+import io
+import gzip
+import tempfile
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# Scrapy 프로젝트 모듈 import
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stock_tech_trends'))
+from scrapy import Spider
+from scrapy.downloadermiddlewares.httpcache import HttpCacheMiddleware
+from scrapy.http import Request, Response, TextResponse
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+from stock_tech_trends.middlewares import ConditionalCacheStore, ConditionalRequestMiddleware
+
+URL = 'https://api.github.com/search/repositories?q=ai&sort=stars'
+ETAG = 'W/"abc123"'
+LAST_MODIFIED = 'Mon, 12 Oct 2026 10:00:00 GMT'
+BODY = b'{"items": [{"id": 1}]}'
+
+
+def make_middleware(directory):
+    stats = MemoryStatsCollector(get_crawler())
+    store = ConditionalCacheStore(os.path.join(directory, 'conditional_cache.sqlite'))
+    return ConditionalRequestMiddleware(store, stats=stats), stats
+
+
+def ok_response(request, body=BODY, headers=None):
+    headers = {'ETag': ETAG, 'Last-Modified': LAST_MODIFIED, 'Content-Type': 'application/json',
+               **(headers or {})}
+    return TextResponse(request.url, status=200, headers=headers, body=body, request=request)
+
+
+def not_modified(request):
+    return Response(request.url, status=304, headers={'ETag': ETAG}, request=request)
+
+
+def test_validators_are_stored_and_sent():
+    """검증자가 있는 200 응답을 저장하고 같은 URL의 다음 요청에 검증자를 붙임"""
+    with tempfile.TemporaryDirectory() as directory:
+        middleware, stats = make_middleware(directory)
+        first = Request(URL)
+        assert middleware.process_request(first, None) is None
+        assert b'If-None-Match' not in first.headers
+        middleware.process_response(first, ok_response(first), None)
+
+        # 쿼리 순서가 달라도 같은 URL
+        second = Request('https://api.github.com/search/repositories?sort=stars&q=ai')
+        middleware.process_request(second, None)
+        assert second.headers[b'If-None-Match'] == ETAG.encode()
+        assert second.headers[b'If-Modified-Since'] == LAST_MODIFIED.encode()
+        assert stats.get_value('conditional/stored') == 1
+        middleware.store.close()
+
+
+def test_not_modified_replays_stored_response():
+    """304를 받으면 저장한 본문과 헤더로 200 응답을 만들고 아낀 바이트를 기록"""
+    with tempfile.TemporaryDirectory() as directory:
+        middleware, stats = make_middleware(directory)
+        body = gzip.compress(BODY)
+        first = Request(URL)
+        middleware.process_response(first, ok_response(first, body, {'Content-Encoding': 'gzip'}), None)
+
+        second = Request(URL)
+        middleware.process_request(second, None)
+        replayed = middleware.process_response(second, not_modified(second), None)
+
+        assert replayed.status == 200
+        assert 'unchanged' in replayed.flags
+        assert replayed.body == body
+        assert replayed.headers[b'Content-Encoding'] == b'gzip'
+        assert replayed.request is second
+        assert stats.get_value('conditional/not_modified') == 1
+        assert stats.get_value('conditional/api.github.com/not_modified') == 1
+        assert stats.get_value('conditional/bytes_saved') == len(body)
+        middleware.store.close()
+
+
+def test_skip_unchanged_stores_no_body():
+    """conditional_skip_unchanged 요청은 본문 없이 저장하고 304에 빈 200 응답을 돌려줌"""
+    with tempfile.TemporaryDirectory() as directory:
+        middleware, _ = make_middleware(directory)
+        meta = {'conditional_skip_unchanged': True}
+        first = Request(URL, meta=meta)
+        middleware.process_response(first, ok_response(first), None)
+        assert middleware.store.get(URL)['body'] is None
+
+        second = Request(URL, meta=meta)
+        middleware.process_request(second, None)
+        assert b'If-None-Match' in second.headers
+        replayed = middleware.process_response(second, not_modified(second), None)
+        assert replayed.status == 200
+        assert replayed.body == b''
+        assert 'unchanged' in replayed.flags
+        middleware.store.close()
+
+
+def test_synthesized_responses_are_not_http_cached():
+    """검증자를 붙인 요청은 dont_cache로 표시해 HttpCacheMiddleware가 빈 200을 저장하지 않음"""
+    with tempfile.TemporaryDirectory() as directory:
+        middleware, _ = make_middleware(directory)
+        crawler = get_crawler(Spider, {'HTTPCACHE_ENABLED': True, 'HTTPCACHE_DIR': directory})
+        spider = crawler._create_spider('test')
+        http_cache = HttpCacheMiddleware.from_crawler(crawler)
+        http_cache.spider_opened(spider)
+
+        meta = {'conditional_skip_unchanged': True}
+        first = Request(URL, meta=meta)
+        middleware.process_response(first, ok_response(first), spider)
+
+        # 응답은 ConditionalRequestMiddleware(940) -> HttpCacheMiddleware(900) 순서로 지남
+        second = Request(URL, meta=meta)
+        assert http_cache.process_request(second) is None
+        middleware.process_request(second, spider)
+        assert second.meta['dont_cache']
+        replayed = middleware.process_response(second, not_modified(second), spider)
+        http_cache.process_response(second, replayed)
+
+        # 다음 실행에서 캐시된 빈 200을 받지 않음
+        assert http_cache.process_request(Request(URL, meta=meta)) is None
+        http_cache.spider_closed(spider)
+        middleware.store.close()
+
+
+def test_bodyless_entry_is_not_used_without_flag():
+    """본문 없이 저장된 항목은 플래그 없는 요청에 검증자를 붙이지도, 빈 응답으로 답하지도 않음"""
+    with tempfile.TemporaryDirectory() as directory:
+        middleware, stats = make_middleware(directory)
+        first = Request(URL, meta={'conditional_skip_unchanged': True})
+        middleware.process_response(first, ok_response(first), None)
+
+        second = Request(URL)
+        middleware.process_request(second, None)
+        assert b'If-None-Match' not in second.headers
+        assert b'If-Modified-Since' not in second.headers
+
+        # 다른 경로로 304가 와도 빈 200으로 바꾸지 않음
+        response = not_modified(second)
+        assert middleware.process_response(second, response, None) is response
+        assert not stats.get_value('conditional/not_modified')
+
+        # 전체 응답을 받으면 본문과 함께 저장되어 다음부터는 재생 가능
+        middleware.process_response(second, ok_response(second), None)
+        assert middleware.store.get(URL)['body'] == BODY
+        third = Request(URL)
+        middleware.process_request(third, None)
+        assert b'If-None-Match' in third.headers
+        middleware.store.close()
+
+
+def test_non_get_and_opted_out_requests_are_ignored():
+    """GET이 아니거나 dont_conditional이 있는 요청은 저장하지 않음"""
+    with tempfile.TemporaryDirectory() as directory:
+        middleware, _ = make_middleware(directory)
+        post = Request(URL, method='POST')
+        middleware.process_response(post, ok_response(post), None)
+        opted_out = Request(URL, meta={'dont_conditional': True})
+        middleware.process_response(opted_out, ok_response(opted_out), None)
+        assert middleware.store.get(URL) is None
+        middleware.store.close()
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+CrawlStateStore 테스트
+
+아이템 지표와 워터마크 저장, commit_every 단위 commit, prune을 확인합니다.
+
+사용법:
+    python -m pytest test_crawl_state.py
+    python test_crawl_state.py
+"""
+
+import os
+import sys
+import io
+import sqlite3
+import tempfile
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# Scrapy 프로젝트 모듈 import
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stock_tech_trends'))
+from stock_tech_trends.crawl_state import CrawlStateStore
+
+
+def test_items_and_cursors_survive_reopen():
+    """아이템 지표와 워터마크는 close 후 다시 열어도 남아 있음"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state', 'crawl_state.sqlite')
+        state = CrawlStateStore(path)
+        state.put_item('hn', 101, {'score': 5, 'descendants': 2}, item_time=1000)
+        state.set_cursor('hn', 'maxitem', 101)
+        state.close()
+
+        state = CrawlStateStore(path)
+        assert state.get_item('hn', '101') == {'score': 5, 'descendants': 2}
+        assert state.get_item('reddit', 101) is None
+        assert state.get_cursor('hn', 'maxitem') == 101
+        assert state.get_cursor('hn', 'missing', default=0) == 0
+        state.close()
+
+
+def test_namespaces_are_separate():
+    """같은 아이템 ID라도 namespace가 다르면 다른 값"""
+    with tempfile.TemporaryDirectory() as directory:
+        state = CrawlStateStore(os.path.join(directory, 'crawl_state.sqlite'))
+        state.put_item('hn', 1, {'score': 1})
+        state.put_item('reddit', 1, {'score': 2})
+        assert state.get_item('hn', 1) == {'score': 1}
+        assert state.count_items('reddit') == 1
+        state.close()
+
+
+def test_known_items_in_chunks():
+    """known_items는 SQLite 변수 제한보다 많은 ID도 나눠서 조회"""
+    with tempfile.TemporaryDirectory() as directory:
+        state = CrawlStateStore(os.path.join(directory, 'crawl_state.sqlite'))
+        for item_id in range(0, 2000, 2):
+            state.put_item('hn', item_id, {})
+        known = state.known_items('hn', range(2000))
+        assert len(known) == 1000
+        assert '1998' in known and '1' not in known
+        state.close()
+
+
+def test_writes_commit_every_n():
+    """아이템 쓰기는 commit_every번마다 commit (다른 연결에서 보이는 시점)"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'crawl_state.sqlite')
+        state = CrawlStateStore(path, commit_every=3)
+        reader = sqlite3.connect(path)
+        count = lambda: reader.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+        state.put_item('hn', 1, {})
+        state.put_item('hn', 2, {})
+        assert count() == 0
+        state.put_item('hn', 3, {})
+        assert count() == 3
+
+        state.put_item('hn', 4, {})
+        state.close()
+        assert count() == 4
+        reader.close()
+
+
+def test_prune_by_age_and_keep():
+    """prune은 오래된 아이템을 지우고, keep을 주면 최신 keep개만 남김"""
+    with tempfile.TemporaryDirectory() as directory:
+        state = CrawlStateStore(os.path.join(directory, 'crawl_state.sqlite'))
+        for item_id in range(10):
+            state.put_item('hn', item_id, {}, item_time=1000 + item_id)
+
+        assert state.prune_items('hn', older_than=1003) == 3
+        assert state.count_items('hn') == 7
+        assert state.prune_items('hn', older_than=0, keep=2) == 5
+        assert state.known_items('hn', range(10)) == {'8', '9'}
+        state.close()
+
+
+def test_get_and_delete_items():
+    """get_items는 item_time 순으로 모든 아이템을 돌려주고 delete_items는 주어진 ID만 삭제"""
+    with tempfile.TemporaryDirectory() as directory:
+        state = CrawlStateStore(os.path.join(directory, 'crawl_state.sqlite'))
+        state.put_item('reddit_comments', 'b', {'subreddit': 'stocks'}, item_time=2000)
+        state.put_item('reddit_comments', 'a', {'subreddit': 'Python'}, item_time=1000)
+        state.put_item('reddit', 'c', {})
+
+        assert list(state.get_items('reddit_comments').items()) == [
+            ('a', {'subreddit': 'Python'}), ('b', {'subreddit': 'stocks'})]
+        state.delete_items('reddit_comments', ['a', 'missing'])
+        assert list(state.get_items('reddit_comments')) == ['b']
+        assert state.count_items('reddit') == 1
+        state.close()
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
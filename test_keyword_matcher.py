@@ -0,0 +1,88 @@
+"""
+키워드 매처 테스트
+
+단어 경계, 복수형 어미, 겹치는 키워드, 카테고리 구분을 확인합니다.
+
+사용법:
+    python -m pytest test_keyword_matcher.py
+    python test_keyword_matcher.py
+"""
+
+import sys
+import io
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from utils.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+MATCHER = KeywordMatcher(
+    tech_keywords=['AI', 'AR', 'Big Data', 'Data Science', 'GPU', 'C++'],
+    stock_keywords=['stock', 'index', 'earnings'],
+    blocked_keywords=['giveaway'],
+)
+
+
+def test_word_boundaries():
+    """키워드는 단어 경계에서만 매칭 ('AI'는 'said', 'AR'은 'hardware'에 없음)"""
+    assert MATCHER.match('he said the hardware was fine').tech == []
+    assert MATCHER.match('ai and ar headsets').tech == ['AI', 'AR']
+    assert MATCHER.match('openai-backed startup').tech == []
+    assert MATCHER.match('(ai) is hot').tech == ['AI']
+
+
+def test_plural_suffixes():
+    """복수형 어미 s/es는 허용하고 다른 어미는 허용하지 않음"""
+    assert MATCHER.match('tech stocks rally').stock == ['stock']
+    assert MATCHER.match('major indexes fell').stock == ['index']
+    assert MATCHER.match('gpus are scarce').tech == ['GPU']
+    assert MATCHER.match('stockholder meeting').stock == []
+    assert MATCHER.match('stocking up').stock == []
+
+
+def test_overlapping_keywords_are_all_found():
+    """겹치는 키워드도 모두 찾고, 설정 표기로 처음 나온 순서대로 반환"""
+    matches = MATCHER.match('big data science jobs')
+    assert matches.tech == ['Big Data', 'Data Science']
+
+
+def test_keywords_with_symbols():
+    """특수 문자가 있는 키워드도 그대로 매칭"""
+    assert MATCHER.match('modern c++ tooling').tech == ['C++']
+
+
+def test_categories_and_relevance():
+    """금지 키워드는 관련성과 별개로 분류하고, keywords는 기술 + 주식 키워드"""
+    matches = MATCHER.match('ai stock giveaway, more ai earnings')
+    assert matches.blocked == ['giveaway']
+    assert matches.tech == ['AI']
+    assert matches.stock == ['stock', 'earnings']
+    assert matches.relevant
+    assert matches.keywords == ['AI', 'stock', 'earnings']
+
+    assert not MATCHER.match('giveaway only').relevant
+    assert not MATCHER.match('').relevant
+
+
+def test_empty_matcher_and_cache():
+    """키워드가 없으면 아무것도 찾지 않고, 같은 목록의 매처는 재사용"""
+    assert not KeywordMatcher().match('ai stock').relevant
+    assert get_keyword_matcher(('AI',), ('stock',)) is get_keyword_matcher(('AI',), ('stock',))
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
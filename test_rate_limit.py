@@ -0,0 +1,133 @@
+"""
+토큰 버킷 속도 제한 테스트
+
+take_token/observe_quota의 채우기, 대기 시간, API 쿼터 반영과 FileBucketStore 공유,
+RateLimitMiddleware의 버킷 선택과 쿼터 헤더 해석을 확인합니다.
+
+사용법:
+    python -m pytest test_rate_limit.py
+    python test_rate_limit.py
+"""
+
+import os
+import sys
+import io
+import tempfile
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# Scrapy 프로젝트 모듈 import
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stock_tech_trends'))
+from scrapy.http import Headers, Request
+from stock_tech_trends.middlewares import FileBucketStore, RateLimitMiddleware, observe_quota, take_token
+
+NOW = 1_700_000_000.0
+
+
+def test_burst_then_wait():
+    """처음에는 burst개까지 바로 꺼내고, 비면 다음 토큰까지 기다릴 시간을 돌려줌"""
+    bucket = None
+    for _ in range(3):
+        bucket, wait = take_token(bucket, NOW, rate=2.0, burst=3)
+        assert wait == 0
+    bucket, wait = take_token(bucket, NOW, rate=2.0, burst=3)
+    assert wait == 0.5
+
+
+def test_refill_is_capped_at_burst():
+    """경과 시간만큼 채우되 burst를 넘지 않음"""
+    bucket, _ = take_token(None, NOW, rate=1.0, burst=2)
+    bucket, _ = take_token(bucket, NOW, rate=1.0, burst=2)
+    bucket, wait = take_token(bucket, NOW + 100, rate=1.0, burst=2)
+    assert wait == 0
+    assert bucket['tokens'] == 1.0
+
+
+def test_observed_quota_sets_rate_until_reset():
+    """남은 쿼터를 리셋까지 고르게 쓰는 속도로 바꾸고, 리셋이 지나면 기본 속도로 돌아감"""
+    bucket = observe_quota(None, NOW, remaining=30, reset_at=NOW + 60, rate=10.0, burst=1)
+    assert bucket['rate'] == 0.5
+    bucket, wait = take_token(bucket, NOW, rate=10.0, burst=1)
+    assert wait == 0
+    assert bucket['remaining'] == 29
+    bucket, wait = take_token(bucket, NOW, rate=10.0, burst=1)
+    assert wait == 2.0
+
+    bucket, wait = take_token(bucket, NOW + 61, rate=10.0, burst=1)
+    assert wait == 0
+    assert bucket['rate'] == 10.0 and bucket['remaining'] is None
+
+
+def test_exhausted_quota_waits_for_reset():
+    """남은 쿼터가 0이면 토큰이 있어도 리셋 시각까지 기다림"""
+    bucket = observe_quota(None, NOW, remaining=0, reset_at=NOW + 42, rate=10.0, burst=5)
+    bucket, wait = take_token(bucket, NOW + 2, rate=10.0, burst=5)
+    assert wait == 40
+
+
+def test_late_response_does_not_raise_remaining():
+    """같은 윈도우의 늦게 도착한 응답이 더 큰 remaining을 알려 와도 작은 값을 유지"""
+    bucket = observe_quota(None, NOW, remaining=10, reset_at=NOW + 60, rate=1.0, burst=1)
+    bucket = observe_quota(bucket, NOW + 1, remaining=50, reset_at=NOW + 61, rate=1.0, burst=1)
+    assert bucket['remaining'] == 10
+    # 새 윈도우는 새 값을 씀
+    bucket = observe_quota(bucket, NOW + 70, remaining=50, reset_at=NOW + 130, rate=1.0, burst=1)
+    assert bucket['remaining'] == 50
+
+
+def test_file_store_is_shared_between_instances():
+    """같은 파일을 쓰는 저장소끼리 버킷을 나눠 씀 (프로세스 사이 공유)"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'buckets', 'rate_limit.json')
+        first, second = FileBucketStore(path), FileBucketStore(path)
+        assert first.take('reddit', NOW, 1.0, 2) == 0
+        assert second.take('reddit', NOW, 1.0, 2) == 0
+        assert first.take('reddit', NOW, 1.0, 2) == 1.0
+        # 다른 버킷은 따로
+        assert second.take('github', NOW, 1.0, 2) == 0
+
+        second.observe('reddit', NOW, 0, NOW + 30, 1.0, 2)
+        assert first.take('reddit', NOW + 10, 1.0, 2) == 20
+
+
+def test_middleware_matches_buckets_and_reads_quota_headers():
+    """먼저 적힌 버킷이 우선이고, 리셋 헤더는 epoch 초와 남은 초를 모두 받음"""
+    middleware = RateLimitMiddleware({
+        'github_search': {'host': 'api.github.com', 'path': '/search/', 'limit': 30, 'period': 60},
+        'github': {'host': 'api.github.com', 'limit': 5000, 'period': 3600, 'burst': 10},
+    }, store=None)
+
+    name, config = middleware._match(Request('https://api.github.com/search/repositories?q=ai'))
+    assert name == 'github_search'
+    assert middleware._rate(config) == (0.5, 1.0)
+    name, config = middleware._match(Request('https://api.github.com/graphql'))
+    assert name == 'github'
+    assert middleware._rate(config) == (5000 / 3600, 10)
+    assert middleware._match(Request('https://oauth.reddit.com/r/stocks/new.json')) is None
+
+    headers = Headers({'X-Ratelimit-Remaining': '598.0', 'X-Ratelimit-Reset': '120'})
+    assert middleware._quota_from_headers(headers, NOW) == (598.0, NOW + 120)
+    headers = Headers({'X-Ratelimit-Remaining': '0', 'X-Ratelimit-Reset': str(int(NOW) + 300)})
+    assert middleware._quota_from_headers(headers, NOW) == (0.0, NOW + 300)
+    assert middleware._quota_from_headers(Headers({'X-Ratelimit-Remaining': '5'}), NOW) is None
+    assert middleware._quota_from_headers(
+        Headers({'X-Ratelimit-Remaining': 'x', 'X-Ratelimit-Reset': '1'}), NOW) is None
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
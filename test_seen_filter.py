@@ -0,0 +1,153 @@
+"""
+SeenFilter 테스트
+
+세대(generation)로 나눈 Bloom filter가 키를 기억하고, 세대를 넘기고, 오래된 세대를
+삭제하는지 확인합니다. 시계는 가짜 시계로 바꿔 실제로 기다리지 않습니다.
+
+사용법:
+    python -m pytest test_seen_filter.py
+    python test_seen_filter.py
+"""
+
+import os
+import sys
+import io
+import glob
+import tempfile
+from unittest import mock
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# Scrapy 프로젝트 모듈 import
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stock_tech_trends'))
+from stock_tech_trends.seen_filter import SeenFilter
+
+
+class FakeClock:
+    """time.time 대신 쓰는 시계 (advance로 시간을 옮김)"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_filter(directory, **kwargs):
+    kwargs.setdefault('ttl', 400)
+    kwargs.setdefault('generations', 4)
+    kwargs.setdefault('capacity', 1000)
+    return SeenFilter('test', directory=directory, **kwargs)
+
+
+def test_remembers_keys_across_reopen():
+    """추가한 키는 파일을 다시 열어도 남아 있음"""
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as directory, mock.patch('time.time', clock):
+        seen = make_filter(directory)
+        seen.add('reddit_abc')
+        assert 'reddit_abc' in seen
+        assert 'reddit_xyz' not in seen
+        seen.close()
+
+        seen = make_filter(directory)
+        assert 'reddit_abc' in seen
+        seen.close()
+
+
+def test_starts_new_generation_after_generation_seconds():
+    """세대 길이(ttl / generations)가 지나면 새 세대 파일에 씀"""
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as directory, mock.patch('time.time', clock):
+        seen = make_filter(directory)
+        seen.add('a')
+        clock.advance(50)
+        seen.add('b')
+        assert len(seen.generations) == 1
+
+        clock.advance(60)
+        seen.add('c')
+        assert len(seen.generations) == 2
+        assert len(glob.glob(os.path.join(directory, '*.bloom'))) == 2
+        assert all(key in seen for key in ('a', 'b', 'c'))
+        seen.close()
+
+
+def test_starts_new_generation_when_capacity_is_reached():
+    """세대가 capacity개를 채우면 세대 길이와 상관없이 새 세대를 시작"""
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as directory, mock.patch('time.time', clock):
+        seen = make_filter(directory, capacity=3)
+        for key in ('a', 'b', 'c', 'd'):
+            seen.add(key)
+        assert len(seen.generations) == 2
+        seen.close()
+
+
+def test_expired_generations_are_deleted():
+    """생성 후 (세대 길이 + ttl)이 지난 세대는 다음 세대를 만들 때 삭제"""
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as directory, mock.patch('time.time', clock):
+        seen = make_filter(directory)
+        seen.add('old')
+        clock.advance(400 + 100 + 1)
+        seen.add('new')
+
+        assert 'old' not in seen
+        assert 'new' in seen
+        assert len(seen.generations) == 1
+        assert len(glob.glob(os.path.join(directory, '*.bloom'))) == 1
+        seen.close()
+
+
+def test_keys_are_remembered_for_at_least_ttl():
+    """ttl이 지나기 전에는 세대가 바뀌어도 키를 기억"""
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as directory, mock.patch('time.time', clock):
+        seen = make_filter(directory)
+        seen.add('key')
+        for _ in range(3):
+            clock.advance(130)
+            seen.add(f"filler-{clock.now}")
+        assert clock.now - 1_700_000_000.0 == 390
+        assert 'key' in seen
+        seen.close()
+
+
+def test_default_ttl_spans_scheduled_runs():
+    """기본 DEDUPE_TTL은 30분/1시간 주기 실행 사이에도 키를 기억하고, 지나면 조회만 해도 잊음"""
+    from stock_tech_trends import settings
+
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as directory, mock.patch('time.time', clock):
+        seen = make_filter(directory, ttl=settings.DEDUPE_TTL, generations=settings.DEDUPE_GENERATIONS)
+        seen.add('reddit_abc')
+        clock.advance(3600)
+        assert 'reddit_abc' in seen
+
+        # add 없이 조회만 해도 만료된 세대는 제외
+        clock.advance(settings.DEDUPE_TTL + settings.DEDUPE_TTL // settings.DEDUPE_GENERATIONS)
+        assert 'reddit_abc' not in seen
+        seen.close()
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
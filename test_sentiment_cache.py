@@ -0,0 +1,134 @@
+"""
+SentimentCache 테스트
+
+메모리 LRU/SQLite tier의 hit, 삭제(eviction), 반환값 복사, 마지막 사용 시각 기록을 확인합니다.
+
+사용법:
+    python -m pytest test_sentiment_cache.py
+    python test_sentiment_cache.py
+"""
+
+import os
+import sys
+import io
+import copy
+import tempfile
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from utils.sentiment_cache import SentimentCache, cache_key
+
+SCORES = {'sentiment': 'positive', 'final_score': {'compound': 0.8}, 'keywords_found': ['growth']}
+
+
+def test_cache_key_ignores_whitespace_only():
+    """공백만 다른 텍스트는 같은 키, 대소문자가 다르면 다른 키"""
+    assert cache_key('v1', 'Stock  goes\nup ') == cache_key('v1', 'Stock goes up')
+    assert cache_key('v1', 'Stock goes up') != cache_key('v1', 'stock goes up')
+    assert cache_key('v1', 'Stock goes up') != cache_key('v2', 'Stock goes up')
+
+
+def test_memory_hits_and_lru_eviction():
+    """메모리 tier는 memory_size개를 넘으면 가장 오래 안 쓴 항목부터 삭제"""
+    cache = SentimentCache(memory_size=2)
+    cache.set('a', {'n': 1})
+    cache.set('b', {'n': 2})
+    assert cache.get('a') == {'n': 1}
+    cache.set('c', {'n': 3})
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'n': 1}
+    assert cache.get('c') == {'n': 3}
+    assert cache.counters['memory_hits'] == 3
+    assert cache.counters['memory_evictions'] == 1
+    assert cache.counters['misses'] == 1
+
+
+def test_returned_values_are_independent_copies():
+    """반환값을 (중첩 dict까지) 고쳐도 캐시 값은 그대로"""
+    cache = SentimentCache(memory_size=10)
+    value = copy.deepcopy(SCORES)
+    cache.set('k', value)
+    value['final_score']['compound'] = 0.0
+
+    first = cache.get('k')
+    first['final_score']['compound'] = -1.0
+    first['keywords_found'].append('crash')
+    assert cache.get('k') == SCORES
+
+
+def test_disk_tier_survives_reopen():
+    """SQLite tier 값은 새 인스턴스에서도 disk hit로 읽힘"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.sqlite')
+        cache = SentimentCache(memory_size=10, path=path)
+        cache.set('k', SCORES)
+        cache.close()
+
+        cache = SentimentCache(memory_size=10, path=path)
+        assert cache.get('k') == SCORES
+        assert cache.get('k') == SCORES
+        assert cache.counters['disk_hits'] == 1
+        assert cache.counters['memory_hits'] == 1
+        cache.close()
+
+
+def test_disk_eviction_keeps_recently_used_entries():
+    """max_bytes를 넘으면 최근에 읽은 항목은 남기고 오래 안 쓴 항목부터 삭제"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.sqlite')
+        value = {'text': 'x' * 100}
+        cache = SentimentCache(memory_size=0, path=path, max_bytes=450)
+        for key in ('a', 'b', 'c', 'd'):
+            cache.set(key, value)
+        # a를 읽어 마지막 사용 시각을 갱신 (eviction 전에 기록됨)
+        assert cache.get('a') == value
+        cache.set('e', value)
+
+        assert cache.counters['disk_evictions'] >= 1
+        assert cache.disk_bytes <= 450 * 0.9
+        assert cache.get('a') == value
+        assert cache.get('b') is None
+        cache.close()
+
+
+def test_disk_hits_batch_access_time_writes():
+    """disk hit의 마지막 사용 시각은 touch_batch개가 모이거나 close할 때 기록"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.sqlite')
+        cache = SentimentCache(memory_size=0, path=path, touch_batch=3)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, {'key': key})
+        before = dict(cache.db.execute("SELECT key, accessed FROM sentiment_cache"))
+
+        cache.get('a')
+        cache.get('b')
+        assert len(cache.touched) == 2
+        assert dict(cache.db.execute("SELECT key, accessed FROM sentiment_cache")) == before
+
+        cache.get('c')
+        assert not cache.touched
+        after = dict(cache.db.execute("SELECT key, accessed FROM sentiment_cache"))
+        assert all(after[key] >= before[key] for key in before)
+
+        cache.get('a')
+        cache.close()
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
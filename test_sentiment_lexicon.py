@@ -0,0 +1,82 @@
+"""
+CompiledLexicon 테스트
+
+감성 사전의 한 단어 용어 조회와 여러 단어 용어 트라이의 최장 일치를 확인합니다.
+
+사용법:
+    python -m pytest test_sentiment_lexicon.py
+    python test_sentiment_lexicon.py
+"""
+
+import sys
+import io
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from sentiment_analysis.sentiment_analyzer import CompiledLexicon
+
+LEXICON = CompiledLexicon({
+    'positive': ['growth', 'machine learning', 'machine learning model', 'cutting-edge'],
+    'negative': ['crash', 'learning curve', 'growth'],
+    'tech': ['machine', 'learning', 'model'],
+})
+
+
+def test_single_words_match_with_all_categories():
+    """한 단어 용어는 속한 카테고리를 모두 돌려줌"""
+    assert LEXICON.match(['strong', 'growth']) == [('growth', frozenset({'positive', 'negative'}))]
+    assert LEXICON.match(['crash']) == [('crash', frozenset({'negative'}))]
+    assert LEXICON.match(['nothing', 'here']) == []
+
+
+def test_longest_phrase_wins():
+    """여러 단어 용어는 가장 긴 용어 하나로 매칭하고 안쪽 단어는 따로 세지 않음"""
+    assert LEXICON.match('new machine learning model released'.split()) == [
+        ('machine learning model', frozenset({'positive'})),
+    ]
+    assert LEXICON.match('machine learning rocks'.split()) == [
+        ('machine learning', frozenset({'positive'})),
+    ]
+
+
+def test_partial_phrase_falls_back_to_words():
+    """용어를 끝까지 잇지 못하면 단어 단위로 매칭"""
+    assert LEXICON.match(['machine', 'model']) == [
+        ('machine', frozenset({'tech'})),
+        ('model', frozenset({'tech'})),
+    ]
+    # 문장 끝에서 잘린 용어
+    assert LEXICON.match(['machine']) == [('machine', frozenset({'tech'}))]
+
+
+def test_matching_resumes_after_phrase():
+    """용어가 끝난 다음 토큰부터 다시 매칭 ('learning curve'와 겹치지 않음)"""
+    assert LEXICON.match('machine learning curve crash'.split()) == [
+        ('machine learning', frozenset({'positive'})),
+        ('crash', frozenset({'negative'})),
+    ]
+
+
+def test_punctuated_terms_are_tokenized_like_preprocessing():
+    """'cutting-edge'처럼 특수 문자가 있는 용어는 공백으로 나눈 토큰으로 매칭"""
+    assert LEXICON.match(['cutting', 'edge', 'tech']) == [('cutting edge', frozenset({'positive'}))]
+    assert LEXICON.max_phrase_length == 3
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+텍스트 정규화 테스트
+
+HTML 엔티티 복원, 태그/URL/zero-width 문자 제거, 토큰 위치(offset)를 확인합니다.
+
+사용법:
+    python -m pytest test_text_normalizer.py
+    python test_text_normalizer.py
+"""
+
+import sys
+import io
+
+# Windows에서 UTF-8 출력 설정
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from utils.text_normalizer import normalize_text, token_words, token_text, aligned_lower
+
+
+def test_empty_text():
+    """빈 텍스트와 None은 빈 결과 (호출마다 새 토큰 리스트)"""
+    first = normalize_text(None)
+    assert first == {'text': '', 'lower': '', 'tokens': []}
+    first['tokens'].append((0, 1))
+    assert normalize_text('')['tokens'] == []
+
+
+def test_double_escaped_entities_are_unescaped():
+    """Reddit처럼 두 번 escape된 엔티티도 원래 문자로 복원"""
+    assert normalize_text('AT&amp;amp;T &amp;gt; VZ')['text'] == 'AT&T > VZ'
+    assert normalize_text('&amp;#x200B;Hello')['text'] == 'Hello'
+    assert normalize_text('Q&amp;A')['text'] == 'Q&A'
+
+
+def test_markup_urls_and_whitespace_are_removed():
+    """태그와 URL은 공백으로 바꾸고 공백을 하나로 정리"""
+    result = normalize_text('<p>Buy <b>$TSLA</b></p>\n\nsee https://example.com/a?b=1  now')
+    assert result['text'] == 'Buy $TSLA see now'
+    assert result['lower'] == 'buy $tsla see now'
+
+
+def test_escaped_markup_is_removed_after_unescape():
+    """엔티티로 escape된 태그도 복원한 뒤 제거"""
+    assert normalize_text('&lt;div&gt;NVDA up&lt;/div&gt;')['text'] == 'NVDA up'
+
+
+def test_token_offsets_point_into_lower():
+    """tokens는 lower 안의 단어 위치이고 문장 부호는 토큰이 아님"""
+    result = normalize_text("Apple's AI-chip, up 5%!")
+    assert result['lower'] == "apple's ai-chip, up 5%!"
+    assert [result['lower'][start:end] for start, end in result['tokens']] == \
+        ['apple', 's', 'ai', 'chip', 'up', '5']
+    assert token_words(result) == ['apple', 's', 'ai', 'chip', 'up', '5']
+    assert token_words(result, preserve_case=True) == ['Apple', 's', 'AI', 'chip', 'up', '5']
+    assert token_text(result, preserve_case=True) == 'Apple s AI chip up 5'
+
+
+def test_case_preserving_tokens_when_lowercase_changes_length():
+    """소문자 변환으로 길이가 바뀌면 offset 대신 원문을 다시 토큰화"""
+    result = normalize_text('İSTANBUL Borsa')
+    assert len(result['lower']) != len(result['text'])
+    assert aligned_lower(result) is None
+    assert token_words(result, preserve_case=True) == ['İSTANBUL', 'Borsa']
+    assert aligned_lower(normalize_text('Borsa')) == 'borsa'
+
+
+def main():
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,12 @@ import re
 import requests
 from urllib.parse import urlparse, urljoin
 import time
+import sys
+
+# utils 모듈 경로 추가 (스크립트로 직접 실행할 때도 동작하도록)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.keyword_matcher import get_keyword_matcher
+from utils.text_normalizer import normalize_text, token_text
 
 def setup_logging(log_level: str = 'INFO', log_file: str = None):
     """로깅 설정"""
@@ -62,37 +68,18 @@ def generate_unique_id(text: str) -> str:
     return hashlib.md5(text.encode('utf-8')).hexdigest()
 
 def clean_text(text: str) -> str:
-    """텍스트 정리"""
+    """텍스트 정리 (HTML/URL/특수 문자 제거, 대소문자 유지)"""
     if not text:
         return ""
     
-    # HTML 태그 제거
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # URL 제거
-    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-    
-    # 특수 문자 정리
-    text = re.sub(r'[^\w\s]', ' ', text)
-    
-    # 연속된 공백 제거
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    return token_text(normalize_text(text), preserve_case=True)
 
 def extract_keywords(text: str, keyword_list: List[str]) -> List[str]:
-    """텍스트에서 키워드 추출"""
+    """텍스트에서 키워드 추출 (단어 경계 기준, 복수형 허용)"""
     if not text:
         return []
     
-    text_lower = text.lower()
-    found_keywords = []
-    
-    for keyword in keyword_list:
-        if keyword.lower() in text_lower:
-            found_keywords.append(keyword)
-    
-    return found_keywords
+    return get_keyword_matcher(tuple(keyword_list)).match(text.lower()).tech
 
 def is_valid_url(url: str) -> bool:
     """URL 유효성 검사"""
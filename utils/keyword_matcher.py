@@ -0,0 +1,103 @@
+"""
+키워드 관련성 매처
+
+TECH_KEYWORDS, STOCK_KEYWORDS, BLOCKED_KEYWORDS를 스파이더가 열릴 때 하나의 정규식으로
+컴파일하고, 글마다 소문자 텍스트를 한 번만 훑어 금지/기술/주식 키워드를 함께 찾습니다.
+
+- 키워드는 단어 경계에서만 매칭합니다 ('AI'는 'said', 'AR'은 'hardware'에 매칭되지 않음)
+- 복수형 어미(s/es)는 허용합니다 ('stock' -> 'stocks')
+- 'big data science'처럼 겹치는 키워드도 모두 찾습니다 (같은 위치에서는 가장 긴 키워드)
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+CATEGORIES = ('blocked', 'tech', 'stock')
+
+
+class KeywordMatches(NamedTuple):
+    """카테고리별로 찾은 키워드 (설정에 적힌 표기, 텍스트에 처음 나온 순서)"""
+    blocked: List[str]
+    tech: List[str]
+    stock: List[str]
+
+    @property
+    def relevant(self) -> bool:
+        """기술 또는 주식 키워드가 있는지 여부"""
+        return bool(self.tech or self.stock)
+
+    @property
+    def keywords(self) -> List[str]:
+        """기술 + 주식 키워드 (tech_keywords 필드 값)"""
+        return self.tech + [keyword for keyword in self.stock if keyword not in self.tech]
+
+
+def _compile_pattern(keywords: Iterable[str]) -> re.Pattern:
+    """
+    키워드를 단어 경계 + 복수형 어미를 허용하는 하나의 정규식으로 컴파일
+
+    첫 글자별로 묶고(분기 시도 감소), 묶음 안에서는 긴 키워드부터 시도합니다. 전체를
+    lookahead로 감싸 매칭이 글자를 소비하지 않으므로 겹치는 키워드도 찾습니다.
+    """
+    groups = {}
+    for keyword in sorted(keywords, key=len, reverse=True):
+        groups.setdefault(keyword[0], []).append(re.escape(keyword[1:]))
+
+    alternatives = '|'.join(
+        f"{re.escape(first)}(?:{'|'.join(rests)})" for first, rests in groups.items()
+    )
+    return re.compile(rf"(?<!\w)(?=({alternatives})(?:e?s)?(?!\w))")
+
+
+class KeywordMatcher:
+    """
+    금지/기술/주식 키워드를 한 번에 찾는 매처
+
+    match()에는 소문자 텍스트(normalized_text['lower'])를 넘깁니다.
+    """
+
+    def __init__(self, tech_keywords: Iterable[str] = (), stock_keywords: Iterable[str] = (),
+                 blocked_keywords: Iterable[str] = ()):
+        # 소문자 키워드 -> [(카테고리 순번, 설정 표기)]
+        self.lookup: Dict[str, List[Tuple[int, str]]] = {}
+        for index, keywords in enumerate((blocked_keywords, tech_keywords, stock_keywords)):
+            for keyword in keywords:
+                key = keyword.lower().strip()
+                if key:
+                    self.lookup.setdefault(key, []).append((index, keyword))
+
+        self.pattern = _compile_pattern(self.lookup) if self.lookup else None
+
+    @classmethod
+    def from_settings(cls, settings) -> 'KeywordMatcher':
+        return cls(
+            tech_keywords=settings.getlist('TECH_KEYWORDS'),
+            stock_keywords=settings.getlist('STOCK_KEYWORDS'),
+            blocked_keywords=settings.getlist('BLOCKED_KEYWORDS')
+        )
+
+    def match(self, text_lower: str) -> KeywordMatches:
+        """소문자 텍스트에서 카테고리별 키워드 찾기"""
+        found = ([], [], [])
+        if not text_lower or self.pattern is None:
+            return KeywordMatches(*found)
+
+        seen = set()
+        for match in self.pattern.finditer(text_lower):
+            key = match.group(1)
+            if key in seen:
+                continue
+            seen.add(key)
+            for index, keyword in self.lookup[key]:
+                if keyword not in found[index]:
+                    found[index].append(keyword)
+
+        return KeywordMatches(*found)
+
+
+@lru_cache(maxsize=32)
+def get_keyword_matcher(tech_keywords: Tuple[str, ...] = (), stock_keywords: Tuple[str, ...] = (),
+                        blocked_keywords: Tuple[str, ...] = ()) -> KeywordMatcher:
+    """같은 키워드 목록의 매처를 재사용 (목록은 tuple로 전달)"""
+    return KeywordMatcher(tech_keywords, stock_keywords, blocked_keywords)
@@ -0,0 +1,226 @@
+"""
+감성 분석 결과 캐시
+
+같은 글이 매시간 다시 수집될 때 VADER/TextBlob을 다시 돌리지 않도록, 분석 결과를
+(분석기 버전, 정규화한 텍스트의 해시) 키로 저장합니다.
+
+- 메모리 tier: 프로세스 안의 LRU (memory_size개)
+- 디스크 tier (선택): SQLite 파일 하나, 값 크기 합이 max_bytes를 넘으면 오래 안 쓴 것부터 삭제
+
+분석기 버전(namespace)이 키에 들어가므로 분석 로직이나 가중치를 바꾸면 버전 문자열만
+올리면 됩니다. 이전 결과는 쓰이지 않다가 크기 제한에 걸려 지워집니다.
+
+두 tier 모두 값을 JSON 문자열로 저장하고 get마다 새 dict를 만들어 돌려주므로, 호출한 쪽이
+결과(중첩 dict 포함)를 고쳐도 캐시에 남은 값은 바뀌지 않습니다.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def cache_key_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (공백만 정리, VADER가 대소문자를 보므로 소문자 변환은 하지 않음)"""
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def cache_key(namespace: str, text: str) -> str:
+    """분석기 버전과 정규화한 텍스트로 캐시 키 생성"""
+    digest = hashlib.blake2b(cache_key_text(text).encode('utf-8'), digest_size=16).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class SentimentCache:
+    """
+    2단계 (메모리 LRU + SQLite) 감성 분석 결과 캐시
+
+    값은 JSON으로 직렬화할 수 있는 dict여야 합니다. 조회/추가는 여러 스레드에서 호출해도
+    됩니다. 디스크 hit의 마지막 사용 시각은 touch_batch개씩 모아서 기록합니다 (삭제 순서에만
+    쓰이므로 조회마다 커밋하지 않음). hit/miss/eviction 횟수는 counters에 쌓이고, stats(Scrapy StatsCollector처럼
+    inc_value를 가진 객체)를 주면 같은 값이 "sentiment_cache/..." 키로 함께 기록됩니다.
+    """
+
+    def __init__(self, memory_size=10000, path=None, max_bytes=64 * 1024 * 1024, stats=None,
+                 touch_batch=256):
+        self.memory_size = max(0, memory_size)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = stats
+        self.counters = Counter()
+        self.touch_batch = max(1, touch_batch)
+        # 디스크 hit로 마지막 사용 시각을 갱신할 키 -> 시각
+        self.touched = {}
+
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.db = None
+        self.disk_bytes = 0
+        if path:
+            self._open_disk(path)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시된 결과 반환 (없으면 None)"""
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                self._inc('memory_hits')
+                return json.loads(data)
+
+            if self.db is not None:
+                row = self.db.execute("SELECT value FROM sentiment_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self.touched[key] = time.time()
+                    if len(self.touched) >= self.touch_batch:
+                        self._flush_touched()
+                    self._remember(key, row[0])
+                    self._inc('disk_hits')
+                    return json.loads(row[0])
+
+            self._inc('misses')
+            return None
+
+    def set(self, key: str, value: Dict):
+        """결과 저장 (메모리와 디스크 모두)"""
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        with self.lock:
+            self._remember(key, data)
+
+            if self.db is not None:
+                self.touched.pop(key, None)
+                self.db.execute("INSERT OR REPLACE INTO sentiment_cache (key, value, accessed) VALUES (?, ?, ?)",
+                                (key, data, time.time()))
+                self.db.commit()
+                self.disk_bytes += len(data)
+                if self.disk_bytes > self.max_bytes:
+                    self._evict_disk()
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self._flush_touched()
+                self.db.close()
+                self.db = None
+
+    def _remember(self, key, data):
+        """메모리 LRU에 (JSON 문자열로) 추가하고 넘치면 가장 오래 안 쓴 항목 삭제"""
+        if not self.memory_size:
+            return
+        self.memory[key] = data
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+            self._inc('memory_evictions')
+
+    def _open_disk(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 여러 프로세스(크롤러, Celery 작업)가 같은 파일을 쓸 수 있으므로 WAL + 잠금 대기
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS sentiment_cache_accessed ON sentiment_cache (accessed)")
+        self.db.commit()
+        self.disk_bytes = self._measure_disk()
+
+    def _flush_touched(self):
+        """모아 둔 디스크 hit의 마지막 사용 시각 기록"""
+        if not self.touched:
+            return
+        touched, self.touched = self.touched, {}
+        self.db.executemany("UPDATE sentiment_cache SET accessed = ? WHERE key = ?",
+                            [(accessed, key) for key, accessed in touched.items()])
+        self.db.commit()
+
+    def _measure_disk(self) -> int:
+        return self.db.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM sentiment_cache").fetchone()[0]
+
+    def _evict_disk(self):
+        """디스크 값 크기 합이 max_bytes의 90% 아래로 내려갈 때까지 오래 안 쓴 항목 삭제"""
+        # 최근 hit를 먼저 기록하고, 다른 프로세스가 쓴 양까지 반영
+        self._flush_touched()
+        self.disk_bytes = self._measure_disk()
+        target = int(self.max_bytes * 0.9)
+        if self.disk_bytes <= target:
+            return
+
+        evicted = []
+        excess = self.disk_bytes - target
+        for key, size in self.db.execute("SELECT key, LENGTH(value) FROM sentiment_cache ORDER BY accessed"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self.db.executemany("DELETE FROM sentiment_cache WHERE key = ?", evicted)
+        self.db.commit()
+        self.disk_bytes = self._measure_disk()
+        self._inc('disk_evictions', len(evicted))
+        logger.debug(f"Evicted {len(evicted)} sentiment cache entries from {self.path}")
+
+    def _inc(self, key, count=1):
+        self.counters[key] += count
+        if self.stats is not None and count:
+            self.stats.inc_value(f"sentiment_cache/{key}", count)
+
+
+# 경로별로 하나씩 공유하는 캐시 (파이프라인과 분석기가 같은 인스턴스를 씀)
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_sentiment_cache(memory_size=10000, path=None, max_bytes=64 * 1024 * 1024) -> SentimentCache:
+    """
+    프로세스 안에서 공유하는 캐시 반환
+
+    같은 path로 처음 호출할 때 만들어진 인스턴스를 돌려주므로, 두 번째 호출부터는
+    memory_size와 max_bytes가 무시됩니다.
+    """
+    with _shared_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = _shared_caches[path] = SentimentCache(memory_size, path, max_bytes)
+        return cache
+
+
+# Scrapy 프로젝트 데이터 디렉터리 (크롤러가 상대 경로 SENTIMENT_CACHE_PATH를 두는 곳)
+SCRAPY_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'stock_tech_trends', '.scrapy')
+
+
+def get_default_cache() -> SentimentCache:
+    """
+    크롤러의 SentimentAnalysisPipeline과 같은 SENTIMENT_CACHE_* 환경 변수로 공유 캐시 반환
+
+    상대 경로는 Scrapy 프로젝트의 .scrapy 아래로 풀어서, 같은 프로세스에서는 파이프라인과
+    같은 인스턴스를, 다른 프로세스에서는 같은 SQLite 파일을 씁니다.
+    """
+    path = os.getenv('SENTIMENT_CACHE_PATH', 'sentiment_cache.sqlite')
+    if path and not os.path.isabs(path):
+        path = os.path.join(SCRAPY_DATA_DIR, path)
+    return get_sentiment_cache(
+        memory_size=int(os.getenv('SENTIMENT_CACHE_SIZE', 10000)),
+        path=path or None,
+        max_bytes=int(os.getenv('SENTIMENT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    )
@@ -0,0 +1,157 @@
+"""
+단계별(tiered) 감성 분석 정책
+
+모든 텍스트를 먼저 VADER 사전만 훑는 빠른 점수(fast tier)로 계산하고, 결과를 믿기 어려운
+텍스트만 VADER 규칙 + TextBlob 전체 분석(full tier)으로 넘깁니다. 넘기는 경우는 다음과 같습니다.
+
+- near_neutral: compound가 중립 경계(±0.05)에서 neutral_margin 안쪽
+- disagree: 사전 valence 합과 긍정/부정 단어 수 다수결의 방향이 다름
+  (추가 모델 점수를 주면 그 점수와 방향이 반대인 경우도 포함)
+- rules: "least", "kind of" 처럼 빠른 점수가 흉내 내지 않는 VADER 규칙이 적용될 수 있음
+
+budget은 full tier로 넘길 수 있는 텍스트 비율의 상한입니다. 넘으면 빠른 점수를 그대로 씁니다.
+"""
+
+import string
+from collections import Counter
+from typing import Dict, Optional
+
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, NEGATE, N_SCALAR, normalize
+
+# VADER 분류 경계
+NEUTRAL_THRESHOLD = 0.05
+
+# 빠른 점수가 흉내 내지 않는 VADER 규칙을 발동시키는 토큰 ("least", "kind of")
+RULE_TOKENS = frozenset({'least', 'kind'})
+
+_NEGATIONS = frozenset(NEGATE)
+# 앞 단어와의 거리(1~3)에 따른 강조어 감쇠 (VADER와 같은 값)
+_BOOSTER_DECAY = (1.0, 0.95, 0.9)
+_PUNCTUATION = string.punctuation
+
+
+def fast_lexicon_score(lexicon: Dict[str, float], text: str) -> Dict:
+    """
+    VADER 사전 valence 합으로 계산한 빠른 감성 점수
+
+    lexicon은 SentimentIntensityAnalyzer().lexicon 입니다. VADER 규칙 중 앞 3단어의
+    부정어/강조어와 "but" 앞뒤 가중치만 반영하고, 대문자/느낌표 강조와 관용구는 무시합니다.
+    반환값의 compound/positive/neutral/negative는 VADER와 같은 방식으로 정규화되고,
+    positive_words/negative_words/has_rule_tokens는 정책 판단에 쓰입니다.
+    """
+    words = []
+    for token in text.lower().split():
+        words.append(token if token in lexicon else token.strip(_PUNCTUATION))
+
+    sentiments = []
+    has_rule_tokens = False
+    for i, word in enumerate(words):
+        if word in RULE_TOKENS:
+            has_rule_tokens = True
+
+        valence = lexicon.get(word, 0.0)
+        if valence:
+            for distance, previous in enumerate(reversed(words[max(0, i - 3):i])):
+                boost = BOOSTER_DICT.get(previous)
+                if boost:
+                    valence += (boost if valence > 0 else -boost) * _BOOSTER_DECAY[distance]
+                if previous in _NEGATIONS or previous.endswith("n't"):
+                    valence *= N_SCALAR
+        sentiments.append(valence)
+
+    # "but" 앞은 절반, 뒤는 1.5배
+    if 'but' in words:
+        but_index = words.index('but')
+        sentiments = [valence * 0.5 if i < but_index else valence * 1.5 if i > but_index else valence
+                      for i, valence in enumerate(sentiments)]
+
+    positive_sum = sum(valence + 1 for valence in sentiments if valence > 0)
+    negative_sum = sum(valence - 1 for valence in sentiments if valence < 0)
+    positive_words = sum(1 for valence in sentiments if valence > 0)
+    negative_words = sum(1 for valence in sentiments if valence < 0)
+    neutral_words = len(sentiments) - positive_words - negative_words
+    total = sum(sentiments)
+
+    denominator = positive_sum + abs(negative_sum) + neutral_words
+    if denominator:
+        positive, negative, neutral = positive_sum / denominator, abs(negative_sum) / denominator, neutral_words / denominator
+    else:
+        positive, negative, neutral = 0.0, 0.0, 1.0
+
+    return {
+        'compound': round(normalize(total), 4) if total else 0.0,
+        'positive': round(positive, 3),
+        'neutral': round(neutral, 3),
+        'negative': round(negative, 3),
+        'positive_words': positive_words,
+        'negative_words': negative_words,
+        'has_rule_tokens': has_rule_tokens
+    }
+
+
+def _direction(score: float) -> int:
+    if score >= NEUTRAL_THRESHOLD:
+        return 1
+    if score <= -NEUTRAL_THRESHOLD:
+        return -1
+    return 0
+
+
+class TierPolicy:
+    """
+    빠른 점수를 full tier로 넘길지 결정하는 정책
+
+    mode가 'full'이면 항상 full tier, 'tiered'면 위 조건에 따라 결정합니다.
+    결정 결과는 counters에 쌓입니다 (fast, full, escalated_<이유>, budget_exhausted).
+    budget은 이 인스턴스가 결정한 텍스트 수 기준이므로 프로세스마다 정책을 만들면 프로세스별로 적용됩니다.
+    """
+
+    def __init__(self, mode='full', neutral_margin=0.15, budget=1.0, escalate_on_rules=True):
+        if mode not in ('full', 'tiered'):
+            raise ValueError(f"Unknown sentiment tier mode: {mode}")
+        self.mode = mode
+        self.neutral_margin = neutral_margin
+        self.budget = budget
+        self.escalate_on_rules = escalate_on_rules
+        self.counters = Counter()
+
+    @property
+    def tiered(self) -> bool:
+        return self.mode == 'tiered'
+
+    def escalation_reason(self, fast: Dict, other_score: Optional[float] = None) -> Optional[str]:
+        """full tier로 넘겨야 하는 이유 (넘기지 않아도 되면 None)"""
+        compound = fast['compound']
+        words = fast['positive_words'] + fast['negative_words']
+
+        if self.escalate_on_rules and fast['has_rule_tokens'] and (words or compound):
+            return 'rules'
+        if words and abs(abs(compound) - NEUTRAL_THRESHOLD) < self.neutral_margin:
+            return 'near_neutral'
+
+        votes = fast['positive_words'] - fast['negative_words']
+        if votes and (votes > 0) != (compound > 0):
+            return 'disagree'
+        if other_score is not None and _direction(other_score) * _direction(compound) < 0:
+            return 'disagree'
+        return None
+
+    def decide(self, fast: Dict, other_score: Optional[float] = None) -> bool:
+        """full tier로 넘기면 True (budget을 넘으면 빠른 점수 사용)"""
+        if not self.tiered:
+            self.counters['full'] += 1
+            return True
+
+        reason = self.escalation_reason(fast, other_score)
+        total = self.counters['fast'] + self.counters['full']
+        if reason is not None and self.counters['full'] >= self.budget * (total + 1):
+            self.counters['budget_exhausted'] += 1
+            reason = None
+
+        if reason is None:
+            self.counters['fast'] += 1
+            return False
+
+        self.counters[f"escalated_{reason}"] += 1
+        self.counters['full'] += 1
+        return True
@@ -3,8 +3,12 @@
 Reddit 포스트에서 주식 티커 심볼을 감지하고 추출합니다.
 """
 
+import os
 import re
-from typing import List, Set, Dict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Set, Dict, Optional, Iterable, Iterator
 
 class StockTickerExtractor:
     """주식 티커 심볼을 추출하는 클래스"""
@@ -58,6 +62,18 @@ class StockTickerExtractor:
         'ID', 'CEO', 'CTO', 'CFO', 'USA', 'UK', 'EU', 'API', 'CPU', 'GPU',
     }
     
+    # 티커 주변에서 확인할 주식 관련 키워드
+    STOCK_CONTEXT_KEYWORDS = (
+        'stock', 'share', 'buy', 'sell', 'price', 'trade', 'invest',
+        'bull', 'bear', 'call', 'put', 'option', 'equity', 'market',
+        'portfolio', 'holding', 'position', 'long', 'short', 'dip',
+        'moon', 'rocket', 'yolo', 'gain', 'loss', 'profit', 'revenue',
+        'earnings', 'valuation', 'ipo', 'dividend', 'ticker'
+    )
+    
+    # 문맥으로 확인할 티커 앞뒤 글자 수
+    CONTEXT_WINDOW = 100
+    
     def __init__(self, mode='aggressive'):
         """
         Args:
@@ -66,13 +82,22 @@ class StockTickerExtractor:
         self.mode = mode
         self.ticker_pattern = re.compile(r'\$([A-Z]{1,5})\b')  # $AAPL 형식
         self.word_pattern = re.compile(r'\b([A-Z]{2,5})\b')    # AAPL 형식 (대문자만)
+        
+        # word_pattern과 같은 단어를 찾는 빠른 후보 스캔용 패턴
+        # 단일 문자 집합([A-Z])으로 시작해야 정규식 엔진이 나머지 글자를 빠르게 건너뛰므로
+        # 앞쪽 \b는 빼고, 앞 글자 검사는 _is_word_start()에서 따로 합니다.
+        self.word_candidate_pattern = re.compile(r'[A-Z][A-Z]{1,4}\b')
+        
+        # 모든 문맥 키워드를 한 번에 찾는 컴파일된 패턴 (첫 글자별로 묶은 트라이 형태)
+        self.context_pattern = _compile_keyword_pattern(self.STOCK_CONTEXT_KEYWORDS)
     
-    def extract_tickers(self, text: str) -> List[str]:
+    def extract_tickers(self, text: str, lowered: Optional[str] = None) -> List[str]:
         """
         텍스트에서 주식 티커 심볼을 추출
         
         Args:
             text: 분석할 텍스트
+            lowered: 이미 계산한, 위치가 text와 같은 소문자 텍스트 (없으면 필요할 때 계산)
             
         Returns:
             추출된 티커 심볼 리스트
@@ -81,40 +106,33 @@ class StockTickerExtractor:
             return []
         
         tickers = set()
+        aggressive = self.mode == self.MODE_AGGRESSIVE
         
-        if self.mode == self.MODE_AGGRESSIVE:
-            # AGGRESSIVE 모드: 문맥만 확인하면 모든 티커 추출
-            
-            # $ 기호가 있는 티커는 무조건 추출 (가장 확실한 신호)
-            dollar_tickers = self.ticker_pattern.findall(text)
-            for ticker in dollar_tickers:
-                if ticker not in self.EXCLUDED_WORDS:
-                    tickers.add(ticker)
-            
-            # 대문자로만 이루어진 단어 중 주식 문맥에 있는 것 추출
-            words = self.word_pattern.findall(text)
-            for word in words:
-                if word not in self.EXCLUDED_WORDS:
-                    # 문맥 확인: 주식 관련 단어 근처에 있는지 확인
-                    if self._is_stock_context(text, word):
-                        tickers.add(word)
-        
-        else:  # STRICT 모드
-            # STRICT 모드: 알려진 티커만 추출 (기존 방식)
+        # $ 기호가 있는 티커 추출 (가장 확실한 신호)
+        # AGGRESSIVE: 모두 추출 / STRICT: 알려진 티커만
+        for ticker in self.ticker_pattern.findall(text):
+            if ticker not in self.EXCLUDED_WORDS and (aggressive or ticker in self.KNOWN_TICKERS):
+                tickers.add(ticker)
+        
+        # 대문자로만 이루어진 단어 중 주식 문맥에 있는 것 추출
+        # 문맥은 단어의 첫 등장 위치 기준이므로 같은 단어는 한 번만 확인
+        checked = set()
+        
+        for match in self.word_candidate_pattern.finditer(text):
+            word = match.group()
+            if word in checked or not _is_word_start(text, match.start()):
+                continue
+            checked.add(word)
             
-            # $ 기호가 있는 티커 추출
-            dollar_tickers = self.ticker_pattern.findall(text)
-            for ticker in dollar_tickers:
-                if ticker in self.KNOWN_TICKERS and ticker not in self.EXCLUDED_WORDS:
-                    tickers.add(ticker)
+            if word in tickers or word in self.EXCLUDED_WORDS:
+                continue
+            if not aggressive and word not in self.KNOWN_TICKERS:
+                continue
             
-            # 대문자로만 이루어진 단어 중 알려진 티커 추출
-            words = self.word_pattern.findall(text)
-            for word in words:
-                if word in self.KNOWN_TICKERS and word not in self.EXCLUDED_WORDS:
-                    # 문맥 확인
-                    if self._is_stock_context(text, word):
-                        tickers.add(word)
+            if lowered is None:
+                lowered = _lower_preserving_offsets(text)
+            if self._has_stock_context(text, lowered, word):
+                tickers.add(word)
         
         return sorted(list(tickers))
     
@@ -129,29 +147,35 @@ class StockTickerExtractor:
         Returns:
             주식 문맥 여부
         """
-        # 티커 위치 찾기
+        return self._has_stock_context(text, _lower_preserving_offsets(text), ticker)
+    
+    def _has_stock_context(self, text: str, lowered: Optional[str], ticker: str) -> bool:
+        """
+        _is_stock_context()의 본체
+        
+        소문자 텍스트를 한 번만 만들어 두고, 티커 앞뒤 구간 안에 키워드가
+        통째로 들어있는지를 컴파일된 패턴의 pos/endpos 검색으로 확인합니다.
+        
+        Args:
+            text: 전체 텍스트
+            lowered: 위치가 text와 같은 소문자 텍스트 (없으면 None)
+            ticker: 확인할 티커
+        """
+        # 티커 위치 찾기 (첫 등장 위치)
         ticker_pos = text.find(ticker)
         if ticker_pos == -1:
             return False
         
-        # 앞뒤 100자 추출
-        start = max(0, ticker_pos - 100)
-        end = min(len(text), ticker_pos + len(ticker) + 100)
-        context = text[start:end].lower()
-        
-        # 주식 관련 키워드
-        stock_keywords = [
-            'stock', 'share', 'buy', 'sell', 'price', 'trade', 'invest',
-            'bull', 'bear', 'call', 'put', 'option', 'equity', 'market',
-            'portfolio', 'holding', 'position', 'long', 'short', 'dip',
-            'moon', 'rocket', 'yolo', 'gain', 'loss', 'profit', 'revenue',
-            'earnings', 'valuation', 'ipo', 'dividend', 'ticker'
-        ]
+        # 앞뒤 100자 구간
+        start = max(0, ticker_pos - self.CONTEXT_WINDOW)
+        end = min(len(text), ticker_pos + len(ticker) + self.CONTEXT_WINDOW)
         
         # 주식 관련 키워드가 있으면 True
-        for keyword in stock_keywords:
-            if keyword in context:
+        if lowered is not None:
+            if self.context_pattern.search(lowered, start, end):
                 return True
+        elif self.context_pattern.search(text[start:end].lower()):
+            return True
         
         # $ 기호가 티커 앞에 있으면 True
         if ticker_pos > 0 and text[ticker_pos - 1] == '$':
@@ -219,21 +243,59 @@ class StockTickerExtractor:
         return 'Unknown/Startup'
 
 
+def _compile_keyword_pattern(keywords) -> re.Pattern:
+    """
+    키워드 목록을 하나의 정규식으로 컴파일
+    
+    첫 글자별로 묶어 'b(?:uy|ull|ear)' 형태로 만들면 단순 나열보다
+    정규식 엔진의 분기 시도가 줄어듭니다.
+    """
+    groups = {}
+    for keyword in keywords:
+        groups.setdefault(keyword[0], []).append(re.escape(keyword[1:]))
+    
+    return re.compile('|'.join(
+        f"{re.escape(first)}(?:{'|'.join(rests)})" for first, rests in groups.items()
+    ))
+
+
+def _is_word_start(text: str, pos: int) -> bool:
+    """pos 위치가 단어의 시작(앞 글자가 단어 문자가 아님)인지 확인"""
+    if pos == 0:
+        return True
+    prev = text[pos - 1]
+    return not (prev.isalnum() or prev == '_')
+
+
+def _lower_preserving_offsets(text: str) -> Optional[str]:
+    """
+    위치(offset)가 원문과 같은 소문자 텍스트 반환
+    
+    소문자 변환으로 길이가 바뀌는 문자(예: 'İ')가 있으면 위치가 어긋나므로 None을 반환하며,
+    이 경우 호출하는 쪽에서 구간별로 소문자 변환을 합니다.
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        return None
+    return lowered
+
+
 # 싱글톤 인스턴스 (기본값: aggressive 모드)
 _extractor = StockTickerExtractor(mode='aggressive')
 _extractor_strict = StockTickerExtractor(mode='strict')
 
-def extract_stock_tickers(text: str, mode='aggressive') -> List[str]:
+def extract_stock_tickers(text: str, mode='aggressive', lowered: Optional[str] = None) -> List[str]:
     """
     편의 함수: 텍스트에서 주식 티커 추출
     
     Args:
         text: 분석할 텍스트
         mode: 'aggressive' (모든 티커) 또는 'strict' (알려진 티커만)
+        lowered: 이미 계산한, 위치가 text와 같은 소문자 텍스트
     """
     if mode == 'strict':
-        return _extractor_strict.extract_tickers(text)
-    return _extractor.extract_tickers(text)
+        return _extractor_strict.extract_tickers(text, lowered)
+    return _extractor.extract_tickers(text, lowered)
 
 def extract_tickers_with_context(text: str, mode='aggressive') -> List[Dict[str, any]]:
     """
@@ -247,3 +309,78 @@ def extract_tickers_with_context(text: str, mode='aggressive') -> List[Dict[str,
         return _extractor_strict.extract_with_context(text)
     return _extractor.extract_with_context(text)
 
+
+def _extract_chunk(mode: str, texts: List[str]) -> List[str]:
+    """
+    워커 프로세스에서 실행되는 청크 단위 추출 함수
+    
+    프로세스 간 전송량을 줄이기 위해 텍스트별 결과를 공백으로 이은 문자열로 반환합니다.
+    """
+    extractor = _extractor_strict if mode == 'strict' else _extractor
+    return [' '.join(extractor.extract_tickers(text)) for text in texts]
+
+
+def extract_tickers_batch(texts: Iterable[str], mode='aggressive', workers: Optional[int] = None,
+                          chunksize: int = 500) -> Iterator[List[str]]:
+    """
+    대량의 텍스트에서 주식 티커를 여러 프로세스로 나눠 추출
+    
+    텍스트를 chunksize개씩 묶어 프로세스 풀로 보내고, 입력 순서대로 결과를 하나씩 돌려줍니다.
+    동시에 처리 중인 청크 수를 workers의 2배로 제한하므로 입력이 제너레이터여도
+    메모리 사용량이 일정합니다. 입력이 청크 하나 분량이거나 workers=1이면
+    프로세스 풀 없이 현재 프로세스에서 처리합니다.
+    
+    Args:
+        texts: 분석할 텍스트들 (리스트 또는 제너레이터)
+        mode: 'aggressive' (모든 티커) 또는 'strict' (알려진 티커만)
+        workers: 워커 프로세스 수 (기본값: CPU 코어 수)
+        chunksize: 한 번에 워커로 보낼 텍스트 수
+        
+    Yields:
+        텍스트별 티커 리스트 (입력 순서 유지)
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive: {chunksize}")
+    
+    workers = workers or os.cpu_count() or 1
+    chunks = _iter_chunks(texts, chunksize)
+    
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        return
+    
+    if workers == 1 or len(first_chunk) < chunksize:
+        # 단일 프로세스 처리
+        for chunk in _prepend(first_chunk, chunks):
+            for joined in _extract_chunk(mode, chunk):
+                yield joined.split()
+        return
+    
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _prepend(first_chunk, chunks):
+            pending.append(executor.submit(_extract_chunk, mode, chunk))
+            if len(pending) >= max_pending:
+                for joined in pending.popleft().result():
+                    yield joined.split()
+        
+        while pending:
+            for joined in pending.popleft().result():
+                yield joined.split()
+
+
+def _iter_chunks(texts: Iterable[str], chunksize: int) -> Iterator[List[str]]:
+    """텍스트를 chunksize개씩 리스트로 묶기 (None은 빈 문자열로 처리)"""
+    iterator = iter(texts)
+    while True:
+        chunk = [text or '' for text in islice(iterator, chunksize)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def _prepend(first, rest: Iterator) -> Iterator:
+    """이미 꺼낸 첫 항목을 이터레이터 앞에 다시 붙이기"""
+    yield first
+    yield from rest
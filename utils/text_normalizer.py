@@ -0,0 +1,75 @@
+"""
+텍스트 정규화 (아이템마다 한 번)
+
+수집한 글을 다음 순서로 한 번만 정리하고, 키워드 추출, 티커 추출, 감성 분석이 결과를
+재사용합니다.
+
+1. HTML 엔티티 복원 (Reddit은 &amp;#x200B; 처럼 두 번 escape된 엔티티를 보냄)
+2. HTML 태그와 URL 제거 (하나의 컴파일된 패턴), zero-width 문자 제거, 공백 정리
+3. 소문자 변환과 단어 토큰 위치 계산
+
+결과는 JSON으로 직렬화할 수 있는 dict입니다.
+
+- text: 정리한 텍스트 (대소문자와 문장 부호 유지, VADER와 티커 추출용)
+- lower: text의 소문자 (키워드 매칭용)
+- tokens: lower 안의 단어 위치 [(start, end), ...]
+"""
+
+import re
+import html
+from typing import Dict, List, Optional
+
+# HTML 태그 또는 URL
+_MARKUP_OR_URL = re.compile(
+    r'<[^>]+>'
+    r'|http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+)
+# zero-width 공백/결합 문자와 BOM (\s에 포함되지 않음)
+_INVISIBLE = re.compile('[\u200b\u200c\u200d\u2060\ufeff]')
+_WHITESPACE = re.compile(r'\s+')
+_TOKEN = re.compile(r'\w+')
+
+EMPTY = {'text': '', 'lower': '', 'tokens': []}
+
+
+def normalize_text(text: Optional[str]) -> Dict:
+    """텍스트를 정리하고 소문자 텍스트와 토큰 위치를 함께 반환"""
+    if not text:
+        return dict(EMPTY, tokens=[])
+
+    if '&' in text:
+        text = html.unescape(html.unescape(text))
+
+    text = _MARKUP_OR_URL.sub(' ', text)
+    text = _INVISIBLE.sub('', text)
+    text = _WHITESPACE.sub(' ', text).strip()
+
+    lower = text.lower()
+    return {
+        'text': text,
+        'lower': lower,
+        'tokens': [match.span() for match in _TOKEN.finditer(lower)]
+    }
+
+
+def token_words(normalized: Dict, preserve_case: bool = False) -> List[str]:
+    """단어 리스트 (기본은 소문자)"""
+    if not preserve_case:
+        source = normalized['lower']
+    elif aligned_lower(normalized) is not None:
+        source = normalized['text']
+    else:
+        return _TOKEN.findall(normalized['text'])
+    return [source[start:end] for start, end in normalized['tokens']]
+
+
+def token_text(normalized: Dict, preserve_case: bool = False) -> str:
+    """문장 부호를 뺀 단어를 공백으로 이은 텍스트"""
+    return ' '.join(token_words(normalized, preserve_case))
+
+
+def aligned_lower(normalized: Dict) -> Optional[str]:
+    """위치가 text와 같은 소문자 텍스트 (소문자 변환으로 길이가 바뀌었으면 None)"""
+    if len(normalized['lower']) != len(normalized['text']):
+        return None
+    return normalized['lower']